@@ -22,6 +22,7 @@ from rlgraph.agents.dqn_agent import DQNAgent
 from rlgraph.agents.dqfd_agent import DQFDAgent
 from rlgraph.agents.apex_agent import ApexAgent
 from rlgraph.agents.impala_agents import IMPALAAgent, SingleIMPALAAgent
+from rlgraph.agents.inference_agent import InferenceAgent
 from rlgraph.agents.ppo_agent import PPOAgent
 from rlgraph.agents.actor_critic_agent import ActorCriticAgent
 from rlgraph.agents.random_agent import RandomAgent
@@ -39,6 +40,8 @@ Agent.__lookup_classes__ = dict(
     impala=IMPALAAgent,  # TODO: Split non-single agents into Actor and Learner
     singleimpala=SingleIMPALAAgent,
     singleimpalaagent=SingleIMPALAAgent,
+    inference=InferenceAgent,
+    inferenceagent=InferenceAgent,
     ppo=PPOAgent,
     ppoagent=PPOAgent,
     random=RandomAgent,
@@ -314,6 +314,8 @@ class ActorCriticAgent(Agent):
                 been applied. The purpose of internal versus external post-processing is to be able to off-load
                 post-processing in large scale distributed scenarios.
         """
+        # Insert all pending (coalesced) records before updating from the memory.
+        self.flush_pending_inserts()
         # [0] step_op, [1] loss, [2] loss_per_item, [3] vf_step_op, [4]vf_loss, [5]vf_loss_per_item
         return_ops = [0, 1, 2, 3, 4, 5]
         if batch is None:
@@ -351,6 +353,7 @@ class ActorCriticAgent(Agent):
         Resets our preprocessor, but only if it contains stateful PreprocessLayer Components (meaning
         the PreprocessorStack has at least one variable defined).
         """
+        self.flush_pending_inserts()
         if self.preprocessing_required and len(self.preprocessor.variable_registry) > 0:
             self.graph_executor.execute("reset_preprocessor")
 
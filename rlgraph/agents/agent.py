@@ -19,7 +19,6 @@ from __future__ import print_function
 
 import logging
 from collections import defaultdict
-from functools import partial
 
 import numpy as np
 
@@ -28,11 +27,11 @@ from rlgraph.components import Component, Exploration, PreprocessorStack, Synchr
     ContainerMerger, ContainerSplitter
 from rlgraph.graphs.graph_builder import GraphBuilder
 from rlgraph.graphs.graph_executor import GraphExecutor
-from rlgraph.spaces import Space, ContainerSpace
+from rlgraph.spaces import Space, ContainerSpace, FloatBox, BoolBox
 from rlgraph.utils.decorators import rlgraph_api, graph_fn
 from rlgraph.utils.input_parsing import parse_execution_spec, parse_observe_spec, parse_update_spec, \
     parse_value_function_spec
-from rlgraph.utils.ops import flatten_op
+from rlgraph.utils.observe_buffer import ObserveBuffer
 from rlgraph.utils.specifiable import Specifiable
 
 if get_backend() == "tf":
@@ -158,22 +157,20 @@ class Agent(Specifiable):
         self.exploration = Exploration.from_spec(exploration_spec)  # TODO: Move this to DQN/DQFN. PG's don't use it.
         self.execution_spec = parse_execution_spec(execution_spec)
 
+        self.observe_spec = parse_observe_spec(observe_spec)
+
         # Python-side experience buffer for better performance (may be disabled).
+        # Preallocated per-env numpy storage, written in place and flushed as array views.
         self.default_env = "env_0"
-
-        def factory_(i):
-            if i < 2:
-                return []
-            return tuple([[] for _ in range(i)])
-
-        self.states_buffer = defaultdict(list)  # partial(fact_, len(self.flat_state_space)))
-        self.actions_buffer = defaultdict(partial(factory_, len(self.flat_action_space or [])))
+        buffer_size = self.observe_spec["buffer_size"]
+        self.states_buffer = ObserveBuffer(self.preprocessed_state_space, buffer_size)
+        self.actions_buffer = ObserveBuffer(self.action_space, buffer_size)
         self.internals_buffer = defaultdict(list)
-        self.rewards_buffer = defaultdict(list)
-        self.next_states_buffer = defaultdict(list)  # partial(fact_, len(self.flat_state_space)))
-        self.terminals_buffer = defaultdict(list)
-
-        self.observe_spec = parse_observe_spec(observe_spec)
+        self.rewards_buffer = ObserveBuffer(FloatBox(), buffer_size)
+        self.next_states_buffer = ObserveBuffer(self.preprocessed_state_space, buffer_size)
+        self.terminals_buffer = ObserveBuffer(BoolBox(), buffer_size)
+        # Buffer-key under which flushed env-buffers are collected for coalesced inserts (see `insert_batch_size`).
+        self.pending_inserts_key = "pending-inserts"
 
         # Global time step counter.
         self.timesteps = 0
@@ -215,12 +212,13 @@ class Agent(Specifiable):
         """
         if env_id is None:
             env_id = self.default_env
-        del self.states_buffer[env_id]  # = ([] for _ in range(len(self.flat_state_space)))
-        del self.actions_buffer[env_id]  # = ([] for _ in range(len(self.flat_action_space)))
-        del self.internals_buffer[env_id]  # = []
-        del self.rewards_buffer[env_id]  # = []
-        del self.next_states_buffer[env_id]  # = ([] for _ in range(len(self.flat_state_space)))
-        del self.terminals_buffer[env_id]  # = []
+        # Numpy buffers keep their storage (only their sizes are reset).
+        self.states_buffer.reset(env_id)
+        self.actions_buffer.reset(env_id)
+        del self.internals_buffer[env_id]
+        self.rewards_buffer.reset(env_id)
+        self.next_states_buffer.reset(env_id)
+        self.terminals_buffer.reset(env_id)
 
     def define_graph_api(self, *args, **kwargs):
         """
@@ -302,6 +300,15 @@ class Agent(Specifiable):
         """
         Builds the internal graph from the RLGraph meta-graph via the graph executor..
         """
+        # Memories are created by the Agent sub-classes (after this base c'tor), check them before building.
+        memory = getattr(self, "memory", None)
+        if self.observe_spec["insert_batch_size"] > 0 and memory is not None and hasattr(memory, "capacity"):
+            # Coalesced inserts hold up to `insert_batch_size` - 1 pending records plus one flushed buffer.
+            assert self.observe_spec["insert_batch_size"] + self.observe_spec["buffer_size"] - 1 <= \
+                memory.capacity, "ERROR: Coalesced inserts (`insert_batch_size`={} + `buffer_size`={} - 1) must " \
+                "not exceed the memory's capacity ({})!".format(
+                    self.observe_spec["insert_batch_size"], self.observe_spec["buffer_size"], memory.capacity
+                )
         return self.graph_executor.build(root_components, input_spaces, **kwargs)
 
     def build(self, build_options=None):
@@ -399,77 +406,52 @@ class Agent(Specifiable):
             if env_id is None:
                 env_id = self.default_env
 
-            # If data is already batched, just have to extend our buffer lists.
+            # If data is already batched, write the whole batch into our buffers.
             if batched:
-                if self.flat_state_space is not None:
-                    for i, flat_key in enumerate(self.flat_state_space.keys()):
-                        self.states_buffer[env_id][i].extend(preprocessed_states[flat_key])
-                        self.next_states_buffer[env_id][i].extend(next_states[flat_key])
-                else:
-                    self.states_buffer[env_id].extend(preprocessed_states)
-                    self.next_states_buffer[env_id].extend(next_states)
-                if self.flat_action_space is not None:
-                    flat_action = flatten_op(actions)
-                    for i, flat_key in enumerate(self.flat_action_space.keys()):
-                        self.actions_buffer[env_id][i].append(flat_action[flat_key])
-                else:
-                    self.actions_buffer[env_id].extend(actions)
+                self.states_buffer.extend(env_id, preprocessed_states)
+                self.next_states_buffer.extend(env_id, next_states)
+                self.actions_buffer.extend(env_id, actions)
                 self.internals_buffer[env_id].extend(internals)
-                self.rewards_buffer[env_id].extend(rewards)
-                self.terminals_buffer[env_id].extend(terminals)
-            # Data is not batched, append single items (without creating new lists first!) to buffer lists.
+                self.rewards_buffer.extend(env_id, rewards)
+                self.terminals_buffer.extend(env_id, terminals)
+            # Data is not batched, write single items in place into the buffers.
             else:
-                if self.flat_state_space is not None:
-                    for i, flat_key in enumerate(self.flat_state_space.keys()):
-                        self.states_buffer[env_id][i].append(preprocessed_states[flat_key])
-                        self.next_states_buffer[env_id][i].append(next_states[flat_key])
-                else:
-                    self.states_buffer[env_id].append(preprocessed_states)
-                    self.next_states_buffer[env_id].append(next_states)
-                if self.flat_action_space is not None:
-                    flat_action = flatten_op(actions)
-                    for i, flat_key in enumerate(self.flat_action_space.keys()):
-                        self.actions_buffer[env_id][i].append(flat_action[flat_key])
-                else:
-                    self.actions_buffer[env_id].append(actions)
+                self.states_buffer.append(env_id, preprocessed_states)
+                self.next_states_buffer.append(env_id, next_states)
+                self.actions_buffer.append(env_id, actions)
                 self.internals_buffer[env_id].append(internals)
-                self.rewards_buffer[env_id].append(rewards)
-                self.terminals_buffer[env_id].append(terminals)
+                self.rewards_buffer.append(env_id, rewards)
+                self.terminals_buffer.append(env_id, terminals)
 
-            buffer_is_full = len(self.rewards_buffer[env_id]) >= self.observe_spec["buffer_size"]
+            buffer_is_full = self.rewards_buffer.size(env_id) >= self.observe_spec["buffer_size"]
+            # View on the written terminals (changes are written through to the buffer).
+            terminals_ = self.terminals_buffer[env_id]
 
             # If the buffer (per environment) is full OR the episode was aborted:
             # Change terminal of last record artificially to True (also give warning "buffer too small"),
             # insert and flush the buffer.
-            if buffer_is_full or self.terminals_buffer[env_id][-1]:
+            if buffer_is_full or terminals_[-1]:
                 # Warn if full and last terminal is False.
-                if buffer_is_full and not self.terminals_buffer[env_id][-1]:
+                if buffer_is_full and not terminals_[-1]:
                     self.logger.warning(
                         "Buffer of size {} of Agent '{}' may be too small! Had to add artificial terminal=True "
                         "to end.".format(self.observe_spec["buffer_size"], self)
                     )
-                    self.terminals_buffer[env_id][-1] = True
+                    terminals_[-1] = True
 
                 # TODO: Apply n-step post-processing if necessary.
-                if self.flat_action_space is not None:
-                    actions_ = {}
-                    for i, key in enumerate(self.flat_action_space.keys()):
-                        actions_[key] = np.asarray(self.actions_buffer[env_id][i])
-                        # Squeeze, but do not squeeze (1,) to ().
-                        if len(actions_[key]) > 1:
-                            actions_[key] = np.squeeze(actions_[key])
-                        else:
-                            actions_[key] = np.reshape(actions_[key], (1,))
+                if self.observe_spec["insert_batch_size"] > 0:
+                    self._add_pending_inserts(env_id)
                 else:
-                    actions_ = np.asarray(self.actions_buffer[env_id])
-                self._observe_graph(
-                    preprocessed_states=np.asarray(self.states_buffer[env_id]),
-                    actions=actions_,
-                    internals=np.asarray(self.internals_buffer[env_id]),
-                    rewards=np.asarray(self.rewards_buffer[env_id]),
-                    next_states=np.asarray(self.next_states_buffer[env_id]),
-                    terminals=np.asarray(self.terminals_buffer[env_id])
-                )
+                    # Pass views on the buffers (no copies), they are only overwritten after the flush.
+                    self._observe_graph(
+                        preprocessed_states=self.states_buffer[env_id],
+                        actions=self.actions_buffer[env_id],
+                        internals=np.asarray(self.internals_buffer[env_id]),
+                        rewards=self.rewards_buffer[env_id],
+                        next_states=self.next_states_buffer[env_id],
+                        terminals=terminals_
+                    )
                 self.reset_env_buffers(env_id)
         else:
             if not batched:
@@ -481,6 +463,43 @@ class Agent(Specifiable):
 
             self._observe_graph(preprocessed_states, actions, internals, rewards, next_states, terminals)
 
+    def _add_pending_inserts(self, env_id):
+        """
+        Appends the flushed buffer of an environment to the pending inserts and inserts all pending records
+        once `insert_batch_size` is reached. Each flushed buffer ends with a terminal and is appended as a whole,
+        so the trajectories of each environment stay contiguous and in order.
+
+        Args:
+            env_id (str): The environment id whose buffer was flushed.
+        """
+        key = self.pending_inserts_key
+        for buffer in [self.states_buffer, self.actions_buffer, self.rewards_buffer, self.next_states_buffer,
+                       self.terminals_buffer]:
+            buffer.extend(key, buffer[env_id])
+        self.internals_buffer[key].extend(self.internals_buffer[env_id])
+
+        if self.rewards_buffer.size(key) >= self.observe_spec["insert_batch_size"]:
+            self.flush_pending_inserts()
+
+    def flush_pending_inserts(self):
+        """
+        Inserts all pending records (flushed environment buffers collected for a coalesced insert) with a single
+        `_observe_graph` call. Called automatically by `update`, `reset` and `terminate`, but should also be called
+        at the end of an execution run when `insert_batch_size` > 0.
+        """
+        key = self.pending_inserts_key
+        if self.rewards_buffer.size(key) == 0:
+            return
+        self._observe_graph(
+            preprocessed_states=self.states_buffer[key],
+            actions=self.actions_buffer[key],
+            internals=np.asarray(self.internals_buffer[key]),
+            rewards=self.rewards_buffer[key],
+            next_states=self.next_states_buffer[key],
+            terminals=self.terminals_buffer[key]
+        )
+        self.reset_env_buffers(key)
+
     def _observe_graph(self, preprocessed_states, actions, internals, rewards, next_states, terminals):
         """
         This methods defines the actual call to the computational graph by executing
@@ -532,7 +551,7 @@ class Agent(Specifiable):
         Must be implemented to define some reset behavior (before starting a new episode).
         This could include resetting the preprocessor and other Components.
         """
-        pass  # optional
+        self.flush_pending_inserts()
 
     def terminate(self):
         """
@@ -540,6 +559,7 @@ class Agent(Specifiable):
         Things that need to be cleaned up should be placed into this function, e.g. closing sessions
         and other open connections.
         """
+        self.flush_pending_inserts()
         self.graph_executor.terminate()
 
     def call_api_method(self, op, inputs=None, return_ops=None):
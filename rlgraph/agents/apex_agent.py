@@ -116,6 +116,8 @@ class ApexAgent(DQNAgent):
         self.num_updates = 0
 
     def update(self, batch=None, time_percentage=None, **kwargs):
+        # Insert all pending (coalesced) records before updating from the memory.
+        self.flush_pending_inserts()
         # In apex, syncing is based on num steps trained, not steps sampled.
         sync_call = None
         # Apex uses train time steps for syncing.
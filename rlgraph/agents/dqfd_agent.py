@@ -430,6 +430,8 @@ class DQFDAgent(Agent):
         Returns:
             tuple: Loss and loss per item.
         """
+        # Insert all pending (coalesced) records before updating from the memory.
+        self.flush_pending_inserts()
         # TODO: Move update_spec to Worker. Agent should not hold these execution details.
         if time_percentage is None:
             time_percentage = self.timesteps / self.update_spec.get("max_timesteps", 1e6)
@@ -502,6 +504,7 @@ class DQFDAgent(Agent):
         Resets our preprocessor, but only if it contains stateful PreprocessLayer Components (meaning
         the PreprocessorStack has at least one variable defined).
         """
+        self.flush_pending_inserts()
         if self.preprocessing_required and len(self.preprocessor.variable_registry) > 0:
             self.graph_executor.execute("reset_preprocessor")
 
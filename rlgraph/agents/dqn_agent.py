@@ -396,6 +396,8 @@ class DQNAgent(Agent):
         self.graph_executor.execute(("insert_records", [preprocessed_states, actions, rewards, next_states, terminals]))
 
     def update(self, batch=None, time_percentage=None, **kwargs):
+        # Insert all pending (coalesced) records before updating from the memory.
+        self.flush_pending_inserts()
         # TODO: Move update_spec to Worker. Agent should not hold these execution details.
         if time_percentage is None:
             time_percentage = self.timesteps / self.update_spec.get("max_timesteps", 1e6)
@@ -430,6 +432,7 @@ class DQNAgent(Agent):
         Resets our preprocessor, but only if it contains stateful PreprocessLayer Components (meaning
         the PreprocessorStack has at least one variable defined).
         """
+        self.flush_pending_inserts()
         if self.preprocessing_required and len(self.preprocessor.variable_registry) > 0:
             self.graph_executor.execute("reset_preprocessor")
 
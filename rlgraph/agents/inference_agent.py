@@ -0,0 +1,263 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import inspect
+from copy import deepcopy
+
+import numpy as np
+
+from rlgraph.agents.agent import Agent
+from rlgraph.agents.dqn_agent import DQNAgent
+from rlgraph.utils.decorators import rlgraph_api
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.util import strip_list
+
+
+class InferenceAgent(Agent):
+    """
+    An acting-only Agent, e.g. for distributed sample workers: Builds only the preprocessor, the policy (plus
+    exploration) and the weight-syncing API, but no memory, loss function or optimizer (variables).
+    Policy weights are received from a learner Agent via `set_weights`.
+    """
+    def __init__(
+        self,
+        state_space,
+        action_space,
+        preprocessing_spec=None,
+        network_spec=None,
+        internal_states_space=None,
+        policy_spec=None,
+        exploration_spec=None,
+        execution_spec=None,
+        value_based=False,
+        dueling_q=False,
+        auto_build=True,
+        name="inference-agent"
+    ):
+        """
+        Args:
+            state_space (Union[dict,Space]): Spec dict for the state Space or a direct Space object.
+            action_space (Union[dict,Space]): Spec dict for the action Space or a direct Space object.
+            preprocessing_spec (Optional[list,PreprocessorStack]): The spec list for the different necessary states
+                preprocessing steps or a PreprocessorStack object itself.
+            network_spec (Optional[list,NeuralNetwork]): Spec list for a NeuralNetwork Component or the NeuralNetwork
+                object itself.
+            internal_states_space (Optional[Union[dict,Space]]): Spec dict for the internal-states Space or a direct
+                Space object for the Space(s) of the internal (RNN) states.
+            policy_spec (Optional[dict]): An optional dict for further kwargs passing into the Policy c'tor.
+            exploration_spec (Optional[dict]): The spec-dict to create the Exploration Component. Only used if
+                `value_based` is True.
+            execution_spec (Optional[dict,Execution]): The spec-dict specifying execution settings.
+            value_based (bool): If True, act like a DQN-type Agent: Pick the policy's deterministic (greedy)
+                action and pass it through the Exploration Component. If False, sample from the policy's
+                action distribution (deterministic only if `use_exploration` is False).
+            dueling_q (bool): Whether the learner's policy is a DuelingPolicy (only if `value_based` is True).
+            auto_build (Optional[bool]): If True (default), immediately builds the graph using the agent's
+                graph builder. If false, users must separately call agent.build().
+            name (str): Some name for this Agent object. Should match the learner Agent's name so that
+                variable names match for weight syncing.
+        """
+        policy_spec = deepcopy(policy_spec) or {}
+        if value_based is True:
+            if dueling_q is True:
+                policy_spec["type"] = "dueling-policy"
+                if "units_state_value_stream" not in policy_spec:
+                    policy_spec["units_state_value_stream"] = 128
+        else:
+            policy_spec["deterministic"] = False
+
+        super(InferenceAgent, self).__init__(
+            state_space=state_space,
+            action_space=action_space,
+            preprocessing_spec=preprocessing_spec,
+            network_spec=network_spec,
+            internal_states_space=internal_states_space,
+            policy_spec=policy_spec,
+            exploration_spec=exploration_spec,
+            execution_spec=execution_spec,
+            update_spec=dict(do_updates=False),
+            auto_build=auto_build,
+            name=name
+        )
+        self.value_based = value_based
+
+        self.input_spaces.update(dict(
+            policy_weights="variables:{}".format(self.policy.scope),
+            preprocessed_states=self.preprocessed_state_space.with_batch_rank()
+        ))
+        if self.value_based is True:
+            self.input_spaces["use_exploration"] = bool
+        else:
+            self.input_spaces["deterministic"] = bool
+            # Only the exploration decays over time.
+            del self.input_spaces["time_percentage"]
+
+        sub_components = [self.preprocessor, self.policy]
+        if self.value_based is True:
+            sub_components.append(self.exploration)
+        self.root_component.add_components(*sub_components)
+
+        # Define the Agent's (root-Component's) API.
+        self.define_graph_api()
+
+        if self.auto_build:
+            self._build_graph([self.root_component], self.input_spaces, optimizer=None,
+                              batch_size=self.update_spec["batch_size"])
+            self.graph_built = True
+
+    def define_graph_api(self):
+        super(InferenceAgent, self).define_graph_api()
+
+        agent = self
+
+        # Reset operation (resets preprocessor).
+        if self.preprocessing_required:
+            @rlgraph_api(component=self.root_component)
+            def reset_preprocessor(root):
+                reset_op = agent.preprocessor.reset()
+                return reset_op
+
+        if self.value_based is True:
+            # Act from preprocessed states.
+            @rlgraph_api(component=self.root_component)
+            def action_from_preprocessed_state(root, preprocessed_states, time_percentage=None, use_exploration=True):
+                sample_deterministic = agent.policy.get_deterministic_action(preprocessed_states)
+                actions = agent.exploration.get_action(sample_deterministic["action"], time_percentage, use_exploration)
+                return actions, preprocessed_states
+
+            # State (from environment) to action with preprocessing.
+            @rlgraph_api(component=self.root_component)
+            def get_preprocessed_state_and_action(root, states, time_percentage=None, use_exploration=True):
+                preprocessed_states = agent.preprocessor.preprocess(states)
+                return root.action_from_preprocessed_state(preprocessed_states, time_percentage, use_exploration)
+        else:
+            @rlgraph_api(component=self.root_component)
+            def action_from_preprocessed_state(root, preprocessed_states, deterministic=False):
+                out = agent.policy.get_action(preprocessed_states, deterministic=deterministic)
+                return out["action"], preprocessed_states
+
+            @rlgraph_api(component=self.root_component)
+            def get_preprocessed_state_and_action(root, states, deterministic=False):
+                preprocessed_states = agent.preprocessor.preprocess(states)
+                return root.action_from_preprocessed_state(preprocessed_states, deterministic)
+
+    def get_action(self, states, internals=None, use_exploration=True, apply_preprocessing=True, extra_returns=None,
+                   time_percentage=None):
+        """
+        Args:
+            extra_returns (Optional[Set[str],str]): Optional string or set of strings for additional return
+                values (besides the actions). Possible values are:
+                - 'preprocessed_states': The preprocessed states after passing the given states through the
+                preprocessor stack.
+
+        Returns:
+            tuple or single value depending on `extra_returns`:
+                - action
+                - the preprocessed states
+        """
+        if self.value_based is True and time_percentage is None:
+            time_percentage = self.timesteps / self.update_spec.get("max_timesteps", 1e6)
+
+        extra_returns = {extra_returns} if isinstance(extra_returns, str) else (extra_returns or set())
+        # States come in without preprocessing -> use state space.
+        if apply_preprocessing:
+            call_method = "get_preprocessed_state_and_action"
+            batched_states = self.state_space.force_batch(states)
+        else:
+            call_method = "action_from_preprocessed_state"
+            batched_states = states
+        remove_batch_rank = batched_states.ndim == np.asarray(states).ndim + 1
+
+        # Increase timesteps by the batch size (number of states in batch).
+        batch_size = len(batched_states)
+        self.timesteps += batch_size
+
+        if self.value_based is True:
+            inputs = [batched_states, time_percentage, use_exploration]
+        else:
+            inputs = [batched_states, not use_exploration]  # deterministic = not use_exploration
+
+        # Control, which return value to "pull" (depending on `additional_returns`).
+        return_ops = [0, 1] if "preprocessed_states" in extra_returns else [0]  # 1=preprocessed_states, 0=action
+        ret = self.graph_executor.execute((call_method, inputs, return_ops))
+        if remove_batch_rank:
+            return strip_list(ret)
+        else:
+            return ret
+
+    def set_weights(self, policy_weights, value_function_weights=None):
+        # No value function to sync (only acting).
+        return self.graph_executor.execute(("set_weights", policy_weights))
+
+    def _observe_graph(self, preprocessed_states, actions, internals, rewards, next_states, terminals):
+        raise RLGraphError("ERROR: InferenceAgent '{}' has no memory and cannot observe!".format(self.name))
+
+    def update(self, batch=None, time_percentage=None, **kwargs):
+        raise RLGraphError("ERROR: InferenceAgent '{}' has no optimizer and cannot update!".format(self.name))
+
+    def post_process(self, batch):
+        raise RLGraphError("ERROR: InferenceAgent '{}' has no loss function and cannot post-process!".
+                           format(self.name))
+
+    def reset(self):
+        """
+        Resets our preprocessor, but only if it contains stateful PreprocessLayer Components (meaning
+        the PreprocessorStack has at least one variable defined).
+        """
+        if self.preprocessing_required and len(self.preprocessor.variable_registry) > 0:
+            self.graph_executor.execute("reset_preprocessor")
+
+    @staticmethod
+    def from_agent_config(agent_config):
+        """
+        Creates an InferenceAgent that acts like the (learner) Agent described by the given config.
+        Learner-only settings (memory, optimizer, loss, etc..) are dropped.
+
+        Args:
+            agent_config (dict): The full Agent config. Must contain the 'type' field to lookup the learner's class.
+
+        Returns:
+            InferenceAgent: The acting-only Agent. Its name (and thus its variable names) match the learner's.
+        """
+        config = deepcopy(agent_config)
+        learner_cls = Agent.__lookup_classes__.get(config.pop("type"))
+        learner_defaults = inspect.signature(learner_cls.__init__).parameters
+
+        def get_setting(key, default=None):
+            if key in config:
+                return config[key]
+            elif key in learner_defaults and learner_defaults[key].default is not inspect.Parameter.empty:
+                return learner_defaults[key].default
+            return default
+
+        value_based = issubclass(learner_cls, DQNAgent)
+        return InferenceAgent(
+            state_space=config["state_space"],
+            action_space=config["action_space"],
+            preprocessing_spec=config.get("preprocessing_spec"),
+            network_spec=config.get("network_spec"),
+            internal_states_space=config.get("internal_states_space"),
+            policy_spec=config.get("policy_spec"),
+            exploration_spec=config.get("exploration_spec") if value_based else None,
+            execution_spec=config.get("execution_spec"),
+            value_based=value_based,
+            dueling_q=get_setting("dueling_q", False) if value_based else False,
+            auto_build=config.get("auto_build", True),
+            name=get_setting("name", "inference-agent")
+        )
@@ -542,6 +542,8 @@ class PPOAgent(Agent):
                 been applied. The purpose of internal versus external post-processing is to be able to off-load
                 post-processing in large scale distributed scenarios.
         """
+        # Insert all pending (coalesced) records before updating from the memory.
+        self.flush_pending_inserts()
         # TODO: Move update_spec to Worker. Agent should not hold these execution details.
         if time_percentage is None:
             time_percentage = self.timesteps / self.update_spec.get("max_timesteps", 1e6)
@@ -580,6 +582,7 @@ class PPOAgent(Agent):
         Resets our preprocessor, but only if it contains stateful PreprocessLayer Components (meaning
         the PreprocessorStack has at least one variable defined).
         """
+        self.flush_pending_inserts()
         if self.preprocessing_required and len(self.preprocessor.variable_registry) > 0:
             self.graph_executor.execute("reset_preprocessor")
 
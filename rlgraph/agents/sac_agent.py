@@ -606,6 +606,8 @@ class SACAgent(Agent):
         self.graph_executor.execute((self.root_component.insert_records, [preprocessed_states, actions, rewards, next_states, terminals]))
 
     def update(self, batch=None, time_percentage=None, **kwargs):
+        # Insert all pending (coalesced) records before updating from the memory.
+        self.flush_pending_inserts()
         if batch is None:
             size = self.graph_executor.execute(self.root_component.get_memory_size)
             # TODO: is this necessary?
@@ -626,6 +628,7 @@ class SACAgent(Agent):
         Resets our preprocessor, but only if it contains stateful PreprocessLayer Components (meaning
         the PreprocessorStack has at least one variable defined).
         """
+        self.flush_pending_inserts()
         if self.preprocessing_required and len(self.preprocessor.variables) > 0:
             self.graph_executor.execute("reset_preprocessor")
         self.graph_executor.execute(self.root_component.reset_targets)
@@ -24,7 +24,7 @@ from rlgraph.components.component import Component
 from rlgraph.components.neural_networks.actor_component import ActorComponent
 from rlgraph.environments.environment import Environment
 from rlgraph.utils.ops import DataOpTuple, DataOpDict, flatten_op, unflatten_op
-from rlgraph.spaces import Space, Dict
+from rlgraph.spaces import Space, Dict, BoolBox
 from rlgraph.utils.decorators import rlgraph_api
 from rlgraph.utils.specifiable_server import SpecifiableServer
 
@@ -39,7 +39,7 @@ class EnvironmentStepper(Component):
     n times through the environment, each time picking actions depending on the states that the environment produces.
     """
 
-    def __init__(self, environment_spec, actor_component_spec, num_steps=20,
+    def __init__(self, environment_spec, actor_component_spec, num_steps=20, num_environments=1,
                  state_space=None, action_space=None, reward_space=None,
                  internal_states_space=None,
                  add_action_probs=False, action_probs_space=None,
@@ -54,6 +54,12 @@ class EnvironmentStepper(Component):
             actor_component_spec (Union[ActorComponent,dict]): A specification dict to construct this EnvStepper's
                 ActionComponent (to generate actions) or an already constructed ActionComponent object.
             num_steps (int): The number of steps to perform per `step` call.
+            num_environments (int): The number of Environments (each constructed from `environment_spec`) to step
+                in parallel. If > 1, all Environments are hosted by a single SpecifiableServer (as a
+                SequentialVectorEnv), whose `step_flow` takes the batch of actions and returns the stacked outputs,
+                such that each step needs only one round trip to the server and the ActorComponent acts on a batch of
+                `num_environments` states. All outputs of `step` then have the Environments' rank after the time rank.
+                Default: 1.
             state_space (Optional[Space]): The state Space of the Environment. If None, will construct a dummy
                 environment to get the state Space from there.
             action_space (Optional[Space]): The action Space of the Environment. If None, will construct a dummy
@@ -122,10 +128,14 @@ class EnvironmentStepper(Component):
         # Need to flatten the state-space in case it's a ContainerSpace for the return dtypes.
         self.state_space_env_list = list(self.state_space_env_flattened.values())
 
+        self.num_environments = num_environments
+        # The leading shape of all per-step values (states, actions, rewards, etc.) of the Environment(s).
+        self.environments_shape = (num_environments,) if num_environments > 1 else ()
+
         # TODO: automate this by lookup from the NN Component
         self.internal_states_space = None
         if internal_states_space is not None:
-            self.internal_states_space = internal_states_space.with_batch_rank(add_batch_rank=1)
+            self.internal_states_space = internal_states_space.with_batch_rank(add_batch_rank=num_environments)
 
         # Add the action/reward spaces to the state space (must be Dict).
         if self.add_previous_action_to_state is True:
@@ -147,12 +157,25 @@ class EnvironmentStepper(Component):
                 "ERROR: If `add_action_probs` is True, must provide an `action_probs_space`!"
 
         self.environment_spec = environment_spec
+        if self.num_environments > 1:
+            # One server process steps all Environments (sequentially) and returns their stacked outputs.
+            server_spec = dict(
+                type="sequential-vector-env", num_environments=self.num_environments, env_spec=environment_spec
+            )
+            state_spaces = [self._with_environments_rank(space) for space in self.state_space_env_list]
+            step_flow_spaces = state_spaces + [
+                self._with_environments_rank(self.reward_space), BoolBox(shape=self.environments_shape)
+            ]
+        else:
+            server_spec = environment_spec
+            state_spaces = self.state_space_env_list
+            step_flow_spaces = self.state_space_env_list + [self.reward_space, bool]
         self.environment_server = SpecifiableServer(
             specifiable_class=Environment,
-            spec=environment_spec,
+            spec=server_spec,
             output_spaces=dict(
-                step_flow=self.state_space_env_list + [self.reward_space, bool],
-                reset_flow=self.state_space_env_list
+                step_flow=step_flow_spaces,
+                reset_flow=state_spaces
             ),
             shutdown_method="terminate"
         )
@@ -178,13 +201,14 @@ class EnvironmentStepper(Component):
         )
         self.current_state = self.get_variable(
             name="current-state", from_space=self.state_space_actor, initializer=0, flatten=True, trainable=False,
-            local=True, use_resource=True
+            local=True, use_resource=True,
+            add_batch_rank=self.num_environments if self.num_environments > 1 else False
         )
         if self.has_rnn:
             self.current_internal_states = self.get_variable(
                 name="current-internal-states", from_space=self.internal_states_space,
                 initializer=0.0, flatten=True, trainable=False, local=True, use_resource=True,
-                add_batch_rank=1
+                add_batch_rank=self.num_environments
             )
 
     @rlgraph_api(returns=1)
@@ -205,8 +229,13 @@ class EnvironmentStepper(Component):
                     # Add a simple (size 1) batch rank to the state so it'll pass through the NN.
                     # - Also have to add a time-rank for RNN processing.
                     expanded = state[i]
-                    for _ in range(1 if self.has_rnn is False else 2):
-                        expanded = tf.expand_dims(input=expanded, axis=0)
+                    if self.num_environments > 1:
+                        # States of many Environments already come with a batch rank.
+                        if self.has_rnn is True:
+                            expanded = tf.expand_dims(input=expanded, axis=1)
+                    else:
+                        for _ in range(1 if self.has_rnn is False else 2):
+                            expanded = tf.expand_dims(input=expanded, axis=0)
                     # Make None so it'll be recognized as batch-rank by the auto-Space detector.
                     flat_state[flat_key] = tf.placeholder_with_default(
                         input=expanded, shape=(None,) + ((None,) if self.has_rnn is True else ()) +
@@ -231,7 +260,7 @@ class EnvironmentStepper(Component):
                 current_internal_states = out.get("last_internal_states")
 
                 # Strip the batch (and maybe time) ranks again from the action in case the Env doesn't like it.
-                a_no_extra_ranks = a[0, 0] if self.has_rnn is True else a[0]
+                a_no_extra_ranks = self._strip_extra_ranks(a)
                 # Step through the Env and collect next state (tuple!), reward and terminal as single values
                 # (not batched).
                 out = self.environment_server.step_flow(a_no_extra_ranks)
@@ -250,8 +279,7 @@ class EnvironmentStepper(Component):
                 ret = [t_, s_] + \
                     ([a_no_extra_ranks] if self.add_action else []) + \
                     ([r] if self.add_reward else []) + \
-                    ([(action_probs[0][0] if self.has_rnn is True else action_probs[0])] if
-                     self.add_action_probs is True else []) + \
+                    ([self._strip_extra_ranks(action_probs)] if self.add_action_probs is True else []) + \
                     ([tuple(current_internal_states)] if self.has_rnn is True else [])
 
                 return tuple(ret)
@@ -259,18 +287,20 @@ class EnvironmentStepper(Component):
             # Initialize the tf.scan run.
             initializer = [
                 # terminals
-                tf.zeros(shape=(), dtype=tf.bool),
+                tf.zeros(shape=self.environments_shape, dtype=tf.bool),
                 # current (raw) state (flattened components if ContainerSpace).
                 tuple(map(lambda x: x.read_value(), self.current_state.values()))
             ]
             # Append actions and rewards if needed.
             if self.add_action:
-                initializer.append(tf.zeros(shape=self.action_space.shape, dtype=self.action_space.dtype))
+                initializer.append(tf.zeros(
+                    shape=self.environments_shape + self.action_space.shape, dtype=self.action_space.dtype
+                ))
             if self.add_reward:
-                initializer.append(tf.zeros(shape=self.reward_space.shape))
+                initializer.append(tf.zeros(shape=self.environments_shape + self.reward_space.shape))
             # Append action probs if needed.
             if self.add_action_probs is True:
-                initializer.append(tf.zeros(shape=self.action_probs_space.shape))
+                initializer.append(tf.zeros(shape=self.environments_shape + self.action_probs_space.shape))
             # Append internal states if needed.
             if self.current_internal_states is not None:
                 initializer.append(tuple(
@@ -302,9 +332,14 @@ class EnvironmentStepper(Component):
                 # Remove batch rank from internal states again.
                 internal_states_wo_batch = list()
                 for i, var_ref in enumerate(self.current_internal_states.values()):  #range(len(step_results[slot])):
-                    # 1=batch axis (which has dim=1); 0=time axis.
-                    internal_states_component = tf.squeeze(step_results[slot][i], axis=1)
-                    assigns.append(self.assign_variable(var_ref, internal_states_component[-1:]))
+                    internal_states_component = step_results[slot][i]
+                    if self.num_environments > 1:
+                        # Keep the batch rank (one internal state per Environment).
+                        assigns.append(self.assign_variable(var_ref, internal_states_component[-1]))
+                    else:
+                        # 1=batch axis (which has dim=1); 0=time axis.
+                        internal_states_component = tf.squeeze(internal_states_component, axis=1)
+                        assigns.append(self.assign_variable(var_ref, internal_states_component[-1:]))
                     internal_states_wo_batch.append(internal_states_component)
                 step_results[slot] = tuple(internal_states_wo_batch)
 
@@ -314,11 +349,13 @@ class EnvironmentStepper(Component):
                 full_results = []
                 for slot in range(len(step_results)):
                     first_values, rest_values = initializer[slot], step_results[slot]
+                    is_internal_states_slot = self.current_internal_states is not None and \
+                        slot == len(step_results) - 1
                     # Internal states need a slightly different concatenating as the batch rank is missing.
-                    if self.current_internal_states is not None and slot == len(step_results) - 1:
+                    if is_internal_states_slot and self.num_environments == 1:
                         full_results.append(nest.map_structure(self._concat, first_values, rest_values))
                     # States need concatenating (first state needed).
-                    elif slot == 1:
+                    elif slot == 1 or is_internal_states_slot:
                         full_results.append(nest.map_structure(
                             lambda first, rest: tf.concat([[first], rest], axis=0), first_values, rest_values)
                         )
@@ -342,6 +379,24 @@ class EnvironmentStepper(Component):
 
             return full_results
 
+    def _strip_extra_ranks(self, op):
+        """
+        Helper method to strip the ranks added for the ActorComponent (batch rank for a single Environment, time rank
+        for RNNs) from one of its outputs.
+        """
+        if self.num_environments > 1:
+            return op[:, 0] if self.has_rnn is True else op
+        return op[0, 0] if self.has_rnn is True else op[0]
+
+    def _with_environments_rank(self, space):
+        """
+        Helper method returning a (batch-rank free) version of the given primitive Space with the number of
+        Environments as leading dimension.
+        """
+        if isinstance(space, BoolBox):
+            return BoolBox(shape=self.environments_shape + space.shape)
+        return type(space)(shape=self.environments_shape + space.shape, dtype=space.dtype)
+
     @staticmethod
     def _concat(first, rest):
         """
@@ -21,7 +21,7 @@ import copy
 import inspect
 import re
 import uuid
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 import numpy as np
 from six.moves import xrange as range_
@@ -31,6 +31,7 @@ from rlgraph.utils import util
 from rlgraph.utils.decorators import rlgraph_api, component_api_registry, component_graph_fn_registry, \
     define_api_method, define_graph_fn
 from rlgraph.utils.ops import DataOpDict, FLAT_TUPLE_OPEN, FLAT_TUPLE_CLOSE, TraceContext
+from rlgraph.utils.profiling import LatencyHistogram
 from rlgraph.utils.rlgraph_errors import RLGraphError, RLGraphObsoletedError
 from rlgraph.utils.specifiable import Specifiable
 
@@ -59,10 +60,14 @@ class Component(Specifiable):
     A component also has a variable registry, the ability to save the component's structure and variable-values to disk,
     and supports adding its graph_fns to the overall computation graph.
     """
+    # Define-by-run call profiling (switched off by default, see `set_profiling`).
+    profiling_enabled = False
     call_count = 0
 
-    # List of tuples (method_name, runtime)
-    call_times = []
+    # Ring buffer of the most recent tuples (component name, method name, runtime).
+    call_times = deque(maxlen=10000)
+    # Aggregated latencies per (component name, method name).
+    call_histograms = {}
 
     def __init__(self, *sub_components, **kwargs):
         """
@@ -1325,12 +1330,52 @@ class Component(Specifiable):
         raise RLGraphObsoletedError("API-method", "_variables()", "variables()")
 
     @staticmethod
-    def reset_profile():
+    def set_profiling(enabled=True, max_call_times=None):
+        """
+        Switches define-by-run call profiling on or off (for all Components).
+
+        Args:
+            enabled (bool): Whether to record runtimes of define-by-run API-method calls.
+            max_call_times (Optional[int]): The size of the `call_times` ring buffer. None for keeping the current
+                size.
+        """
+        Component.profiling_enabled = enabled
+        if max_call_times is not None:
+            Component.call_times = deque(Component.call_times, maxlen=max_call_times)
+
+    @staticmethod
+    def record_call(component_name, method_name, runtime):
+        """
+        Records a single (profiled) define-by-run API-method call.
+        """
+        Component.call_count += 1
+        Component.call_times.append((component_name, method_name, runtime))
+        histogram = Component.call_histograms.get((component_name, method_name))
+        if histogram is None:
+            histogram = LatencyHistogram()
+            Component.call_histograms[(component_name, method_name)] = histogram
+        histogram.record(runtime)
+
+    @staticmethod
+    def get_profile_histograms():
+        """
+        Returns:
+            dict: Latency stats (see `LatencyHistogram.to_dict`) per "[component name].[method name]".
+        """
+        return {"{}.{}".format(*key): histogram.to_dict() for key, histogram in Component.call_histograms.items()}
+
+    @staticmethod
+    def reset_profile(histograms=False):
         """
         Sets profiling values to 0.
+
+        Args:
+            histograms (bool): Whether to also reset the aggregated latency histograms.
         """
         Component.call_count = 0
-        Component.call_times = []
+        Component.call_times.clear()
+        if histograms is True:
+            Component.call_histograms = {}
 
     def __str__(self):
         return "{}('{}' api={})".format(type(self).__name__, self.name, str(list(self.api_methods.keys())))
@@ -30,6 +30,9 @@ elif get_backend() == "pytorch":
 class SequenceHelper(Component):
     """
     A helper Component that helps manipulate sequences with various utilities, e.g. for discounting.
+
+    All utilities operate on the whole batch at once (no per-element loops): Sub-sequence boundaries are turned into
+    masks and discounted sums are computed with a parallel (log-step) scan.
     """
 
     def __init__(self, scope="sequence-helper", **kwargs):
@@ -46,60 +49,14 @@ class SequenceHelper(Component):
             Sequence lengths.
         """
         if get_backend() == "tf":
-            # TensorArray:
-            elems = tf.shape(input=sequence_indices)[0]
-            sequence_lengths = tf.TensorArray(
-                dtype=tf.int32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-
-            def update(write_index, sequence_array, length):
-                # Write to index, increase
-                sequence_array = sequence_array.write(write_index, length)
-                return sequence_array, write_index + 1, 0
-
-            def insert_body(index, length, sequence_lengths, write_index):
-                length += 1
-
-                # Update tensor array, reset length to 0.
-                sequence_lengths, write_index, length = tf.cond(
-                    pred=tf.equal(sequence_indices[index], tf.ones_like(sequence_indices[index])),
-                    true_fn=lambda: update(write_index, sequence_lengths, length),
-                    false_fn=lambda: (sequence_lengths, write_index, length)
-                )
-                return index + 1, length, sequence_lengths, write_index
-
-            def cond(index, length, sequence_lengths, write_index):
-                return index < elems
-
-            _, final_length, sequence_lengths, write_index = tf.while_loop(
-                cond=cond,
-                body=insert_body,
-                loop_vars=[0, 0, sequence_lengths, 0],
-                back_prop=False
-            )
-            # If the final element was terminal -> already included.
-            sequence_lengths, _, _ = tf.cond(
-                pred=tf.greater(final_length, 0),
-                true_fn=lambda: update(write_index, sequence_lengths, final_length),
-                false_fn=lambda: (sequence_lengths, write_index, final_length)
-            )
-            return sequence_lengths.stack()
+            end_positions = tf.cast(tf.where(_tf_sequence_ends(sequence_indices))[:, 0], dtype=tf.int32)
+            # Length = distance to the previous sequence's end.
+            previous_end_positions = tf.concat([[-1], end_positions], axis=0)[:-1]
+            return tf.stop_gradient(end_positions - previous_end_positions)
         elif get_backend() == "pytorch":
-            sequence_lengths = []
-            length = 0
-            for index in sequence_indices:
-                length += 1
-                if index == 1:
-                    sequence_lengths.append(length)
-                    length = 0
-            # Append final sequence.
-            if length > 0:
-                sequence_lengths.append(length)
-            return torch.tensor(sequence_lengths, dtype=torch.int32)
+            end_positions = torch.nonzero(_torch_sequence_ends(sequence_indices)).view(-1)
+            previous_end_positions = torch.cat([end_positions.new_tensor([-1]), end_positions])[:-1]
+            return (end_positions - previous_end_positions).int()
 
     @rlgraph_api(returns=2)
     def _graph_fn_calc_sequence_decays(self, sequence_indices, decay=0.9):
@@ -123,81 +80,30 @@ class SequenceHelper(Component):
                 - Decays.
         """
         if get_backend() == "tf":
-            elems = tf.shape(input=sequence_indices)[0]
-            sequence_indices = tf.cast(sequence_indices, dtype=tf.int32)
-
-            # TensorArray:
-            sequence_lengths = tf.TensorArray(
-                dtype=tf.int32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-            decays = tf.TensorArray(
-                dtype=tf.float32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-
-            def update(write_index, sequence_array, length):
-                # Write to index, increase
-                sequence_array = sequence_array.write(write_index, length)
-                return sequence_array, write_index + 1, 0
-
-            def insert_body(index, length, sequence_lengths, write_index, decays):
-                # Decay is based on length, so val = decay^length
-                decay_val = tf.pow(x=decay, y=tf.cast(length, dtype=tf.float32))
-
-                # Write decay val into array.
-                decays = decays.write(index, decay_val)
-                length += 1
-
-                # Update tensor array, reset length to 0.
-                sequence_lengths, write_index, length = tf.cond(
-                    pred=tf.equal(sequence_indices[index], 1),
-                    true_fn=lambda: update(write_index, sequence_lengths, length),
-                    false_fn=lambda: (sequence_lengths, write_index, length)
-                )
-                return index + 1, length, sequence_lengths, write_index, decays
-
-            def cond(index, length, sequence_lengths, write_index, decays):
-                return index < elems
-
-            index, final_length, sequence_lengths, write_index, decays = tf.while_loop(
-                cond=cond,
-                body=insert_body,
-                loop_vars=[0, 0, sequence_lengths, 0, decays],
-                back_prop=False
-            )
-
-            # If the final element was terminal -> already included.
-            # Decays need no updating because we just wrote them always.
-            sequence_lengths, _, _ = tf.cond(
-                pred=tf.greater(final_length, 0),
-                true_fn=lambda: update(write_index, sequence_lengths, final_length),
-                false_fn=lambda: (sequence_lengths, write_index, final_length)
-            )
-            return tf.stop_gradient(sequence_lengths.stack()), tf.stop_gradient(decays.stack())
+            sequence_ends = _tf_sequence_ends(sequence_indices)
+            end_positions = tf.cast(tf.where(sequence_ends)[:, 0], dtype=tf.int32)
+            previous_end_positions = tf.concat([[-1], end_positions], axis=0)[:-1]
+            sequence_lengths = end_positions - previous_end_positions
+
+            # Decay is based on the position within the sub-sequence, so val = decay^(index - start index).
+            starts = tf.concat([[True], sequence_ends[:-1]], axis=0)
+            sequence_ids = tf.cumsum(tf.cast(starts, dtype=tf.int32)) - 1
+            start_positions = tf.cast(tf.where(starts)[:, 0], dtype=tf.int32)
+            offsets = tf.range(tf.shape(sequence_ends)[0]) - tf.gather(start_positions, sequence_ids)
+            decays = tf.pow(x=tf.cast(decay, dtype=tf.float32), y=tf.cast(offsets, dtype=tf.float32))
+            return tf.stop_gradient(sequence_lengths), tf.stop_gradient(decays)
         elif get_backend() == "pytorch":
-            sequence_lengths = []
-            decays = []
-
-            length = 0
-            for index in sequence_indices:
-                # Compute decay based on sequence length.
-                decays.append(pow(decay, length))
-                length += 1
-                if index == 1:
-                    sequence_lengths.append(length)
-                    length = 0
-
-            # Append final sequence.
-            if length > 0:
-                sequence_lengths.append(length)
-            return torch.tensor(sequence_lengths, dtype=torch.int32), torch.tensor(decays, dtype=torch.int32)
+            sequence_ends = _torch_sequence_ends(sequence_indices)
+            end_positions = torch.nonzero(sequence_ends).view(-1)
+            previous_end_positions = torch.cat([end_positions.new_tensor([-1]), end_positions])[:-1]
+            sequence_lengths = end_positions - previous_end_positions
+
+            starts = torch.cat([sequence_ends.new_ones(1), sequence_ends[:-1]])
+            sequence_ids = torch.cumsum(starts.long(), dim=0) - 1
+            start_positions = torch.nonzero(starts).view(-1)
+            offsets = torch.arange(len(sequence_ends)) - start_positions[sequence_ids]
+            decays = torch.pow(torch.as_tensor(decay).float(), offsets.float())
+            return sequence_lengths.int(), decays
 
     @rlgraph_api
     def _graph_fn_reverse_apply_decays_to_sequence(self, values, sequence_indices, decay=0.9):
@@ -214,70 +120,12 @@ class SequenceHelper(Component):
             Decayed sequence values.
         """
         if get_backend() == "tf":
-            elems = tf.shape(input=sequence_indices)[0]
-            decayed_values = tf.TensorArray(
-                dtype=tf.float32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-            sequence_indices = tf.cast(sequence_indices, dtype=tf.int32)
-
-            def insert_body(index, prev_v, decayed_values):
-                # NOTE: We cannot prev_v to 0.0 because values[index] might have a more complex shape,
-                # so this violates shape checks.
-                prev_v = tf.cond(
-                    pred=tf.equal(sequence_indices[index], tf.ones_like(sequence_indices[index])),
-                    true_fn=lambda: tf.zeros_like(prev_v),
-                    false_fn=lambda: prev_v
-                )
-                # index = tf.Print(index, [index, prev_v], summarize=100, message="index, prev = ")
-
-                # Decay is based on length, so val = decay^length
-                accum_v = values[index] + decay * prev_v
-
-                # Write decayed val into array.
-                decayed_values = decayed_values.write(index, accum_v)
-                prev_v = accum_v
-
-                # Increase write-index and length of sub-sequence, decrease loop index in reverse iteration.
-                return index - 1, prev_v, decayed_values
-
-            def cond(index, prev_v, decayed_values):
-                # Scan in reverse.
-                return index >= 0
-
-            _, _, decayed_values = tf.while_loop(
-                cond=cond,
-                body=insert_body,
-                # loop index, index writing to tensor array, current length of sub-sequence, previous val (float)
-                loop_vars=[elems - 1, tf.zeros_like(values[-1]), decayed_values],
-                back_prop=False
-            )
-
-            decayed_values = decayed_values.stack()
-            return tf.stop_gradient(decayed_values)
-
+            # No accumulation across the end of a sub-sequence.
+            decays = decay * (1.0 - tf.cast(sequence_indices, dtype=tf.float32))
+            return tf.stop_gradient(_tf_reverse_discounted_cumsum(tf.cast(values, dtype=tf.float32), decays))
         elif get_backend() == "pytorch":
-            # Scan sequences in reverse:
-            decayed_values = []
-            i = len(values.data) - 1
-            prev_v = 0
-            for v in reversed(values.data):
-                # Arrived at new sequence, start over.
-                if sequence_indices[i] == 1:
-                    prev_v = 0
-
-                # Accumulate prior value.
-                accum_v = v + decay * prev_v
-                decayed_values.append(accum_v)
-                prev_v = accum_v
-
-                i -= 1
-
-            # Reverse, convert, and return final.
-            return torch.tensor(list(reversed(decayed_values)), dtype=torch.float32)
+            decays = torch.as_tensor(decay).float() * (1.0 - torch.as_tensor(sequence_indices).float())
+            return _torch_reverse_discounted_cumsum(torch.as_tensor(values).detach().float(), decays.float())
 
     @rlgraph_api
     def _graph_fn_bootstrap_values(self, rewards, values, terminals, sequence_indices, discount=0.99):
@@ -301,98 +149,79 @@ class SequenceHelper(Component):
             Sequence of deltas.
         """
         if get_backend() == "tf":
-            values = tf.squeeze(input=values)
-            num_values = tf.shape(input=values)[0]
-
+            values = tf.reshape(tf.cast(values, dtype=tf.float32), shape=tf.shape(input=rewards))
+            rewards = tf.cast(rewards, dtype=tf.float32)
             # Again ensure last index is 1 for any sub-sample arriving here.
-            last_sequence = tf.expand_dims(sequence_indices[-1], -1)
-            sequence_indices = tf.concat([sequence_indices[:-1], tf.ones_like(last_sequence, dtype=tf.bool)], axis=0)
-
-            # Cannot use 0.0 because unknown shape.
-            deltas = tf.TensorArray(dtype=tf.float32, infer_shape=False, size=num_values,
-                                    dynamic_size=False, clear_after_read=False, name="bootstrap-deltas")
-
-            # Boot-strap with 0 only if terminals[i] and sequence_indices[i] are both true.
-            boot_strap_zeros = tf.where(
-                condition=tf.logical_and(sequence_indices, terminals),
-                x=tf.ones_like(sequence_indices),
-                y=tf.zeros_like(sequence_indices),
-            )
-
-            def write(index, deltas, start_index):
-                # First: Concat the slice of values representing the current sequence with bootstrap value.
-                baseline_slice = values[start_index:index + 1]
-                # Expand so value has a batch dim when we concat.
-
-                # If true terminal, append 0. Otherwise, append boot-strap val -> last observed val.
-                bootstrap_value = tf.cond(
-                    pred=tf.equal(boot_strap_zeros[index], tf.ones_like(sequence_indices[index])),
-                    true_fn=lambda: tf.zeros_like(tensor=values[index], dtype=tf.float32),
-                    false_fn=lambda: values[index],
-                )
-
-                value = tf.expand_dims(bootstrap_value, 0)
-                adjusted_v = tf.concat([baseline_slice, value], axis=0)
-
-                # Compute deltas for this sequence.
-                sequence_deltas = rewards[start_index:index + 1] + discount * adjusted_v[1:] - adjusted_v[:-1]
-
-                # Write delta to tensor-array.
-                write_indices = tf.range(start=start_index, limit=index + 1)
-                deltas = deltas.scatter(write_indices, sequence_deltas)
-
-                start_index = index + 1
-                # Set start-index for the next sub-sequence to index + 1
-                return deltas, start_index
-
-            def body(index, start_index, deltas):
-                # Whenever we encounter a sequence end, we compute deltas for that sequence.
-                deltas, start_index = tf.cond(
-                    pred=tf.equal(sequence_indices[index], tf.ones_like(sequence_indices[index])),
-                    true_fn=lambda: write(index, deltas, start_index),
-                    false_fn=lambda: (deltas, start_index)
-                )
-                return index + 1, start_index, deltas
-
-            def cond(index, start_index, deltas):
-                return index < num_values
-
-            index, start_index, deltas = tf.while_loop(
-                cond=cond,
-                body=body,
-                loop_vars=[0, 0, deltas],
-                parallel_iterations=1,
-                back_prop=False
-            )
-
-            deltas = deltas.stack()
-            # Squeeze because we inserted
-            return tf.squeeze(deltas)
+            sequence_ends = tf.cast(_tf_sequence_ends(sequence_indices), dtype=tf.float32)
+            # If true terminal, bootstrap with 0. Otherwise, bootstrap with last observed value of the sub-sequence.
+            bootstrap_values = values * (1.0 - tf.cast(terminals, dtype=tf.float32))
+            next_values = sequence_ends * bootstrap_values + \
+                (1.0 - sequence_ends) * tf.concat([values[1:], values[-1:]], axis=0)
+            return tf.stop_gradient(rewards + discount * next_values - values)
         elif get_backend() == "pytorch":
-            deltas = []
-            discount_tensor = torch.tensor(discount)
-            start_index = 0
-            i = 0
-            if len(values) > 1:
-                last_sequence = torch.unsqueeze(sequence_indices[-1], -1)
-                sequence_indices = torch.cat((sequence_indices[:-1], torch.ones_like(last_sequence)), 0)
-
-            for _ in range(len(values)):
-                if sequence_indices[i]:
-                    # Compute deltas for this sub-sequence.
-                    # Cannot do this all at once because we would need the correct offsets for each sub-sequence.
-                    baseline_slice = list(values[start_index:i + 1])
-                    if terminals[i]:
-                        baseline_slice.append(0)
-                    else:
-                        baseline_slice.append(values[-1])
-                    adjusted_v = torch.tensor(baseline_slice)
-
-                    # +1 because we want to include i-th value.
-                    delta = rewards[start_index:i + 1] + discount_tensor * adjusted_v[1:] - adjusted_v[:-1]
-                    deltas.extend(delta)
-                    start_index = i + 1
-                i += 1
-
-            return torch.tensor(deltas)
+            rewards = torch.as_tensor(rewards).float()
+            values = torch.reshape(torch.as_tensor(values).detach().float(), rewards.shape)
+            sequence_ends = _torch_sequence_ends(sequence_indices).float()
+            bootstrap_values = values * (1.0 - torch.as_tensor(terminals).float())
+            next_values = sequence_ends * bootstrap_values + \
+                (1.0 - sequence_ends) * torch.cat([values[1:], values[-1:]])
+            return rewards + torch.as_tensor(discount).float() * next_values - values
+
 
+def _tf_sequence_ends(sequence_indices):
+    """
+    Returns:
+        DataOp: Bool mask of the last elements of all sub-sequences (the final element always ends a sub-sequence).
+    """
+    elems = tf.shape(input=sequence_indices)[0]
+    return tf.logical_or(tf.cast(sequence_indices, dtype=tf.bool), tf.equal(tf.range(elems), elems - 1))
+
+
+def _torch_sequence_ends(sequence_indices):
+    sequence_indices = torch.as_tensor(sequence_indices)
+    return (sequence_indices.float() + (torch.arange(len(sequence_indices)) == len(sequence_indices) - 1).float()) > 0
+
+
+def _tf_reverse_discounted_cumsum(values, decays):
+    """
+    Computes y[i] = values[i] + decays[i] * y[i + 1] (with y[n] = 0) for all i in log2(n) vectorized steps: After
+    each step, values[i] and decays[i] describe the composed map from y[i + offset] to y[i].
+
+    Args:
+        values (DataOp): The values (with batch rank as first rank).
+        decays (DataOp): The (batch-only) decays. 0.0 where an accumulation should stop.
+
+    Returns:
+        DataOp: The discounted reverse cumulative sums.
+    """
+    for _ in range(len(values.shape) - 1):
+        decays = tf.expand_dims(decays, axis=-1)
+    elems = tf.shape(input=values)[0]
+
+    def shift(x, offset):
+        shifted = tf.concat([x[offset:], tf.zeros_like(x[:offset])], axis=0)
+        shifted.set_shape(x.shape)
+        return shifted
+
+    def body(offset, values, decays):
+        values = values + decays * shift(values, offset)
+        decays = decays * shift(decays, offset)
+        return offset * 2, values, decays
+
+    _, values, _ = tf.while_loop(
+        cond=lambda offset, values, decays: offset < elems,
+        body=body,
+        loop_vars=[1, values, decays],
+        back_prop=False
+    )
+    return values
+
+
+def _torch_reverse_discounted_cumsum(values, decays):
+    decays = decays.view(decays.shape + (1,) * (values.dim() - 1))
+    offset = 1
+    while offset < len(values):
+        values = values + decays * torch.cat([values[offset:], torch.zeros_like(values[:offset])])
+        decays = decays * torch.cat([decays[offset:], torch.zeros_like(decays[:offset])])
+        offset *= 2
+    return values
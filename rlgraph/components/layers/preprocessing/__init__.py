@@ -24,6 +24,7 @@ from rlgraph.components.layers.preprocessing.convert_type import ConvertType
 from rlgraph.components.layers.preprocessing.grayscale import GrayScale
 from rlgraph.components.layers.preprocessing.image_binary import ImageBinary
 from rlgraph.components.layers.preprocessing.image_crop import ImageCrop
+from rlgraph.components.layers.preprocessing.image_pipeline import ImagePipeline
 from rlgraph.components.layers.preprocessing.image_resize import ImageResize
 from rlgraph.components.layers.preprocessing.moving_standardize import MovingStandardize
 from rlgraph.components.layers.preprocessing.multiply_divide import Multiply, Divide
@@ -43,6 +44,7 @@ PreprocessLayer.__lookup_classes__ = dict(
     converttype=ConvertType,
     containersplitter=ContainerSplitter,
     imagecrop=ImageCrop,
+    imagepipeline=ImagePipeline,
     imageresize=ImageResize,
     multiply=Multiply,
     normalize=Normalize,
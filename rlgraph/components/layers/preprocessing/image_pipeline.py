@@ -0,0 +1,241 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from rlgraph import get_backend
+from rlgraph.components.layers.preprocessing.preprocess_layer import PreprocessLayer
+from rlgraph.spaces import FloatBox, IntBox
+from rlgraph.utils.decorators import rlgraph_api
+from rlgraph.utils.ops import flatten_op, unflatten_op
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.util import convert_dtype
+
+cv2.ocl.setUseOpenCL(False)
+
+if get_backend() == "tf":
+    import tensorflow as tf
+    from tensorflow.python.ops.image_ops_impl import ResizeMethod
+elif get_backend() == "pytorch":
+    import torch
+
+
+# Shared thread pools (by number of threads) for processing batches of images in parallel.
+_thread_pools = {}
+
+
+def _get_thread_pool(num_threads):
+    pool = _thread_pools.get(num_threads)
+    if pool is None:
+        pool = _thread_pools[num_threads] = ThreadPoolExecutor(max_workers=num_threads)
+    return pool
+
+
+class ImagePipeline(PreprocessLayer):
+    """
+    A fused image preprocessor that crops, gray-scales, resizes and type-converts one or more images (in this
+    order, each step being optional). Replaces a stack of ImageCrop, GrayScale, ImageResize and ConvertType layers.
+
+    In the python and pytorch backends, each image goes through all steps with cv2 at once and is written directly
+    into a preallocated output batch. Batches can be spread over a small thread pool, as cv2 releases the GIL.
+    """
+    def __init__(self, crop=None, grayscale=False, keep_rank=False, width=None, height=None, interpolation="area",
+                 dtype=None, num_threads=1, scope="image-pipeline", **kwargs):
+        """
+        Args:
+            crop (Optional[dict]): The crop-box (keys: x, y, width, height, see ImageCrop) to cut out of the images.
+                None for no cropping.
+            grayscale (bool): Whether to gray-scale the (RGB) images. Default: False.
+            keep_rank (bool): Whether to keep the color rank (with dim=1) after gray-scaling. Default: False.
+            width (Optional[int]): The width to resize the images to. None for no resizing.
+            height (Optional[int]): The height to resize the images to. None for no resizing.
+            interpolation (str): One of "bilinear", "area". Default: "area".
+            dtype (Optional[str]): The dtype to convert the images to. None for keeping the input dtype.
+            num_threads (int): The number of threads to process a batch of images with (python and pytorch
+                backends). Default: 1 (no thread pool).
+        """
+        super(ImagePipeline, self).__init__(scope=scope, **kwargs)
+
+        self.crop = crop
+        if self.crop is not None:
+            assert self.crop.get("x", 0) >= 0 and self.crop.get("y", 0) >= 0
+            assert self.crop["width"] > 0 and self.crop["height"] > 0
+        self.grayscale = grayscale
+        self.keep_rank = keep_rank
+        assert (width is None) == (height is None), "ERROR: Must provide both `width` and `height` (or none)!"
+        self.width = width
+        self.height = height
+        if interpolation == "bilinear":
+            if get_backend() == "tf":
+                self.tf_interpolation = ResizeMethod.BILINEAR
+            self.cv2_interpolation = cv2.INTER_LINEAR
+        elif interpolation == "area":
+            if get_backend() == "tf":
+                self.tf_interpolation = ResizeMethod.AREA
+            self.cv2_interpolation = cv2.INTER_AREA
+        else:
+            raise RLGraphError("Invalid interpolation algorithm {}!. Allowed are 'bilinear' and "
+                               "'area'.".format(interpolation))
+        self.dtype = dtype
+        self.num_threads = num_threads
+
+        # The output spaces after preprocessing (per flat-key).
+        self.output_spaces = None
+
+    def get_output_image_shape(self, shape):
+        """
+        Args:
+            shape (tuple): The shape of a single input image (height, width[, colors]).
+
+        Returns:
+            tuple: The shape of a single output image.
+        """
+        shape = list(shape)
+        if self.crop is not None:
+            shape[0] = min(self.crop["height"], shape[0] - self.crop.get("y", 0))
+            shape[1] = min(self.crop["width"], shape[1] - self.crop.get("x", 0))
+        if self.grayscale is True:
+            if self.keep_rank is True:
+                shape[-1] = 1
+            else:
+                shape.pop(-1)
+        if self.width is not None:
+            shape[0] = self.height
+            shape[1] = self.width
+        return tuple(shape)
+
+    def get_preprocessed_space(self, space):
+        ret = dict()
+        for key, value in space.flatten().items():
+            rank = value.rank
+            assert rank == 2 or rank == 3, \
+                "ERROR: Given image's rank (which is {}{}, not counting batch rank) must be either 2 or 3!".\
+                format(rank, ("" if key == "" else " for key '{}'".format(key)))
+            shape = self.get_output_image_shape(value.shape)
+            dtype = convert_dtype(self.dtype, "np") if self.dtype is not None else value.dtype
+            low, high = value.global_bounds if value.global_bounds is not False else (None, None)
+            if np.issubdtype(dtype, np.floating):
+                ret[key] = FloatBox(
+                    low=low, high=high, shape=shape, dtype=dtype, add_batch_rank=value.has_batch_rank
+                )
+            else:
+                bounded = low is not None and np.isfinite(low) and np.isfinite(high)
+                ret[key] = IntBox(
+                    low=int(low) if bounded else None, high=int(high) if bounded else None, shape=shape, dtype=dtype,
+                    add_batch_rank=value.has_batch_rank
+                )
+        return unflatten_op(ret)
+
+    def create_variables(self, input_spaces, action_space=None):
+        in_space = input_spaces["inputs"]
+        self.output_spaces = flatten_op(self.get_preprocessed_space(in_space))
+
+    @rlgraph_api(flatten_ops=True, split_ops=True)
+    def _graph_fn_call(self, inputs):
+        """
+        Images come in with either a batch dimension or not.
+        """
+        if self.backend == "python" or get_backend() == "python":
+            return self.process_images(np.asarray(inputs))
+        elif get_backend() == "pytorch":
+            if isinstance(inputs, list):
+                inputs = torch.tensor(inputs)
+            return torch.from_numpy(self.process_images(inputs.numpy()))
+        elif get_backend() == "tf":
+            images = inputs
+            if self.crop is not None:
+                images = tf.image.crop_to_bounding_box(
+                    image=images, offset_height=self.crop.get("y", 0), offset_width=self.crop.get("x", 0),
+                    target_height=self.crop["height"], target_width=self.crop["width"]
+                )
+            if self.grayscale is True:
+                weights = tf.constant((0.299, 0.587, 0.114), dtype=tf.float32)
+                images = tf.reduce_sum(tf.cast(images, dtype=tf.float32) * weights, axis=-1, keepdims=self.keep_rank)
+                if inputs.dtype.is_integer:
+                    images = tf.cast(tf.round(images), dtype=inputs.dtype)
+            if self.width is not None:
+                # Resizing needs a color rank.
+                has_color_rank = self.grayscale is False or self.keep_rank is True
+                if not has_color_rank:
+                    images = tf.expand_dims(images, axis=-1)
+                images = tf.image.resize_images(
+                    images=images, size=(self.height, self.width), method=self.tf_interpolation
+                )
+                if not has_color_rank:
+                    images = tf.squeeze(images, axis=-1)
+            dtype = convert_dtype(self.dtype, "tf") if self.dtype is not None else inputs.dtype
+            if images.dtype != dtype:
+                images = tf.cast(images, dtype=dtype)
+            return images
+
+    def process_images(self, images):
+        """
+        Runs all steps on a single image or a batch of images (numpy) with cv2.
+
+        Args:
+            images (np.ndarray): A single image (rank 2 or 3) or a batch of images (rank 4, or rank 3 for a batch
+                of color-less images if this layer has been built with a rank 2 input Space).
+
+        Returns:
+            np.ndarray: The preallocated output with all processed images.
+        """
+        image_rank = 3
+        if self.output_spaces is not None:
+            image_rank = next(iter(self.output_spaces.values())).rank + \
+                (1 if self.grayscale is True and self.keep_rank is False else 0)
+        dtype = convert_dtype(self.dtype, "np") if self.dtype is not None else images.dtype
+        # Single image.
+        if images.ndim < image_rank + 1:
+            out = np.empty(self.get_output_image_shape(images.shape), dtype=dtype)
+            self._process_image(images, out)
+            return out
+
+        out = np.empty((len(images),) + self.get_output_image_shape(images.shape[1:]), dtype=dtype)
+        num_threads = min(self.num_threads, len(images))
+        if num_threads > 1:
+            def process_chunk(indices):
+                for i in indices:
+                    self._process_image(images[i], out[i])
+            # Wait for all chunks (and re-raise possible errors).
+            list(_get_thread_pool(num_threads).map(process_chunk, np.array_split(np.arange(len(images)), num_threads)))
+        else:
+            for i in range(len(images)):
+                self._process_image(images[i], out[i])
+        return out
+
+    def _process_image(self, image, out):
+        """
+        Processes a single image and writes the result into `out`.
+        """
+        if self.crop is not None:
+            y, x = self.crop.get("y", 0), self.crop.get("x", 0)
+            image = image[y:y + self.crop["height"], x:x + self.crop["width"]]
+        if self.grayscale is True:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        if self.width is not None:
+            # cv2.resize removes a color rank with dim=1 (e.g. grayscale).
+            dst = out.reshape((self.height, self.width)) if out.shape[-1:] == (1,) else out
+            if dst.dtype == image.dtype and image.ndim == dst.ndim:
+                cv2.resize(image, dsize=(self.width, self.height), dst=dst, interpolation=self.cv2_interpolation)
+                return
+            image = cv2.resize(image, dsize=(self.width, self.height), interpolation=self.cv2_interpolation)
+        out[...] = image.reshape(out.shape)
@@ -33,6 +33,11 @@ elif get_backend() == "pytorch":
 class MovingStandardize(PreprocessLayer):
     """
     Standardizes inputs using a moving estimate of mean and std.
+
+    Python and pytorch backends: Statistics can be synchronized across many workers (e.g. Ray workers) via
+    `pop_statistics` (on the workers), `merge_statistics` (e.g. on the learner) and `set_statistics` (on the
+    workers), in which case inputs are standardized using the merged statistics plus the worker's own samples
+    since the last `set_statistics` call.
     """
     def __init__(self, batch_size=1, scope="moving-standardize", **kwargs):
         """
@@ -48,6 +53,9 @@ class MovingStandardize(PreprocessLayer):
 
         # Current estimate of sum of stds.
         self.std_sum_est = None
+        # Statistics set via `set_statistics` and statistics of all inputs since the last `pop_statistics` call.
+        self.prior_statistics = None
+        self.pending_statistics = None
         self.output_spaces = None
         self.in_shape = None
 
@@ -57,9 +65,11 @@ class MovingStandardize(PreprocessLayer):
         self.in_shape = (self.batch_size, ) + in_space.shape
 
         if self.backend == "python" or get_backend() == "python" or get_backend() == "pytorch":
-            self.sample_count = 0.0
+            # One sample count per batch position.
+            self.sample_count = np.zeros((self.batch_size,), dtype=np.float32)
             self.mean_est = np.zeros(self.in_shape, dtype=np.float32)
             self.std_sum_est = np.zeros(self.in_shape, dtype=np.float32)
+            self.pending_statistics = _empty_statistics(in_space.shape)
         elif get_backend() == "tf":
             self.sample_count = self.get_variable(name="sample-count", dtype="float", initializer=0.0, trainable=False)
             self.mean_est = self.get_variable(
@@ -79,37 +89,94 @@ class MovingStandardize(PreprocessLayer):
 
     @rlgraph_api
     def _graph_fn_reset(self):
+        # Python: Statistics set via `set_statistics` and not yet popped statistics are kept.
         if self.backend == "python" or get_backend() == "python" or get_backend() == "pytorch":
-            self.sample_count = 0.0
-            self.mean_est = np.zeros(self.in_shape)
-            self.std_sum_est = np.zeros(self.in_shape)
+            self.sample_count = np.zeros((self.batch_size,), dtype=np.float32)
+            self.mean_est = np.zeros(self.in_shape, dtype=np.float32)
+            self.std_sum_est = np.zeros(self.in_shape, dtype=np.float32)
         elif get_backend() == "tf":
             return tf.variables_initializer([self.sample_count, self.mean_est, self.std_sum_est])
 
+    def reset_batch_positions(self, batch_positions):
+        self.sample_count[batch_positions] = 0.0
+        self.mean_est[batch_positions] = 0.0
+        self.std_sum_est[batch_positions] = 0.0
+
+    def pop_statistics(self):
+        """
+        Python-backend only: Returns the statistics of all inputs since the last call (e.g. to be merged with
+        other workers' statistics via `merge_statistics`).
+
+        Returns:
+            dict: Sample count, mean and sum of squared differences from the mean ("m2") of the inputs.
+        """
+        statistics = self.pending_statistics
+        self.pending_statistics = _empty_statistics(statistics["mean"].shape)
+        return statistics
+
+    def set_statistics(self, statistics):
+        """
+        Python-backend only: Sets the statistics to standardize with (e.g. merged from all workers), discarding
+        the current (per batch position) estimates. These must be contained in `statistics` already (popped
+        before via `pop_statistics`).
+
+        Args:
+            statistics (dict): Sample count, mean and m2 (see `pop_statistics`).
+        """
+        self.prior_statistics = dict(
+            count=float(statistics["count"]), mean=np.asarray(statistics["mean"], dtype=np.float32),
+            m2=np.asarray(statistics["m2"], dtype=np.float32)
+        )
+        self.sample_count[:] = 0.0
+        self.mean_est[:] = 0.0
+        self.std_sum_est[:] = 0.0
+
     @rlgraph_api
     def _graph_fn_call(self, inputs):
         if self.backend == "python" or get_backend() == "python" or get_backend() == "pytorch":
             # https://www.johndcook.com/blog/standard_deviation/
+            # https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Parallel_algorithm
             inputs = np.asarray(inputs, dtype=np.float32)
-            self.sample_count += 1.0
-            if self.sample_count == 1.0:
-                self.mean_est[...] = inputs
+            # Single sample without batch rank.
+            has_batch_rank = inputs.ndim == self.mean_est.ndim
+            if not has_batch_rank:
+                inputs = inputs[np.newaxis]
+            # Broadcast the per-batch-position counts against the estimates.
+            count_shape = (-1,) + (1,) * (self.mean_est.ndim - 1)
+            if len(inputs) == len(self.sample_count):
+                # One new sample per batch position.
+                # For a count of 1, this sets the mean to the input and leaves the std-sum unchanged.
+                self.sample_count, self.mean_est, self.std_sum_est = merge_moments(
+                    self.sample_count, self.mean_est, self.std_sum_est, 1.0, inputs, 0.0, count_shape
+                )
             else:
-                update = inputs - self.mean_est
-                self.mean_est[...] += update / self.sample_count
-                self.std_sum_est[...] += update * update * (self.sample_count - 1.0) / self.sample_count
+                # A whole batch of samples for a single batch position.
+                assert len(self.sample_count) == 1, \
+                    "ERROR: Batch size {} does not match `batch_size` ({})!".format(len(inputs), self.batch_size)
+                self.sample_count, self.mean_est, self.std_sum_est = merge_moments(
+                    self.sample_count, self.mean_est, self.std_sum_est, *_get_moments(inputs, keepdims=True),
+                    count_shape=count_shape
+                )
+            pending = self.pending_statistics
+            pending["count"], pending["mean"], pending["m2"] = merge_moments(
+                pending["count"], pending["mean"], pending["m2"], *_get_moments(inputs)
+            )
+
+            count, mean, m2 = self.sample_count.reshape(count_shape), self.mean_est, self.std_sum_est
+            if self.prior_statistics is not None:
+                prior = self.prior_statistics
+                count, mean, m2 = merge_moments(count, mean, m2, prior["count"], prior["mean"], prior["m2"])
 
             # Subtract mean.
-            result = inputs - self.mean_est
+            result = inputs - mean
 
             # Estimate variance via sum of variance.
-            if self.sample_count > 1.0:
-                var_estimate = self.std_sum_est / (self.sample_count - 1.0)
-            else:
-                var_estimate = np.square(self.mean_est)
+            var_estimate = np.where(count > 1.0, m2 / np.maximum(count - 1.0, 1.0), np.square(mean))
             std = np.sqrt(var_estimate) + SMALL_NUMBER
 
             standardized = result / std
+            if not has_batch_rank:
+                standardized = standardized[0]
             if get_backend() == "pytorch":
                 standardized = torch.Tensor(standardized)
             return standardized
@@ -140,3 +207,53 @@ class MovingStandardize(PreprocessLayer):
                 std = tf.sqrt(x=var_estimate) + SMALL_NUMBER
 
                 return result / std
+
+
+def merge_statistics(*statistics):
+    """
+    Merges the statistics of several MovingStandardize layers (e.g. popped from many workers).
+
+    Args:
+        statistics (dict): Sample count, mean and m2 (see `MovingStandardize.pop_statistics`) each.
+
+    Returns:
+        dict: The statistics of all samples.
+    """
+    merged = statistics[0]
+    for other in statistics[1:]:
+        count, mean, m2 = merge_moments(
+            merged["count"], merged["mean"], merged["m2"], other["count"], other["mean"], other["m2"]
+        )
+        merged = dict(count=count, mean=mean, m2=m2)
+    return merged
+
+
+def merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b, count_shape=None):
+    """
+    Merges two sets of (count, mean, m2)-moments (Chan et al.'s parallel variance algorithm).
+
+    Args:
+        count_shape (Optional[tuple]): The shape to reshape array counts to, for broadcasting them against the means.
+
+    Returns:
+        tuple: The merged count, mean and m2.
+    """
+    count = count_a + count_b
+    if count_shape is not None:
+        count_a = np.reshape(count_a, count_shape)
+        count_b = np.reshape(count_b, count_shape)
+    merged_count = count_a + count_b
+    delta = mean_b - mean_a
+    # Avoid division by 0 (both counts are 0 then).
+    mean = mean_a + delta * (count_b / np.maximum(merged_count, 1.0))
+    m2 = m2_a + m2_b + delta * delta * (count_a * count_b / np.maximum(merged_count, 1.0))
+    return count, mean.astype(np.float32), m2.astype(np.float32)
+
+
+def _get_moments(samples, keepdims=False):
+    mean = np.mean(samples, axis=0, keepdims=keepdims)
+    return float(len(samples)), mean, np.sum(np.square(samples - mean), axis=0, keepdims=keepdims)
+
+
+def _empty_statistics(shape):
+    return dict(count=0.0, mean=np.zeros(shape, dtype=np.float32), m2=np.zeros(shape, dtype=np.float32))
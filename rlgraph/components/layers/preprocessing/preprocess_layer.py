@@ -48,6 +48,17 @@ class PreprocessLayer(Layer):
         # TODO: fix for python backend.
         return
 
+    def reset_batch_positions(self, batch_positions):
+        """
+        Python-backend only: Resets the state of this PreprocessLayer only for some positions in the batch, e.g. for
+        those environments of a vector env whose episodes ended, when all environments are preprocessed as one batch.
+        Stateless PreprocessLayers do not need to do anything here.
+
+        Args:
+            batch_positions (List[int]): The batch positions to reset.
+        """
+        pass
+
     @rlgraph_api(flatten_ops=True, split_ops=True)
     def _graph_fn_call(self, *inputs):
         return super(PreprocessLayer, self)._graph_fn_call(*inputs)
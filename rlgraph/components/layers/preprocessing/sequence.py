@@ -17,8 +17,6 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from collections import deque
-
 import numpy as np
 from six.moves import xrange as range_
 
@@ -79,7 +77,11 @@ class Sequence(PreprocessLayer):
         # The output spaces after preprocessing (per flat-key).
         self.output_spaces = None
         if self.backend == "python" or get_backend() == "python" or get_backend() == "pytorch":
-            self.deque = deque([], maxlen=self.sequence_length)
+            # Preallocated circular frame buffers (per flat-key) of shape [sequence_length, (batch,) ...].
+            # The slot at `self.index` holds the most recent input.
+            self.frames = {}
+            # Batch positions to be re-filled with the next input (python only).
+            self.reset_positions = []
 
     def get_preprocessed_space(self, space):
         ret = {}
@@ -122,9 +124,70 @@ class Sequence(PreprocessLayer):
     def _graph_fn_reset(self):
         if self.backend == "python" or get_backend() == "python" or get_backend() == "pytorch":
             self.index = -1
+            self.reset_positions = []
         elif get_backend() == "tf":
             return tf.variables_initializer([self.index])
 
+    def reset_batch_positions(self, batch_positions):
+        # The sequences of these positions will be filled with their next inputs (as after a full reset).
+        self.reset_positions.extend(batch_positions)
+
+    def _sequence_numpy(self, inputs):
+        """
+        Writes the inputs into the circular frame buffers (in place) and gathers the sequences (python and pytorch
+        backends).
+
+        Args:
+            inputs (Union[np.ndarray,torch.Tensor,dict]): The input(s) (with batch rank) or a dict of these (by
+                flat-key).
+
+        Returns:
+            Union[np.ndarray,FlattenedDataOp]: The sequence(s), newly allocated (not backed by the frame buffers).
+        """
+        slot = (self.index + 1) % self.sequence_length
+        if isinstance(inputs, dict):
+            sequences = FlattenedDataOp()
+            for key, value in inputs.items():
+                sequences[key] = self._sequence_single(key, value, slot)
+        else:
+            sequences = self._sequence_single("", inputs, slot)
+        self.reset_positions = []
+        self.index = slot
+        return sequences
+
+    def _sequence_single(self, key, inputs, slot):
+        if get_backend() == "pytorch" and isinstance(inputs, torch.Tensor):
+            inputs = inputs.numpy()
+        else:
+            inputs = np.asarray(inputs)
+
+        frames = self.frames.get(key)
+        # After a reset (or a change in batch size), fill the entire buffer with the input.
+        if self.index == -1 or frames is None or frames.shape[1:] != inputs.shape:
+            if frames is None or frames.shape[1:] != inputs.shape or frames.dtype != inputs.dtype:
+                frames = self.frames[key] = np.empty((self.sequence_length,) + inputs.shape, dtype=inputs.dtype)
+            frames[:] = inputs
+        else:
+            frames[slot] = inputs
+            # Fill the entire sequence of the reset batch positions with their new inputs.
+            if len(self.reset_positions) > 0:
+                frames[:, self.reset_positions] = inputs[self.reset_positions]
+
+        # Copy the frames (oldest first) once into the output.
+        sequence = [frames[(slot + 1 + i) % self.sequence_length] for i in range_(self.sequence_length)]
+        if self.add_rank:
+            sequence = np.stack(sequence, axis=-1)
+        # Concat the sequence items in the last rank.
+        else:
+            sequence = np.concatenate(sequence, axis=-1)
+
+        # TODO move into transpose component.
+        if self.in_data_format == "channels_last" and self.out_data_format == "channels_first" and \
+                sequence.ndim == 4:
+            # B W H C -> B C H W (e.g. PyTorch, which only supports channels first).
+            sequence = sequence.transpose((0, 3, 2, 1))
+        return sequence
+
     @rlgraph_api(flatten_ops=True, split_ops=False)
     def _graph_fn_call(self, inputs):
         """
@@ -141,63 +204,12 @@ class Sequence(PreprocessLayer):
         """
         # A normal (index != -1) assign op.
         if self.backend == "python" or get_backend() == "python":
-            if self.index == -1:
-                for _ in range_(self.sequence_length):
-                    self.deque.append(inputs)
-            else:
-                self.deque.append(inputs)
-            self.index = (self.index + 1) % self.sequence_length
-
-            if self.add_rank:
-                sequence = np.stack(self.deque, axis=-1)
-            # Concat the sequence items in the last rank.
-            else:
-                sequence = np.concatenate(self.deque, axis=-1)
-
-            # TODO move into transpose component.
-            if self.in_data_format == "channels_last" and self.out_data_format == "channels_first":
-                sequence = sequence.transpose((0, 3, 2, 1))
-
-            return sequence
+            return self._sequence_numpy(inputs)
         elif get_backend() == "pytorch":
-            if self.index == -1:
-                for _ in range_(self.sequence_length):
-                    if isinstance(inputs, dict):
-                        for key, value in inputs.items():
-                            self.deque.append(value)
-                    else:
-                        self.deque.append(inputs)
-            else:
-                if isinstance(inputs, dict):
-                    for key, value in inputs.items():
-                        self.deque.append(value)
-                        self.index = (self.index + 1) % self.sequence_length
-                else:
-                    self.deque.append(inputs)
-                    self.index = (self.index + 1) % self.sequence_length
-
-            if self.add_rank:
-                sequence = torch.stack(torch.tensor(self.deque), dim=-1)
-            # Concat the sequence items in the last rank.
-            else:
-                data = []
-                for t in self.deque:
-                    if isinstance(t, torch.Tensor):
-                        data.append(t)
-                    else:
-                        data.append(torch.tensor(t))
-                sequence = torch.cat(data, dim=-1)
-
-            # TODO remove when transpose component implemented.
-            if self.in_data_format == "channels_last" and self.out_data_format == "channels_first":
-                # Problem: PyTorch does not have data format options in conv layers ->
-                # only channels first supported.
-                # -> Confusingly have to transpose.
-                # B W H C -> B C W H
-                # e.g. atari: [4 84 84 4] -> [4 4 84 84]
-                sequence = sequence.permute(0, 3, 2, 1)
-
-            return sequence
+            sequences = self._sequence_numpy(inputs)
+            if isinstance(sequences, dict):
+                return FlattenedDataOp([(key, torch.from_numpy(value)) for key, value in sequences.items()])
+            return torch.from_numpy(sequences)
         elif get_backend() == "tf":
             # Assigns the input_ into the buffer at the current time index.
             def normal_assign():
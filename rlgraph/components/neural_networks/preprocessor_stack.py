@@ -79,6 +79,18 @@ class PreprocessorStack(Stack):
             reset_op = self._graph_fn_reset(*resets)
             return reset_op
 
+    def reset_batch_positions(self, batch_positions):
+        """
+        Python-backend only: Resets all PreprocessLayers of this Stack for the given batch positions only.
+
+        Args:
+            batch_positions (List[int]): The batch positions (e.g. environment indices) to reset.
+        """
+        for preprocess_layer in self.sub_components.values():  # type: PreprocessLayer
+            if re.search(r'^\.helper-', preprocess_layer.scope):
+                continue
+            preprocess_layer.reset_batch_positions(batch_positions)
+
     @graph_fn
     def _graph_fn_reset(self, *preprocessor_resets):
         if get_backend() == "tf":
@@ -17,12 +17,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from queue import Queue
+import multiprocessing
+import time
+from collections import deque
+from queue import Queue, Empty
 from threading import Thread
 
+import numpy as np
 from six.moves import xrange as range_
 
 from rlgraph.environments import VectorEnv, Environment
+from rlgraph.spaces.space_utils import get_space_leaf_getter
+from rlgraph.utils.rlgraph_errors import RLGraphError
 
 
 class SequentialVectorEnv(VectorEnv):
@@ -30,22 +36,33 @@ class SequentialVectorEnv(VectorEnv):
     Sequential multi-environment class which iterates over a list of environments
     to step them.
     """
-    def __init__(self, num_environments, env_spec, num_background_envs=1, async_reset=False):
+    def __init__(self, num_environments, env_spec, num_background_envs=1, async_reset=False, reset_timeout=None):
         """
+        Args:
+            num_environments (int): The number of environments to step sequentially.
+            env_spec (Union[dict,callable]): Either an environment spec or a callable returning a new
+                environment object.
             num_background_envs (Optional([int]): Number of environments asynchronously
                 reset in the background. Need to be calibrated depending on reset cost.
-            async_reset (Optional[bool]): If true, resets envs asynchronously in another thread.
+            async_reset (Optional[Union[bool,str]]): If True or "thread", resets envs asynchronously in another
+                thread. If "process", all envs live in their own processes and are reset there in the background,
+                which avoids GIL contention for expensive resets. False for synchronous resets.
+            reset_timeout (Optional[float]): Max. number of seconds to wait for a background-reset environment.
+                None for waiting indefinitely.
         """
-        self.environments = []
+        if async_reset is True:
+            async_reset = "thread"
+        if async_reset not in [False, None, "thread", "process"]:
+            raise RLGraphError("Unknown value for `async_reset`: '{}'! Must be one of False, True, 'thread' or "
+                               "'process'.".format(async_reset))
+        self.async_reset = async_reset or False
 
+        self.environments = []
         for _ in range_(num_environments):
-            if isinstance(env_spec, dict):
-                env = Environment.from_spec(env_spec)
-            elif hasattr(env_spec, '__call__'):
-                env = env_spec()
+            if self.async_reset == "process":
+                env = ProcessEnvironment(env_spec)
             else:
-                raise ValueError("Env_spec must be either a dict containing an environment spec or a callable"
-                                 "returning a new environment object.")
+                env = make_env(env_spec)
             self.environments.append(env)
 
         super(SequentialVectorEnv, self).__init__(
@@ -53,12 +70,16 @@ class SequentialVectorEnv(VectorEnv):
             state_space=self.environments[0].state_space, action_space=self.environments[0].action_space
         )
 
-        self.async_reset = async_reset
-        if self.async_reset:
-            self.resetter = ThreadedResetter(env_spec, num_background_envs)
+        if self.async_reset == "thread" and num_background_envs > 0:
+            self.resetter = ThreadedResetter(env_spec, num_background_envs, timeout=reset_timeout)
+        elif self.async_reset == "process":
+            self.resetter = ProcessResetter(env_spec, num_background_envs, timeout=reset_timeout)
         else:
             self.resetter = Resetter()
 
+        # Extracts the flat state components (in the order of `state_space.flatten()`) for the flow methods.
+        self.get_state_leaves = get_space_leaf_getter(self.state_space)
+
     def seed(self, seed=None):
         return [env.seed(seed) for env in self.environments]
 
@@ -88,6 +109,49 @@ class SequentialVectorEnv(VectorEnv):
             infos.append(info)
         return states, rewards, terminals, infos
 
+    def reset_flow(self):
+        """
+        Resets all environments.
+
+        Returns:
+            Union[np.ndarray,List[np.ndarray]]: The states after the reset, stacked over all environments (a list of
+                stacked flat components if the state Space is a ContainerSpace).
+        """
+        return self._stack_states(self.reset_all())
+
+    def step_flow(self, actions):
+        """
+        Steps all environments with the given action batch (one action per environment) and resets those that
+        reached a terminal state (in which case the first state after the reset is returned for that environment).
+
+        Args:
+            actions (any): The batch of actions (one item per environment).
+
+        Returns:
+            List[np.ndarray]: The stacked (flat) next-state components, rewards (float32) and terminals (bool), each
+                with the number of environments as the leading dimension.
+        """
+        states, rewards, terminals = [], [], []
+        for i in range_(self.num_environments):
+            state, reward, terminal, _ = self.environments[i].step(actions[i])
+            if terminal:
+                state = self.reset(i)
+            states.append(state)
+            rewards.append(reward)
+            terminals.append(terminal)
+        stacked_states = self._stack_states(states)
+        return (stacked_states if isinstance(stacked_states, list) else [stacked_states]) + [
+            np.asarray(rewards, dtype=np.float32).reshape((self.num_environments,)),
+            np.asarray(terminals, dtype=np.bool_)
+        ]
+
+    def _stack_states(self, states):
+        stacked = [np.stack(components) for components in zip(*[self.get_state_leaves(s) for s in states])]
+        return stacked[0] if len(stacked) == 1 else stacked
+
+    def get_reset_statistics(self):
+        return self.resetter.get_statistics()
+
     def render(self, index=0):
         self.environments[index].render()
 
@@ -97,54 +161,305 @@ class SequentialVectorEnv(VectorEnv):
     def terminate_all(self):
         for env in self.environments:
             env.terminate()
+        self.resetter.terminate()
 
     def __str__(self):
         return [str(env) for env in self.environments]
 
 
+def make_env(env_spec):
+    """
+    Creates a new Environment object.
+
+    Args:
+        env_spec (Union[dict,callable]): Either an environment spec or a callable returning a new
+            environment object.
+
+    Returns:
+        Environment: The created Environment.
+    """
+    if isinstance(env_spec, dict):
+        return Environment.from_spec(env_spec)
+    elif hasattr(env_spec, '__call__'):
+        return env_spec()
+    else:
+        raise ValueError("Env_spec must be either a dict containing an environment spec or a callable"
+                         "returning a new environment object.")
+
+
 class Resetter(object):
+    """
+    Synchronously resets environments and keeps track of reset latencies.
+    """
+    def __init__(self):
+        self.num_resets = 0
+        # Time the caller was blocked waiting for a ready-to-use env.
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        # Time spent inside the actual `env.reset()` calls (possibly in the background).
+        self.total_reset_time = 0.0
 
     def swap(self, env):
-        return env.reset(), env
+        """
+        Trade environment in need of reset for ready to use environment.
+
+        Args:
+            env (Environment): Environment object.
+
+        Returns:
+            any, Environment: State and ready to use environment.
+        """
+        start = time.perf_counter()
+        state = env.reset()
+        reset_time = time.perf_counter() - start
+        self.total_reset_time += reset_time
+        self._record_wait(reset_time)
+        return state, env
+
+    def get_statistics(self):
+        """
+        Returns:
+            dict: Number of resets, mean/max time the caller was blocked per reset ("latency") and the mean
+                time of the actual env-resets.
+        """
+        num_resets = max(self.num_resets, 1)
+        return dict(
+            num_resets=self.num_resets,
+            mean_reset_latency=self.total_wait_time / num_resets,
+            max_reset_latency=self.max_wait_time,
+            mean_reset_time=self.total_reset_time / num_resets
+        )
 
+    def terminate(self):
+        pass
 
-class ThreadedResetter(Thread):
+    def _record_wait(self, wait_time):
+        self.num_resets += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+
+class ThreadedResetter(Thread, Resetter):
     """
     Keeps resetting environments in a queue,
 
     n.b. mechanism originally seen ins RLlib, since removed.
     """
 
-    def __init__(self, env_spec, num_environments):
-        super(ThreadedResetter, self).__init__()
+    def __init__(self, env_spec, num_environments, timeout=None):
+        """
+        Args:
+            env_spec (Union[dict,callable]): Spec or callable to create the background environments.
+            num_environments (int): The number of background environments.
+            timeout (Optional[float]): Max. number of seconds to wait for a ready-to-use environment.
+        """
+        Thread.__init__(self)
+        Resetter.__init__(self)
         self.daemon = True
+        self.timeout = timeout
         self.in_need_reset = Queue()
         self.out_ready = Queue()
 
         # Create a set of environments ready to use.
         for _ in range_(num_environments):
-            env = Environment.from_spec(env_spec)
+            env = make_env(env_spec)
             state = env.reset()
             self.out_ready.put((state, env))
 
         self.start()
 
     def swap(self, env):
-        """
-        Trade environment in need of reset for ready to use environment.
-        Args:
-            env (Environment): Environment object.
-
-        Returns:
-            any, Environment: State and ready to use environment.
-        """
+        start = time.perf_counter()
         self.in_need_reset.put(env)
-        state, ready_to_use_env = self.out_ready.get(timeout=30)
+        try:
+            state, ready_to_use_env = self.out_ready.get(timeout=self.timeout)
+        except Empty:
+            raise RLGraphError("Timed out after {}s waiting for a background environment reset!".format(self.timeout))
+        self._record_wait(time.perf_counter() - start)
         return state, ready_to_use_env
 
+    def terminate(self):
+        self.in_need_reset.put(None)
+        # Wait for a running reset to finish (so its environment ends up in `out_ready`).
+        self.join(timeout=self.timeout if self.timeout is not None else 10.0)
+        while not self.out_ready.empty():
+            _, env = self.out_ready.get()
+            env.terminate()
+        # Environments that were never picked up for resetting.
+        while not self.in_need_reset.empty():
+            env = self.in_need_reset.get()
+            if env is not None:
+                env.terminate()
+
     def run(self):
         # Keeps resetting environments as they come in.
         while True:
             env = self.in_need_reset.get()
+            # None -> shutdown signal.
+            if env is None:
+                return
+            start = time.perf_counter()
             state = env.reset()
+            self.total_reset_time += time.perf_counter() - start
             self.out_ready.put((state, env))
+
+
+class ProcessResetter(Resetter):
+    """
+    Resets environments living in their own processes (see `ProcessEnvironment`). Swapped out environments
+    start resetting immediately in their process while a previously reset environment from the pool is handed
+    back. Because resets run in separate processes, they do not compete with the caller for the GIL.
+    """
+    def __init__(self, env_spec, num_environments, timeout=None):
+        """
+        Args:
+            env_spec (Union[dict,callable]): Spec or callable to create the background environments.
+            num_environments (int): The number of background environments. If 0, resets are effectively
+                synchronous (but still executed in the environments' processes).
+            timeout (Optional[float]): Max. number of seconds to wait for a ready-to-use environment.
+        """
+        super(ProcessResetter, self).__init__()
+        self.timeout = timeout
+        self.pool = deque()
+        for _ in range_(num_environments):
+            env = ProcessEnvironment(env_spec)
+            env.reset_async()
+            self.pool.append(env)
+
+    def swap(self, env):
+        assert isinstance(env, ProcessEnvironment), \
+            "ERROR: ProcessResetter can only swap `ProcessEnvironment`s, but got {}!".format(type(env).__name__)
+        start = time.perf_counter()
+        # Start resetting the incoming env first, then pick up the oldest env in the pool.
+        env.reset_async()
+        self.pool.append(env)
+        ready_to_use_env = self.pool.popleft()
+        state, reset_time = ready_to_use_env.wait_reset(timeout=self.timeout)
+        self.total_reset_time += reset_time
+        self._record_wait(time.perf_counter() - start)
+        return state, ready_to_use_env
+
+    def terminate(self):
+        for env in self.pool:
+            env.terminate()
+        self.pool.clear()
+
+
+class ProcessEnvironment(Environment):
+    """
+    A proxy for an Environment that runs in a separate python process. Method calls are sent through a pipe.
+    Resets can be triggered asynchronously via `reset_async` and later be collected via `wait_reset`.
+    """
+    def __init__(self, env_spec):
+        """
+        Args:
+            env_spec (Union[dict,callable]): Spec or callable to create the environment inside the process.
+        """
+        self.env_spec = env_spec
+        self.out_pipe, in_pipe = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=self.run_env, args=(env_spec, in_pipe))
+        self.process.daemon = True
+        self.process.start()
+
+        # The ready signal contains the env's Spaces.
+        result = self.out_pipe.recv()
+        if isinstance(result, Exception):
+            raise result
+        state_space, action_space = result
+        self.reset_pending = False
+        super(ProcessEnvironment, self).__init__(state_space=state_space, action_space=action_space)
+
+    def seed(self, seed=None):
+        return self._call("seed", seed)
+
+    def reset(self):
+        self.reset_async()
+        state, _ = self.wait_reset()
+        return state
+
+    def reset_async(self):
+        """
+        Triggers a reset in the environment's process without waiting for it to finish.
+        """
+        assert not self.reset_pending, "ERROR: Reset already pending for {}!".format(self)
+        self.out_pipe.send(("reset",))
+        self.reset_pending = True
+
+    def wait_reset(self, timeout=None):
+        """
+        Waits for a previously triggered reset to finish.
+
+        Args:
+            timeout (Optional[float]): Max. number of seconds to wait. None for waiting indefinitely.
+
+        Returns:
+            tuple: The state after the reset and the time (in s) the reset took in the environment's process.
+        """
+        assert self.reset_pending, "ERROR: No reset pending for {}!".format(self)
+        if timeout is not None and not self.out_pipe.poll(timeout):
+            raise RLGraphError("Timed out after {}s waiting for a background environment reset!".format(timeout))
+        self.reset_pending = False
+        return self._receive()
+
+    def step(self, actions, **kwargs):
+        return self._call("step", actions)
+
+    def render(self):
+        return self._call("render")
+
+    def terminate(self):
+        if self.process is None:
+            return
+        try:
+            if self.reset_pending:
+                self.wait_reset()
+            self.out_pipe.send(None)
+            self.out_pipe.close()
+        except IOError:
+            pass
+        self.process.join()
+        self.process = None
+
+    def _call(self, method_name, *args):
+        self.out_pipe.send((method_name,) + args)
+        return self._receive()
+
+    def _receive(self):
+        result = self.out_pipe.recv()
+        # If an error occurred, it'll be passed back through the pipe.
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    @staticmethod
+    def run_env(env_spec, in_pipe):
+        env = None
+        try:
+            env = make_env(env_spec)
+            # Send the ready signal (the env's Spaces).
+            in_pipe.send((env.state_space, env.action_space))
+
+            while True:
+                command = in_pipe.recv()
+                # "close" signal (None) -> End this process.
+                if command is None:
+                    env.terminate()
+                    in_pipe.close()
+                    return
+                if command[0] == "reset":
+                    start = time.perf_counter()
+                    state = env.reset()
+                    in_pipe.send((state, time.perf_counter() - start))
+                else:
+                    in_pipe.send(getattr(env, command[0])(*command[1:]))
+        # Pass exceptions back through the pipe so the main process knows what's going on.
+        except Exception as e:
+            if env is not None:
+                try:
+                    env.terminate()
+                except Exception:
+                    pass
+            in_pipe.send(e)
+
+    def __str__(self):
+        return "ProcessEnvironment({})".format(self.env_spec)
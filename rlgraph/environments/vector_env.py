@@ -55,5 +55,14 @@ class VectorEnv(Environment):
         """
         raise NotImplementedError
 
+    def get_reset_statistics(self):
+        """
+        Returns reset statistics, e.g. how long callers were blocked waiting for environment resets.
+
+        Returns:
+            dict: Reset statistics.
+        """
+        raise NotImplementedError
+
     def terminate_all(self):
         raise NotImplementedError
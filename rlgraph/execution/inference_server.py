@@ -0,0 +1,299 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from rlgraph.utils.rlgraph_errors import RLGraphError
+
+
+class InferenceServer(object):
+    """
+    Runs one (acting) Agent in a separate process and serves `get_action` requests of many local client
+    processes (e.g. one per environment), SEED-style: Requests are collected until either `max_batch_size` states
+    have arrived or `batch_timeout` seconds have passed since the first pending request, then the policy is run on
+    batches of at most `max_batch_size` states and the actions are scattered back to the clients.
+
+    This way, a host can step many environment processes while holding only a single Agent graph.
+    """
+    def __init__(self, agent_config, num_clients, max_batch_size=None, batch_timeout=0.001, use_exploration=True,
+                 apply_preprocessing=True, inference_only=True):
+        """
+        Args:
+            agent_config (dict): The Agent config (must contain 'type', 'state_space' and 'action_space').
+            num_clients (int): The number of clients (each with its own pipe) to serve.
+            max_batch_size (Optional[int]): The max. number of states to act on in one policy call. A batch is
+                processed as soon as it reaches this size, remaining states wait for the next one (requests with
+                more states are split over several policy calls). Default: None (all clients' requests).
+            batch_timeout (float): The max. time (in s) to wait for more requests after the first pending one
+                has arrived.
+            use_exploration (bool): Whether to act with exploration (passed into `Agent.get_action`).
+            apply_preprocessing (bool): Whether the Agent should apply its (in-graph) preprocessor.
+            inference_only (bool): If True, serves an acting-only InferenceAgent built from `agent_config`,
+                otherwise, builds the full Agent.
+        """
+        self.agent_config = agent_config
+        self.num_clients = num_clients
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout
+        self.use_exploration = use_exploration
+        self.apply_preprocessing = apply_preprocessing
+        self.inference_only = inference_only
+
+        # The process in which the Agent will run.
+        self.process = None
+        # Pipe ends for the clients (the server holds the other ends).
+        self.client_pipes = None
+        # Pipe to send control commands (set_weights, get_statistics, ...) to the server process.
+        self.control_pipe = None
+
+    def start_server(self):
+        """
+        Starts the server process and waits for the Agent to be built.
+        """
+        client_ends, server_ends = zip(*[multiprocessing.Pipe() for _ in range(self.num_clients)])
+        self.client_pipes = list(client_ends)
+        self.control_pipe, server_control_pipe = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=self.run_server, args=(
+                self.agent_config, list(server_ends), server_control_pipe, self.max_batch_size, self.batch_timeout,
+                self.use_exploration, self.apply_preprocessing, self.inference_only
+            )
+        )
+        self.process.daemon = True
+        self.process.start()
+
+        # Wait for the "ready" signal (which is None).
+        result = self.control_pipe.recv()
+        # Check whether there were construction errors.
+        if isinstance(result, Exception):
+            raise result
+
+    def stop_server(self):
+        try:
+            self.control_pipe.send(None)
+            self.control_pipe.close()
+        except IOError:
+            pass
+        self.process.join()
+
+    def get_client(self, index):
+        """
+        Args:
+            index (int): The index of the client (0 to num_clients - 1). Each client must be used by only one
+                process (or thread) at a time.
+
+        Returns:
+            InferenceClient: The client to request actions through.
+        """
+        return InferenceClient(self.client_pipes[index])
+
+    def set_weights(self, policy_weights, value_function_weights=None):
+        """
+        Sets the served Agent's weights, e.g. as received from a learner.
+        """
+        return self._control("set_weights", policy_weights, value_function_weights)
+
+    def get_weights(self):
+        return self._control("get_weights")
+
+    def get_statistics(self):
+        """
+        Returns:
+            dict: Number of requests and policy calls served and the mean/max number of states per policy call.
+        """
+        return self._control("get_statistics")
+
+    def _control(self, method_name, *args):
+        self.control_pipe.send((method_name,) + args)
+        result = self.control_pipe.recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    @staticmethod
+    def run_server(agent_config, pipes, control_pipe, max_batch_size, batch_timeout, use_exploration,
+                   apply_preprocessing, inference_only):
+        # Import here to not have to build any backend-specific objects in the parent process.
+        from rlgraph.agents import Agent, InferenceAgent
+
+        try:
+            if inference_only:
+                agent = InferenceAgent.from_agent_config(agent_config)
+            else:
+                agent = Agent.from_spec(agent_config)
+        except Exception as e:
+            control_pipe.send(e)
+            return
+        # Send the ready signal (no errors).
+        control_pipe.send(None)
+
+        num_requests = 0
+        batch_sizes = []
+        # Pending (request, states, batch size, arrival time)-parts. Requests are lists of [pipe, number of pending
+        # parts, actions of the done parts].
+        pending = []
+        pending_size = 0
+        num_pending_requests = 0
+        open_pipes = list(pipes)
+
+        while True:
+            if len(pending) == 0:
+                timeout = None
+            else:
+                timeout = max(0.0, batch_timeout - (time.perf_counter() - pending[0][3]))
+            ready = wait(open_pipes + [control_pipe], timeout=timeout)
+
+            for pipe in ready:
+                try:
+                    request = pipe.recv()
+                except EOFError:
+                    if pipe is control_pipe:
+                        return
+                    open_pipes.remove(pipe)
+                    continue
+
+                # Control commands.
+                if pipe is control_pipe:
+                    # "close" signal (None) -> End this process.
+                    if request is None:
+                        agent.terminate()
+                        control_pipe.close()
+                        return
+                    try:
+                        if request[0] == "get_statistics":
+                            result = dict(
+                                num_requests=num_requests,
+                                num_policy_calls=len(batch_sizes),
+                                mean_batch_size=np.mean(batch_sizes) if len(batch_sizes) > 0 else 0.0,
+                                max_batch_size=np.max(batch_sizes) if len(batch_sizes) > 0 else 0
+                            )
+                        else:
+                            result = getattr(agent, request[0])(*request[1:])
+                    except Exception as e:
+                        result = e
+                    control_pipe.send(result)
+                # Action requests.
+                else:
+                    arrival_time = time.perf_counter()
+                    size = _batch_size(request)
+                    if max_batch_size is None or size <= max_batch_size:
+                        parts = [(request, size)]
+                    else:
+                        parts = [(_slice(request, start, min(start + max_batch_size, size)),
+                                  min(max_batch_size, size - start)) for start in range(0, size, max_batch_size)]
+                    record = [pipe, len(parts), []]
+                    for states, part_size in parts:
+                        pending.append((record, states, part_size, arrival_time))
+                    pending_size += size
+                    num_pending_requests += 1
+                    num_requests += 1
+
+            # Act, while the batch is full or (for all pending states) if we have waited long enough.
+            flush = len(pending) > 0 and (
+                num_pending_requests == len(open_pipes) or
+                time.perf_counter() - pending[0][3] >= batch_timeout
+            )
+            while len(pending) > 0 and (flush or (max_batch_size is not None and pending_size >= max_batch_size)):
+                batch = []
+                batch_size = 0
+                while len(pending) > 0 and (max_batch_size is None or batch_size + pending[0][2] <= max_batch_size):
+                    batch.append(pending.pop(0))
+                    batch_size += batch[-1][2]
+                pending_size -= batch_size
+                batch_sizes.append(batch_size)
+
+                try:
+                    actions = agent.get_action(
+                        _concat([states for _, states, _, _ in batch]), use_exploration=use_exploration,
+                        apply_preprocessing=apply_preprocessing
+                    )
+                except Exception as e:
+                    for record, _, _, _ in batch:
+                        record[0].send(e)
+                        num_pending_requests -= 1
+                        # Drop the request's other parts.
+                        pending_size -= sum(part[2] for part in pending if part[0] is record)
+                        pending = [part for part in pending if part[0] is not record]
+                else:
+                    start = 0
+                    for record, _, size, _ in batch:
+                        record[2].append(_slice(actions, start, start + size))
+                        start += size
+                        record[1] -= 1
+                        # All parts done -> Answer the request.
+                        if record[1] == 0:
+                            record[0].send(record[2][0] if len(record[2]) == 1 else _concat(record[2]))
+                            num_pending_requests -= 1
+
+
+class InferenceClient(object):
+    """
+    The client side of an InferenceServer. Sends (batched) states to the server and blocks until the actions
+    for these states have been computed.
+    """
+    def __init__(self, pipe):
+        """
+        Args:
+            pipe (multiprocessing.Connection): The pipe end connected to the server.
+        """
+        self.pipe = pipe
+
+    def get_action(self, states):
+        """
+        Args:
+            states (Union[dict,tuple,np.ndarray]): The batch of states (with batch rank) to act on.
+
+        Returns:
+            any: The actions for the given states (with batch rank).
+
+        Raises:
+            RLGraphError: If the server's Agent raised an error.
+        """
+        self.pipe.send(states)
+        actions = self.pipe.recv()
+        if isinstance(actions, Exception):
+            raise RLGraphError("ERROR: Inference server failed to compute actions: {}".format(actions))
+        return actions
+
+
+def _batch_size(batch):
+    while isinstance(batch, (dict, tuple)):
+        batch = next(iter(batch.values())) if isinstance(batch, dict) else batch[0]
+    return len(batch)
+
+
+def _concat(batches):
+    first = batches[0]
+    if isinstance(first, dict):
+        return {key: _concat([b[key] for b in batches]) for key in first}
+    elif isinstance(first, tuple):
+        return tuple(_concat([b[i] for b in batches]) for i in range(len(first)))
+    return np.concatenate(batches, axis=0)
+
+
+def _slice(batch, start, end):
+    if isinstance(batch, dict):
+        return {key: _slice(value, start, end) for key, value in batch.items()}
+    elif isinstance(batch, tuple):
+        return tuple(_slice(value, start, end) for value in batch)
+    return batch[start:end]
@@ -24,6 +24,7 @@ from six.moves import queue
 
 from rlgraph import get_distributed_backend
 from rlgraph.agents import Agent
+from rlgraph.components.layers.preprocessing.moving_standardize import merge_statistics
 from rlgraph.environments import Environment
 from rlgraph.execution.ray import RayValueWorker
 from rlgraph.execution.ray.apex.ray_memory_actor import RayMemoryActor
@@ -78,6 +79,8 @@ class ApexExecutor(RayExecutor):
         # Necessary for target network updates.
         self.weight_syncs_executed = 0
         self.steps_since_weights_synced = {}
+        # Merged statistics (by preprocessor scope) of all workers' MovingStandardize preprocessors.
+        self.preprocessor_statistics = {}
 
         # These are the tasks actually interacting with the environment.
         self.env_sample_tasks = RayTaskPool()
@@ -199,6 +202,12 @@ class ApexExecutor(RayExecutor):
             sample_steps = sample_batch_metrics[i]["batch_size"]
             if len(sample_batch_metrics[i]["last_rewards"]) > 0:
                 rewards.extend(sample_batch_metrics[i]["last_rewards"])
+            # Merge the workers' preprocessor statistics (e.g. state mean and variance) to redistribute them with
+            # the weights.
+            for scope, statistics in sample_batch_metrics[i].get("preprocessor_statistics", {}).items():
+                if scope in self.preprocessor_statistics:
+                    statistics = merge_statistics(self.preprocessor_statistics[scope], statistics)
+                self.preprocessor_statistics[scope] = statistics
             env_steps += sample_steps
 
             self.steps_since_weights_synced[ray_worker] += sample_steps
@@ -209,6 +218,8 @@ class ApexExecutor(RayExecutor):
                 # self.logger.debug("Syncing weights for worker {}".format(self.worker_ids[ray_worker]))
                 # self.logger.debug("Weights type: {}, weights = {}".format(type(weights), weights))
                 ray_worker.set_weights.remote(weights)
+                if len(self.preprocessor_statistics) > 0:
+                    ray_worker.set_preprocessor_statistics.remote(self.preprocessor_statistics)
                 self.weight_syncs_executed += 1
                 self.steps_since_weights_synced[ray_worker] = 0
 
@@ -36,7 +36,19 @@ class RayActor(object):
         """
         return os.uname()[1]
 
-    def setup_preprocessor(self, preprocessing_spec, in_space):
+    def setup_preprocessor(self, preprocessing_spec, in_space, batch_size=1):
+        """
+        Creates a python PreprocessorStack.
+
+        Args:
+            preprocessing_spec (Optional[list]): The preprocessor specs.
+            in_space (Space): The (batched) input Space.
+            batch_size (int): The number of environments whose states are preprocessed together in one batch.
+                Stateful preprocessors (e.g. Sequence, MovingStandardize) keep separate state per batch position.
+
+        Returns:
+            Optional[PreprocessorStack]: The preprocessor stack or None if no spec given.
+        """
         if preprocessing_spec is not None:
             preprocessing_spec = deepcopy(preprocessing_spec)
             in_space = deepcopy(in_space)
@@ -48,8 +60,10 @@ class RayActor(object):
             processor_stack = PreprocessorStack(*preprocessing_spec, backend="python")
             build_space = in_space
             for sub_comp_scope in scopes:
+                if hasattr(processor_stack.sub_components[sub_comp_scope], "batch_size"):
+                    processor_stack.sub_components[sub_comp_scope].batch_size = batch_size
                 processor_stack.sub_components[sub_comp_scope].create_variables(input_spaces=dict(
-                    preprocessing_inputs=build_space
+                    inputs=build_space
                 ), action_space=None)
                 build_space = processor_stack.sub_components[sub_comp_scope].get_preprocessed_space(build_space)
             processor_stack.reset()
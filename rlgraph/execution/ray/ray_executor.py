@@ -24,7 +24,7 @@ import numpy as np
 import time
 
 from rlgraph import get_distributed_backend
-from rlgraph.agents import Agent
+from rlgraph.agents import Agent, InferenceAgent
 from rlgraph.environments import Environment
 from rlgraph.execution.ray.ray_util import worker_exploration
 
@@ -261,17 +261,21 @@ class RayExecutor(object):
         raise NotImplementedError
 
     @staticmethod
-    def build_agent_from_config(agent_config):
+    def build_agent_from_config(agent_config, inference_only=False):
         """
         Builds agent without using from_spec as Ray cannot handle kwargs correctly
         at the moment.
 
         Args:
             agent_config (dict): Agent config. Must contain 'type' field to lookup constructor.
+            inference_only (bool): If True, builds an acting-only InferenceAgent (policy and preprocessor,
+                no memory, loss or optimizer) matching the configured Agent.
 
         Returns:
             Agent: RLGraph agent object.
         """
+        if inference_only:
+            return InferenceAgent.from_agent_config(agent_config)
         config = deepcopy(agent_config)
         # Pop type on a copy because this may be called by multiple classes/worker types.
         agent_cls = Agent.__lookup_classes__.get(config.pop('type'))
@@ -344,6 +348,7 @@ class RayExecutor(object):
         final_rewards = []
         worker_op_throughputs = []
         worker_env_frame_throughputs = []
+        worker_env_reset_latencies = []
         episodes_executed = []
         steps_executed = 0
 
@@ -365,6 +370,7 @@ class RayExecutor(object):
             steps_executed += metrics["worker_steps"]
             worker_op_throughputs.append(metrics["mean_worker_ops_per_second"])
             worker_env_frame_throughputs.append(metrics["mean_worker_env_frames_per_second"])
+            worker_env_reset_latencies.append(metrics.get("mean_env_reset_latency", 0.0))
 
         return dict(
             min_reward=np.min(min_rewards),
@@ -380,5 +386,8 @@ class RayExecutor(object):
             mean_worker_op_throughput=np.mean(worker_op_throughputs),
             min_worker_op_throughput=np.min(worker_op_throughputs),
             max_worker_op_throughput=np.max(worker_op_throughputs),
-            mean_worker_env_frame_throughput=np.mean(worker_env_frame_throughputs)
+            mean_worker_env_frame_throughput=np.mean(worker_env_frame_throughputs),
+            # Time workers were blocked waiting for env resets.
+            mean_worker_env_reset_latency=np.mean(worker_env_reset_latencies),
+            max_worker_env_reset_latency=np.max(worker_env_reset_latencies)
         )
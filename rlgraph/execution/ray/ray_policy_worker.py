@@ -30,6 +30,7 @@ from rlgraph.execution.environment_sample import EnvironmentSample
 from rlgraph.execution.ray import RayExecutor
 from rlgraph.execution.ray.ray_actor import RayActor
 from rlgraph.execution.ray.ray_util import ray_compress
+from rlgraph.utils.postprocessing import generalized_advantage_estimation
 
 if get_distributed_backend() == "ray":
     import ray
@@ -60,12 +61,23 @@ class RayPolicyWorker(RayActor):
         self.num_environments = worker_spec.pop("num_worker_environments", 1)
         self.worker_sample_size = worker_spec.pop("worker_sample_size") * self.num_environments
         self.worker_executes_postprocessing = worker_spec.pop("worker_executes_postprocessing", True)
+        # Acting-only agent (no memory, loss or optimizer). Cannot post-process.
+        self.inference_only = worker_spec.pop("inference_only", False)
+        if self.inference_only:
+            self.worker_executes_postprocessing = False
+        # Compute GAE-advantages in numpy (only the value estimates come from the graph).
+        self.numpy_postprocessing = worker_spec.pop("numpy_postprocessing", False)
 
         self.compress = worker_spec.pop("compress_states", False)
         self.env_ids = ["env_{}".format(i) for i in range_(self.num_environments)]
         num_background_envs = worker_spec.pop("num_background_envs", 1)
+        # Background env resets: False (synchronous), True/"thread" or "process".
+        async_reset = worker_spec.pop("async_reset", False)
+        reset_timeout = worker_spec.pop("reset_timeout", None)
 
-        self.vector_env = SequentialVectorEnv(self.num_environments, env_spec, num_background_envs)
+        self.vector_env = SequentialVectorEnv(
+            self.num_environments, env_spec, num_background_envs, async_reset=async_reset, reset_timeout=reset_timeout
+        )
 
         # Then update agent config.
         agent_config['state_space'] = self.vector_env.state_space
@@ -141,7 +153,7 @@ class RayPolicyWorker(RayActor):
             agent_config.update(execution_spec=worker_exec_spec)
 
         # Build lazily per default.
-        return RayExecutor.build_agent_from_config(agent_config)
+        return RayExecutor.build_agent_from_config(agent_config, inference_only=self.inference_only)
 
     def execute_and_get_timesteps(
         self,
@@ -415,14 +427,22 @@ class RayPolicyWorker(RayActor):
             episodes_executed=self.episodes_executed,
             worker_steps=self.total_worker_steps,
             mean_worker_ops_per_second=sum(self.sample_steps) / sum(self.sample_times),
-            mean_worker_env_frames_per_second=sum(adjusted_frames) / sum(self.sample_times)
+            mean_worker_env_frames_per_second=sum(adjusted_frames) / sum(self.sample_times),
+            mean_env_reset_latency=self.vector_env.get_reset_statistics()["mean_reset_latency"]
         )
 
     def _process_policy_trajectories(self, states, actions, rewards, terminals, sequence_indices):
         """
         Post-processes policy trajectories.
         """
-        if self.worker_executes_postprocessing:
+        if self.worker_executes_postprocessing and self.numpy_postprocessing:
+            baseline_values = self.agent.graph_executor.execute(("get_state_values", [states]))
+            gae_function = self.agent.gae_function
+            rewards = generalized_advantage_estimation(
+                baseline_values, rewards, terminals, sequence_indices, discount=gae_function.discount,
+                gae_lambda=gae_function.gae_lambda, clip_rewards=gae_function.clipping.clip_value
+            )
+        elif self.worker_executes_postprocessing:
             rewards = self.agent.post_process(
                 dict(
                     states=states,
@@ -17,6 +17,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from collections import defaultdict
 from copy import deepcopy
 import numpy as np
 from rlgraph.utils import util
@@ -25,12 +26,14 @@ import time
 
 from rlgraph import get_distributed_backend
 from rlgraph.utils.util import SMALL_NUMBER
+from rlgraph.components.layers.preprocessing.moving_standardize import MovingStandardize, merge_statistics
 from rlgraph.components.neural_networks.preprocessor_stack import PreprocessorStack
 from rlgraph.environments.sequential_vector_env import SequentialVectorEnv
 from rlgraph.execution.environment_sample import EnvironmentSample
 from rlgraph.execution.ray import RayExecutor
 from rlgraph.execution.ray.ray_actor import RayActor
 from rlgraph.execution.ray.ray_util import ray_compress
+from rlgraph.spaces.space_utils import get_space_batcher, get_space_unbatcher
 
 if get_distributed_backend() == "ray":
     import ray
@@ -62,12 +65,21 @@ class RayValueWorker(RayActor):
         # Make sample size proportional to num envs.
         self.worker_sample_size = worker_spec.pop("worker_sample_size") * self.num_environments
         self.worker_executes_postprocessing = worker_spec.pop("worker_executes_postprocessing", True)
+        # Acting-only agent (no memory, loss or optimizer). Cannot post-process.
+        self.inference_only = worker_spec.pop("inference_only", False)
+        if self.inference_only:
+            self.worker_executes_postprocessing = False
         self.n_step_adjustment = worker_spec.pop("n_step_adjustment", 1)
         self.env_ids = ["env_{}".format(i) for i in range_(self.num_environments)]
         num_background_envs = worker_spec.pop("num_background_envs", 1)
+        # Background env resets: False (synchronous), True/"thread" or "process".
+        async_reset = worker_spec.pop("async_reset", False)
+        reset_timeout = worker_spec.pop("reset_timeout", None)
 
         # TODO from spec once we decided on generic vectorization.
-        self.vector_env = SequentialVectorEnv(self.num_environments, env_spec, num_background_envs)
+        self.vector_env = SequentialVectorEnv(
+            self.num_environments, env_spec, num_background_envs, async_reset=async_reset, reset_timeout=reset_timeout
+        )
 
         # Then update agent config.
         agent_config['state_space'] = self.vector_env.state_space
@@ -94,17 +106,25 @@ class RayValueWorker(RayActor):
         self.preprocessors = {}
         preprocessing_spec = agent_config.get("preprocessing_spec", None)
         self.is_preprocessed = {}
-        for env_id in self.env_ids:
-            self.preprocessors[env_id] = self.setup_preprocessor(
-                preprocessing_spec, self.vector_env.state_space.with_batch_rank()
+        # Preprocess all envs' states as one batch with a single preprocessor stack.
+        self.batched_preprocessing = worker_spec.pop("batched_preprocessing", False)
+        if self.batched_preprocessing:
+            self.preprocessor = self.setup_preprocessor(
+                preprocessing_spec, self.vector_env.state_space.with_batch_rank(), batch_size=self.num_environments
             )
-            self.is_preprocessed[env_id] = False
+            self.states_are_preprocessed = False
+        else:
+            for env_id in self.env_ids:
+                self.preprocessors[env_id] = self.setup_preprocessor(
+                    preprocessing_spec, self.vector_env.state_space.with_batch_rank()
+                )
+                self.is_preprocessed[env_id] = False
         self.agent = self.setup_agent(agent_config, worker_spec)
         self.worker_frameskip = frameskip
 
-        #  Flag for container actions.
-        self.container_actions = self.agent.flat_action_space is not None
-        self.action_space = self.agent.flat_action_space
+        # Split batched actions into per-env actions and merge recorded per-env actions into batches.
+        self.action_unbatcher = get_space_unbatcher(self.agent.action_space)
+        self.action_batcher = get_space_batcher(self.agent.action_space)
 
         # Save these so they can be fetched after training if desired.
         self.finished_episode_rewards = [[] for _ in range_(self.num_environments)]
@@ -177,7 +197,7 @@ class RayValueWorker(RayActor):
             agent_config.update(execution_spec=worker_exec_spec)
 
         # Build lazily per default.
-        return RayExecutor.build_agent_from_config(agent_config)
+        return RayExecutor.build_agent_from_config(agent_config, inference_only=self.inference_only)
 
     def execute_and_get_timesteps(
         self,
@@ -206,10 +226,7 @@ class RayValueWorker(RayActor):
         env_frames = 0
         last_episode_rewards = []
         # Final result batch.
-        if self.container_actions:
-            batch_actions = {k: [] for k in self.action_space.keys()}
-        else:
-            batch_actions = []
+        batch_actions = []
         batch_states, batch_rewards, batch_next_states, batch_terminals = [], [], [], []
 
         # Running trajectories.
@@ -220,10 +237,7 @@ class RayValueWorker(RayActor):
         # from previous execution was terminal for that environment.
         for i, env_id in enumerate(self.env_ids):
             sample_states[env_id] = []
-            if self.container_actions:
-                sample_actions[env_id] = {k: [] for k in self.action_space.keys()}
-            else:
-                sample_actions[env_id] = []
+            sample_actions[env_id] = []
             sample_rewards[env_id] = []
             sample_terminals[env_id] = []
 
@@ -237,32 +251,22 @@ class RayValueWorker(RayActor):
         terminals = [False for _ in range_(self.num_environments)]
         while timesteps_executed < num_timesteps:
             current_iteration_start_timestamp = time.perf_counter()
-            for i, env_id in enumerate(self.env_ids):
-                state = self.agent.state_space.force_batch(env_states[i])
-                if self.preprocessors[env_id] is not None:
-                    if self.is_preprocessed[env_id] is False:
-                        self.preprocessed_states_buffer[i] = self.preprocessors[env_id].preprocess(state)
-                        self.is_preprocessed[env_id] = True
-                else:
-                    self.preprocessed_states_buffer[i] = env_states[i]
+            if self.batched_preprocessing:
+                if self.states_are_preprocessed is False:
+                    self._preprocess_batch(env_states)
+            else:
+                for i, env_id in enumerate(self.env_ids):
+                    state = self.agent.state_space.force_batch(env_states[i])
+                    if self.preprocessors[env_id] is not None:
+                        if self.is_preprocessed[env_id] is False:
+                            self.preprocessed_states_buffer[i] = self.preprocessors[env_id].preprocess(state)
+                            self.is_preprocessed[env_id] = True
+                    else:
+                        self.preprocessed_states_buffer[i] = env_states[i]
 
             actions = self.get_action(states=self.preprocessed_states_buffer,
                                       use_exploration=use_exploration, apply_preprocessing=False)
-            if self.agent.flat_action_space is not None:
-                some_key = next(iter(actions))
-                assert isinstance(actions, dict) and isinstance(actions[some_key], np.ndarray),\
-                    "ERROR: Cannot flip container-action batch with dict keys if returned value is not a dict OR " \
-                    "values of returned value are not np.ndarrays!"
-                if hasattr(actions[some_key], "__len__"):
-                    env_actions = [{key: value[i] for key, value in actions.items()} for i in range(len(actions[some_key]))]
-                else:
-                    # Action was not array type.
-                    env_actions = actions
-            # No flipping necessary.
-            else:
-                env_actions = actions
-                if self.num_environments == 1 and env_actions.shape == ():
-                    env_actions = [env_actions]
+            env_actions = self.action_unbatcher(actions)
 
             next_states, step_rewards, terminals, infos = self.vector_env.step(actions=env_actions)
             # Worker frameskip not needed as done in env.
@@ -282,6 +286,11 @@ class RayValueWorker(RayActor):
 
             # Do accounting for each environment.
             state_buffer = np.array(self.preprocessed_states_buffer)
+            # Env states are currently NOT preprocessed.
+            self.states_are_preprocessed = False
+            reset_positions = []
+            # Batched: Preprocessed next states of episodes cut off by `max_timesteps_per_episode`.
+            cut_next_states = None
             for i, env_id in enumerate(self.env_ids):
                 # Set is preprocessed to False because env_states are currently NOT preprocessed.
                 self.is_preprocessed[env_id] = False
@@ -290,11 +299,7 @@ class RayValueWorker(RayActor):
                 current_episode_rewards[i] += step_rewards[i]
                 sample_states[env_id].append(state_buffer[i])
 
-                if self.container_actions:
-                    for name in self.action_space.keys():
-                        sample_actions[env_id][name].append(env_actions[i][name])
-                else:
-                    sample_actions[env_id].append(env_actions[i])
+                sample_actions[env_id].append(env_actions[i])
                 sample_rewards[env_id].append(step_rewards[i])
                 sample_terminals[env_id].append(terminals[i])
                 current_episode_sample_times[i] += current_iteration_time
@@ -313,9 +318,20 @@ class RayValueWorker(RayActor):
                     # Get next states for this environment's trajectory.
                     env_sample_next_states = env_sample_states[1:]
 
-                    next_state = self.agent.state_space.force_batch(next_states[i])
-                    if self.preprocessors[env_id] is not None:
-                        next_state = self.preprocessors[env_id].preprocess(next_state)
+                    if self.batched_preprocessing:
+                        if terminals[i]:
+                            # Terminal next states are masked anyway, don't preprocess them separately.
+                            next_state = self.zero_batched_state
+                        else:
+                            # Episode cut off by `max_timesteps_per_episode`: Targets bootstrap from the real
+                            # next state.
+                            if cut_next_states is None:
+                                cut_next_states = self._preprocess_batch_lookahead(next_states)
+                            next_state = cut_next_states[i:i + 1]
+                    else:
+                        next_state = self.agent.state_space.force_batch(next_states[i])
+                        if self.preprocessors[env_id] is not None:
+                            next_state = self.preprocessors[env_id].preprocess(next_state)
 
                     # Extend because next state has a batch dim.
                     env_sample_next_states.extend(next_state)
@@ -328,28 +344,22 @@ class RayValueWorker(RayActor):
 
                     # Append to final result trajectories.
                     batch_states.extend(post_s)
-                    if self.agent.flat_action_space is not None:
-                        # Use actions here, not env actions.
-                        for name in self.agent.flat_action_space.keys():
-                            batch_actions[name].extend(post_a[name])
-                    else:
-                        batch_actions.extend(post_a)
+                    batch_actions.extend(post_a)
                     batch_rewards.extend(post_r)
                     batch_next_states.extend(post_next_s)
                     batch_terminals.extend(post_t)
 
                     # Reset running trajectory for this env.
                     sample_states[env_id] = []
-                    if self.container_actions:
-                        sample_actions[env_id] = {k: [] for k in self.action_space.keys()}
-                    else:
-                        sample_actions[env_id] = []
+                    sample_actions[env_id] = []
                     sample_rewards[env_id] = []
                     sample_terminals[env_id] = []
 
                     # Reset this environment and its pre-processor stack.
                     env_states[i] = self.vector_env.reset(i)
-                    if self.preprocessors[env_id] is not None:
+                    if self.batched_preprocessing:
+                        reset_positions.append(i)
+                    elif self.preprocessors[env_id] is not None:
                         self.preprocessors[env_id].reset()
                         # This re-fills the sequence with the reset state.
                         state = self.agent.state_space.force_batch(env_states[i])
@@ -361,6 +371,9 @@ class RayValueWorker(RayActor):
                     current_episode_start_timestamps[i] = time.perf_counter()
                     current_episode_sample_times[i] = 0.0
 
+            if len(reset_positions) > 0 and self.preprocessor is not None:
+                self.preprocessor.reset_batch_positions(reset_positions)
+
             if 0 < num_timesteps <= timesteps_executed or (break_on_terminal and np.any(terminals)):
                 self.total_worker_steps += timesteps_executed
                 break
@@ -372,6 +385,11 @@ class RayValueWorker(RayActor):
         self.last_ep_start_timestamps = current_episode_start_timestamps
         self.last_ep_sample_times = current_episode_sample_times
 
+        # Batched: Preprocess all envs' current states at once. These are the next-states of unfinished
+        # fragments and the states to act on in the next call.
+        if self.batched_preprocessing:
+            self._preprocess_batch(env_states)
+
         # We already accounted for all terminated episodes. This means we only
         # have to do accounting for any unfinished fragments.
         for i, env_id in enumerate(self.env_ids):
@@ -380,13 +398,16 @@ class RayValueWorker(RayActor):
                 env_sample_states = sample_states[env_id]
                 # Get next states for this environment's trajectory.
                 env_sample_next_states = env_sample_states[1:]
-                next_state = self.agent.state_space.force_batch(next_states[i])
-                if self.preprocessors[env_id] is not None:
-                    next_state = self.preprocessors[env_id].preprocess(next_state)
-                    # This is the env state in the next call so avoid double preprocessing
-                    # by adding to buffer.
-                    self.preprocessed_states_buffer[i] = np.array(next_state)
-                    self.is_preprocessed[env_id] = True
+                if self.batched_preprocessing:
+                    next_state = np.array(self.preprocessed_states_buffer[i:i + 1])
+                else:
+                    next_state = self.agent.state_space.force_batch(next_states[i])
+                    if self.preprocessors[env_id] is not None:
+                        next_state = self.preprocessors[env_id].preprocess(next_state)
+                        # This is the env state in the next call so avoid double preprocessing
+                        # by adding to buffer.
+                        self.preprocessed_states_buffer[i] = np.array(next_state)
+                        self.is_preprocessed[env_id] = True
 
                 # Extend because next state has a batch dim.
                 env_sample_next_states.extend(next_state)
@@ -395,12 +416,7 @@ class RayValueWorker(RayActor):
                     sample_terminals[env_id], was_terminal=False)
 
                 batch_states.extend(post_s)
-                if self.agent.flat_action_space is not None:
-                    # Use actions here, not env actions.
-                    for name in self.agent.flat_action_space.keys():
-                        batch_actions[name].extend(post_a[name])
-                else:
-                    batch_actions.extend(post_a)
+                batch_actions.extend(post_a)
                 batch_rewards.extend(post_r)
                 batch_next_states.extend(post_next_s)
                 batch_terminals.extend(post_t)
@@ -434,7 +450,39 @@ class RayValueWorker(RayActor):
 
         # Return count and reward as separate task so learner thread does not need to download them before
         # inserting to buffers..
-        return sample, {"batch_size": sample.batch_size, "last_rewards": sample.metrics["last_rewards"]}
+        return sample, {"batch_size": sample.batch_size, "last_rewards": sample.metrics["last_rewards"],
+                        "preprocessor_statistics": self.pop_preprocessor_statistics()}
+
+    def pop_preprocessor_statistics(self):
+        """
+        Returns:
+            dict: The statistics (by preprocessor scope) of the states standardized by this worker's
+                MovingStandardize preprocessors since the last call, merged over all preprocessor stacks.
+        """
+        statistics = defaultdict(list)
+        for scope, preprocess_layer in self._get_moving_standardize_layers():
+            statistics[scope].append(preprocess_layer.pop_statistics())
+        return {scope: merge_statistics(*scope_statistics) for scope, scope_statistics in statistics.items()}
+
+    def set_preprocessor_statistics(self, statistics):
+        """
+        Sets the statistics (e.g. merged over all workers) to standardize states with.
+
+        Args:
+            statistics (dict): The statistics by preprocessor scope (see `pop_preprocessor_statistics`).
+        """
+        for scope, preprocess_layer in self._get_moving_standardize_layers():
+            if scope in statistics:
+                preprocess_layer.set_statistics(statistics[scope])
+
+    def _get_moving_standardize_layers(self):
+        stacks = [self.preprocessor] if self.batched_preprocessing else list(self.preprocessors.values())
+        for stack in stacks:
+            if stack is None:
+                continue
+            for scope, preprocess_layer in stack.sub_components.items():
+                if isinstance(preprocess_layer, MovingStandardize):
+                    yield scope, preprocess_layer
 
     def set_weights(self, weights):
         policy_weights = {k: v for k,v in zip(weights.policy_vars, weights.policy_values)}
@@ -480,7 +528,8 @@ class RayValueWorker(RayActor):
             episodes_executed=self.episodes_executed,
             worker_steps=self.total_worker_steps,
             mean_worker_ops_per_second=sum(self.sample_steps) / sum(self.sample_times),
-            mean_worker_env_frames_per_second=sum(adjusted_frames) / sum(self.sample_times)
+            mean_worker_env_frames_per_second=sum(adjusted_frames) / sum(self.sample_times),
+            mean_env_reset_latency=self.vector_env.get_reset_statistics()["mean_reset_latency"]
         )
 
     def _truncate_n_step(self, states, actions, rewards, next_states, terminals, was_terminal=True):
@@ -522,15 +571,8 @@ class RayValueWorker(RayActor):
                         next_states[i] = next_states[i + j]
                         rewards[i] += self.discount ** j * rewards[i + j]
 
-                if self.agent.flat_action_space is not None:
-                    for arr in [states, rewards, next_states, terminals]:
-                        del arr[new_len:]
-                    # Delete container actions separately.
-                    for name in self.agent.flat_action_space.keys():
-                        del actions[name][new_len:]
-                else:
-                    for arr in [states, actions, rewards, next_states, terminals]:
-                        del arr[new_len:]
+                for arr in [states, actions, rewards, next_states, terminals]:
+                    del arr[new_len:]
 
         return states, actions, rewards, next_states, terminals
 
@@ -540,7 +582,7 @@ class RayValueWorker(RayActor):
 
         Args:
             states (list): List of states.
-            actions (list, dict): List of actions or dict of lists  for container actions.
+            actions (list): List of (possibly container) actions.
             rewards (list): List of rewards.
             next_states: (list): List of next_states.
             terminals (list): List of terminals.
@@ -549,6 +591,8 @@ class RayValueWorker(RayActor):
             dict: Sample batch dict.
         """
         weights = np.ones_like(rewards)
+        # Single per-step actions -> One batch (container of arrays for container actions).
+        actions = self.action_batcher(actions)
 
         # Compute loss-per-item.
         if self.worker_executes_postprocessing:
@@ -568,14 +612,15 @@ class RayValueWorker(RayActor):
         compressed_states = [ray_compress(np.asarray(state, dtype=util.convert_dtype(dtype=env_dtype, to='np')))
                              for state in states]
 
-        compressed_next_states = compressed_states[self.n_step_adjustment:] + \
-                                 [ray_compress(np.asarray(next_s,dtype=util.convert_dtype(dtype=env_dtype, to='np')))
-                                  for next_s in next_states[-self.n_step_adjustment:]]
-        if self.container_actions:
-            for name in self.action_space.keys():
-                actions[name] = np.array(actions[name])
-        else:
-            actions = np.array(actions)
+        # Within a trajectory, next states are the (same objects as the) states n steps ahead -> reuse their
+        # compressed versions. Compress only the others (e.g. at ends of trajectories and between envs).
+        num_states = len(states)
+        compressed_next_states = [
+            compressed_states[i + self.n_step_adjustment]
+            if i + self.n_step_adjustment < num_states and next_s is states[i + self.n_step_adjustment] else
+            ray_compress(np.asarray(next_s, dtype=util.convert_dtype(dtype=env_dtype, to='np')))
+            for i, next_s in enumerate(next_states)
+        ]
         return dict(
             states=compressed_states,
             actions=actions,
@@ -585,6 +630,35 @@ class RayValueWorker(RayActor):
             importance_weights=np.array(weights)
         ), len(rewards)
 
+    def _preprocess_batch(self, env_states):
+        """
+        Preprocesses the states of all environments as one batch and writes them into the
+        `preprocessed_states_buffer`.
+
+        Args:
+            env_states (list): The (raw) states of all environments.
+        """
+        if self.preprocessor is not None:
+            self.preprocessed_states_buffer[:] = self.preprocessor.preprocess(np.asarray(env_states))
+        else:
+            self.preprocessed_states_buffer[:] = np.asarray(env_states)
+        self.states_are_preprocessed = True
+
+    def _preprocess_batch_lookahead(self, env_states):
+        """
+        Preprocesses the states of all environments as one batch on a copy of the preprocessor stack, so that
+        the stack's state (e.g. Sequence buffers) is not advanced.
+
+        Args:
+            env_states (list): The (raw) states of all environments.
+
+        Returns:
+            np.ndarray: The preprocessed states.
+        """
+        if self.preprocessor is not None:
+            return np.array(deepcopy(self.preprocessor).preprocess(np.asarray(env_states)))
+        return np.array(env_states)
+
     def get_action(self, states, use_exploration, apply_preprocessing):
         if self.worker_executes_exploration:
             # Only once for all actions otherwise we would have to call a session anyway.
@@ -25,14 +25,23 @@ from six.moves import xrange as range_
 
 from rlgraph.components import PreprocessorStack
 from rlgraph.execution.worker import Worker
-from rlgraph.spaces.containers import Dict, Tuple
+from rlgraph.spaces.space_utils import get_space_unbatcher
 from rlgraph.utils.rlgraph_errors import RLGraphError
 from rlgraph.utils.util import default_dict
 
 
 class SingleThreadedWorker(Worker):
 
-    def __init__(self, preprocessing_spec=None, worker_executes_preprocessing=True, **kwargs):
+    def __init__(self, preprocessing_spec=None, worker_executes_preprocessing=True, batched_preprocessing=False,
+                 **kwargs):
+        """
+        Args:
+            preprocessing_spec (Optional[list]): Specs for the worker-side (python) preprocessors.
+            worker_executes_preprocessing (bool): Whether the worker (not the Agent) preprocesses states.
+            batched_preprocessing (bool): If True, one PreprocessorStack preprocesses the states of all
+                environments as a single batch (one call per step). Stateful preprocessors keep their state
+                per batch position (environment). If False, each environment uses its own PreprocessorStack.
+        """
         super(SingleThreadedWorker, self).__init__(**kwargs)
 
         self.logger.info("Initialized single-threaded executor with {} environments '{}' and Agent '{}'".format(
@@ -44,7 +53,14 @@ class SingleThreadedWorker(Worker):
             worker_executes_preprocessing = False
 
         self.worker_executes_preprocessing = worker_executes_preprocessing
-        if self.worker_executes_preprocessing:
+        self.batched_preprocessing = batched_preprocessing and self.worker_executes_preprocessing
+        if self.batched_preprocessing:
+            # One stack for all envs.
+            self.preprocessor = self.setup_preprocessor(
+                preprocessing_spec, self.vector_env.state_space.with_batch_rank(), batch_size=self.num_environments
+            )
+            self.states_are_preprocessed = False
+        elif self.worker_executes_preprocessing:
             self.preprocessors = {}
             self.state_is_preprocessed = {}
             for env_id in self.env_ids:
@@ -58,6 +74,8 @@ class SingleThreadedWorker(Worker):
             shape=(self.num_environments,) + self.agent.preprocessed_state_space.shape,
             dtype=self.agent.preprocessed_state_space.dtype
         )
+        # Splits batched (possibly container) actions into per-env actions.
+        self.action_unbatcher = get_space_unbatcher(self.agent.action_space)
 
         # Global statistics.
         self.env_frames = 0
@@ -77,7 +95,19 @@ class SingleThreadedWorker(Worker):
         self.env_states = [None for _ in range_(self.num_environments)]
 
     @staticmethod
-    def setup_preprocessor(preprocessing_spec, in_space):
+    def setup_preprocessor(preprocessing_spec, in_space, batch_size=1):
+        """
+        Creates a python PreprocessorStack.
+
+        Args:
+            preprocessing_spec (Optional[list]): The preprocessor specs.
+            in_space (Space): The (batched) input Space.
+            batch_size (int): The number of environments whose states are preprocessed together in one batch.
+                Stateful preprocessors (e.g. Sequence, MovingStandardize) keep separate state per batch position.
+
+        Returns:
+            Optional[PreprocessorStack]: The preprocessor stack or None if no spec given.
+        """
         if preprocessing_spec is not None:
             # TODO move ingraph for python component assembly.
             preprocessing_spec = deepcopy(preprocessing_spec)
@@ -94,6 +124,8 @@ class SingleThreadedWorker(Worker):
             processor_stack = PreprocessorStack(*preprocessing_spec, backend="python")
             build_space = in_space
             for sub_comp_scope in scopes:
+                if hasattr(processor_stack.sub_components[sub_comp_scope], "batch_size"):
+                    processor_stack.sub_components[sub_comp_scope].batch_size = batch_size
                 processor_stack.sub_components[sub_comp_scope].create_variables(input_spaces=dict(
                     inputs=build_space
                 ), action_space=None)
@@ -198,8 +230,11 @@ class SingleThreadedWorker(Worker):
                 self.episode_timesteps[i] = 0
                 self.episode_terminals[i] = False
                 self.episode_starts[i] = time.perf_counter()
-                if self.worker_executes_preprocessing:
+                if self.worker_executes_preprocessing and not self.batched_preprocessing:
                     self.state_is_preprocessed[env_id] = False
+            if self.batched_preprocessing:
+                self.states_are_preprocessed = False
+                self.preprocessor.reset()
 
             self.env_states = self.vector_env.reset_all()
             self.agent.reset()
@@ -214,7 +249,16 @@ class SingleThreadedWorker(Worker):
 
             time_percentage = min(self.agent.timesteps / max_timesteps, 1.0)
 
-            if self.worker_executes_preprocessing:
+            if self.batched_preprocessing:
+                # Preprocess all envs' states at once (only needed after a reset of the worker).
+                if self.states_are_preprocessed is False:
+                    self._preprocess_batch(env_states)
+                actions = self.agent.get_action(
+                    states=self.preprocessed_states_buffer, use_exploration=use_exploration,
+                    apply_preprocessing=self.apply_preprocessing, time_percentage=time_percentage
+                )
+                preprocessed_states = np.array(self.preprocessed_states_buffer)
+            elif self.worker_executes_preprocessing:
                 for i, env_id in enumerate(self.env_ids):
                     state = self.agent.state_space.force_batch(env_states[i])
                     if self.preprocessors[env_id] is not None:
@@ -239,35 +283,9 @@ class SingleThreadedWorker(Worker):
             env_rewards = [0 for _ in range_(self.num_environments)]
             next_states = None
 
-            # For Dict action spaces, we have to treat each key as an array with batch-rank at index 0.
-            # The action-dict is then translated into a list of dicts where each dict contains the original data
-            # but without the batch-rank.
+            # Translate the batched actions into a list of per-env actions (without the batch-rank).
             # E.g. {'A': array([0, 1]), 'B': array([2, 3])} -> [{'A': 0, 'B': 2}, {'A': 1, 'B': 3}]
-            if isinstance(self.agent.action_space, Dict):
-                some_key = next(iter(actions))
-                assert isinstance(actions, dict) and isinstance(actions[some_key], np.ndarray),\
-                    "ERROR: Cannot flip Dict-action batch with dict keys if returned value is not a dict OR " \
-                    "values of returned value are not np.ndarrays!"
-                # TODO: What if actions come as nested dicts (more than one level deep)?
-                # TODO: Use DataOpDict/Tuple's new `map` method.
-                if hasattr(actions[some_key], "__len__"):
-                    env_actions = [{key: value[i] for key, value in actions.items()} for i in range(len(actions[some_key]))]
-                else:
-                    # Action was not array type.
-                    env_actions = [{key: value for key, value in actions.items()}]
-            # Tuple action Spaces:
-            # E.g. Tuple(array([0, 1]), array([2, 3])) -> [(0, 2), (1, 3)]
-            elif isinstance(self.agent.action_space, Tuple):
-                assert isinstance(actions, tuple) and isinstance(actions[0], np.ndarray),\
-                    "ERROR: Cannot flip tuple-action batch if returned value is not a tuple OR " \
-                    "values of returned value are not np.ndarrays!"
-                # TODO: Use DataOpDict/Tuple's new `map` method.
-                env_actions = [tuple(value[i] for _, value in enumerate(actions)) for i in range(len(actions[0]))]
-            # No container batch-flipping necessary.
-            else:
-                env_actions = actions
-                if self.num_environments == 1 and env_actions.shape == ():
-                    env_actions = [env_actions]
+            env_actions = self.action_unbatcher(actions)
 
             for _ in range_(frameskip):
                 next_states, step_rewards, episode_terminals, _ = self.vector_env.step(actions=env_actions)
@@ -282,13 +300,14 @@ class SingleThreadedWorker(Worker):
             #if self.render:
             #    self.vector_env.environments[0].render()
 
+            reset_positions = []
             for i, env_id in enumerate(self.env_ids):
                 self.episode_returns[i] += env_rewards[i]
                 self.episode_timesteps[i] += 1
 
                 if 0 < max_timesteps_per_episode[i] <= self.episode_timesteps[i]:
                     episode_terminals[i] = True
-                if self.worker_executes_preprocessing:
+                if self.worker_executes_preprocessing and not self.batched_preprocessing:
                     self.state_is_preprocessed[env_id] = False
                 # Do accounting for finished episodes.
                 if episode_terminals[i]:
@@ -308,7 +327,9 @@ class SingleThreadedWorker(Worker):
 
                     # Reset this environment and its preprocecssor stack.
                     env_states[i] = self.vector_env.reset(i)
-                    if self.worker_executes_preprocessing and self.preprocessors[env_id] is not None:
+                    if self.batched_preprocessing:
+                        reset_positions.append(i)
+                    elif self.worker_executes_preprocessing and self.preprocessors[env_id] is not None:
                         self.preprocessors[env_id].reset()
                         # This re-fills the sequence with the reset state.
                         state = self.agent.state_space.force_batch(env_states[i])
@@ -323,6 +344,9 @@ class SingleThreadedWorker(Worker):
                     # Otherwise assign states to next states
                     env_states[i] = next_states[i]
 
+                # Batched: Observe below, after all envs' next states have been preprocessed at once.
+                if self.batched_preprocessing:
+                    continue
                 if self.worker_executes_preprocessing and self.preprocessors[env_id] is not None:
                     #next_state = self.agent.state_space.force_batch(env_states[i])
                     next_states[i] = np.array(self.preprocessors[env_id].preprocess(env_states[i]))  # next_state
@@ -330,6 +354,18 @@ class SingleThreadedWorker(Worker):
                     self.env_ids[i], preprocessed_states[i], env_actions[i], env_rewards[i], next_states[i],
                     episode_terminals[i]
                 )
+
+            if self.batched_preprocessing:
+                if len(reset_positions) > 0:
+                    self.preprocessor.reset_batch_positions(reset_positions)
+                # One call for all envs. The result is also the input for the next action.
+                self._preprocess_batch(env_states)
+                preprocessed_next_states = np.array(self.preprocessed_states_buffer)
+                for i, env_id in enumerate(self.env_ids):
+                    self._observe(
+                        env_id, preprocessed_states[i], env_actions[i], env_rewards[i],
+                        preprocessed_next_states[i], episode_terminals[i]
+                    )
             self.update_if_necessary(time_percentage=time_percentage)
             timesteps_executed += self.num_environments
             num_timesteps_reached = (0 < num_timesteps <= timesteps_executed)
@@ -337,6 +373,10 @@ class SingleThreadedWorker(Worker):
             if 0 < num_episodes <= episodes_executed or num_timesteps_reached:
                 break
 
+        # Insert records still pending for a coalesced (cross-env) insert.
+        if self.agent.observe_spec["insert_batch_size"] > 0:
+            self.agent.flush_pending_inserts()
+
         total_time = (time.perf_counter() - start) or 1e-10
 
         # Return values for current episode(s) if None have been completed.
@@ -398,6 +438,17 @@ class SingleThreadedWorker(Worker):
 
         return results
 
+    def _preprocess_batch(self, env_states):
+        """
+        Preprocesses the states of all environments as one batch and writes them into the
+        `preprocessed_states_buffer`.
+
+        Args:
+            env_states (list): The (raw) states of all environments.
+        """
+        self.preprocessed_states_buffer[:] = self.preprocessor.preprocess(np.asarray(env_states))
+        self.states_are_preprocessed = True
+
     def _observe(self, env_ids, states, actions, rewards, next_states, terminals):
         # TODO: If worker does not execute preprocessing, next state is not preprocessed here.
         # Observe per environment.
@@ -32,7 +32,7 @@ class Worker(Specifiable):
     """
     def __init__(self, agent, env_spec=None, num_environments=1, frameskip=1, render=False,
                  worker_executes_exploration=True, exploration_epsilon=0.1, episode_finish_callback=None,
-                 max_timesteps=None):
+                 max_timesteps=None, num_background_envs=1, async_reset=False, reset_timeout=None):
         """
         Args:
             agent (Agent): Agent to execute environment on.
@@ -55,6 +55,11 @@ class Worker(Specifiable):
                 This is not a forced limit, but serves to calculate the `time_percentage` value passed into
                 the Agent for time-dependent (decay) parameter calculations.
                 If None, Worker will try to infer this value automatically.
+
+            num_background_envs (int): Number of environments reset in the background if `async_reset` is set.
+            async_reset (Union[bool,str]): Whether (and how) the SequentialVectorEnv should reset environments
+                asynchronously. One of False, True/"thread" or "process". See `SequentialVectorEnv`.
+            reset_timeout (Optional[float]): Max. number of seconds to wait for a background environment reset.
         """
         super(Worker, self).__init__()
         self.num_environments = num_environments
@@ -67,7 +72,10 @@ class Worker(Specifiable):
             self.env_ids = ["env_{}".format(i) for i in range_(self.num_environments)]
         # `Env_spec` is for single envs inside a SequentialVectorEnv.
         elif env_spec is not None:
-            self.vector_env = SequentialVectorEnv(env_spec=env_spec, num_environments=self.num_environments)
+            self.vector_env = SequentialVectorEnv(
+                env_spec=env_spec, num_environments=self.num_environments, num_background_envs=num_background_envs,
+                async_reset=async_reset, reset_timeout=reset_timeout
+            )
             self.env_ids = ["env_{}".format(i) for i in range_(self.num_environments)]
         # No env_spec.
         else:
@@ -0,0 +1,326 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import tempfile
+import types
+
+import numpy as np
+
+from rlgraph import get_backend
+from rlgraph.spaces.space import Space
+from rlgraph.utils.op_records import DataOpRecord
+from rlgraph.utils.ops import flatten_op, unflatten_op
+from rlgraph.version import __version__
+
+if get_backend() == "tf":
+    import tensorflow as tf
+elif get_backend() == "pytorch":
+    import torch
+
+
+# Op types holding references to python callables of the building process (cannot be imported elsewhere).
+_PY_FUNC_OP_TYPES = {"PyFunc", "PyFuncStateless", "EagerPyFunc"}
+
+# Modules whose objects' state is not visible in `vars()` (e.g. tensors, variables).
+_BACKEND_MODULES = ("tensorflow", "torch")
+
+# Class -> hex-digest of its code (see `_get_class_fingerprint`).
+_class_fingerprints = {}
+
+
+class GraphBuildCache(object):
+    """
+    A file-based cache for built TensorFlow graphs. An entry stores the exported MetaGraph together with the
+    mapping of the root-Component's API-methods (input placeholders and return ops), the Components' variables
+    and summaries to graph element names. Entries are keyed by a hash of all Components' settings, the input-Spaces
+    and further build settings (see `get_key`), so that later builds of the same Agent (e.g. in many workers) can
+    import the graph instead of rebuilding it.
+    """
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): The directory to store cache entries in (one sub-directory per key).
+        """
+        self.directory = os.path.expanduser(directory)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def get_key(root_component, input_spaces, **build_settings):
+        """
+        Args:
+            root_component (Component): The (not yet built) root-Component.
+            input_spaces (dict): The input-Spaces of the root-Component's API-methods.
+            build_settings (any): Further (json-serializable) settings the build depends on.
+
+        Returns:
+            Optional[str]: The hex-digest identifying a build of the given root-Component or None if some setting
+                cannot be fingerprinted (the build must not be cached then).
+        """
+        components = sorted(root_component.get_all_sub_components(), key=lambda c: c.global_scope)
+        try:
+            fingerprint = dict(
+                rlgraph_version=__version__,
+                backend_version=_get_backend_version(),
+                components=[
+                    (c.global_scope, _get_type_name(type(c)), _get_class_fingerprint(type(c)), _fingerprint(vars(c)))
+                    for c in components
+                    # Helper Components have random names but are fully determined by their parents.
+                    if not c.name.startswith(".helper-")
+                ],
+                input_spaces=_fingerprint(input_spaces),
+                build_settings=_fingerprint(build_settings)
+            )
+        except TypeError as e:
+            logging.getLogger(__name__).warning("Graph build cannot be cached: {}".format(e))
+            return None
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+    def contains(self, key):
+        return os.path.isfile(os.path.join(self.directory, key, "graph.json"))
+
+    def store(self, key, graph, root_component, api, init_variables):
+        """
+        Stores a built graph under the given key (unless already stored by another process).
+
+        Args:
+            key (str): The cache key (see `get_key`).
+            graph (tf.Graph): The built graph (before adding savers, summary- and init-ops).
+            root_component (Component): The built root-Component.
+            api (dict): The GraphBuilder's API-method dict (name -> in- and out-op-records).
+            init_variables (list): The variables that need to be initialized at session start.
+
+        Returns:
+            bool: Whether the graph could be cached.
+        """
+        py_funcs = [op.name for op in graph.get_operations() if op.type in _PY_FUNC_OP_TYPES]
+        if len(py_funcs) > 0:
+            self.logger.warning("Graph contains python ops ({}) and cannot be cached.".format(py_funcs[:5]))
+            return False
+        try:
+            spec = dict(
+                api={
+                    name: dict(
+                        inputs=[_get_element_names(op_rec.op) for op_rec in in_op_records],
+                        outputs=[dict(kwarg=op_rec.kwarg, op=_get_element_names(op_rec.op))
+                                 for op_rec in out_op_records]
+                    ) for name, (in_op_records, out_op_records) in api.items()
+                },
+                variables={
+                    c.global_scope: {key: var.name for key, var in c.variable_registry.items()}
+                    for c in root_component.get_all_sub_components()
+                },
+                summaries={
+                    c.global_scope: {key: summary.name for key, summary in c.summaries.items()}
+                    for c in root_component.get_all_sub_components()
+                },
+                init_variables=[var.name for var in init_variables]
+            )
+        except AttributeError as e:
+            self.logger.warning("Graph cannot be cached: {}".format(e))
+            return False
+
+        # Write into a temp. directory first, then move it in place, as other processes may build concurrently.
+        os.makedirs(self.directory, exist_ok=True)
+        temp_directory = tempfile.mkdtemp(dir=self.directory)
+        tf.train.export_meta_graph(filename=os.path.join(temp_directory, "graph.meta"), graph=graph)
+        with open(os.path.join(temp_directory, "graph.json"), "w") as spec_file:
+            json.dump(spec, spec_file)
+        try:
+            os.rename(temp_directory, os.path.join(self.directory, key))
+        except OSError:
+            # Already stored by some other process.
+            shutil.rmtree(temp_directory, ignore_errors=True)
+            return False
+        self.logger.info("Stored graph build in cache under key {}.".format(key))
+        return True
+
+    def load(self, key, root_component, graph_builder):
+        """
+        Imports a cached graph into the current default graph and restores the GraphBuilder's API-method op-records,
+        the Components' variable registries and summaries.
+
+        Args:
+            key (str): The cache key (see `get_key`).
+            root_component (Component): The (not yet built) root-Component (same settings as the cached one).
+            graph_builder (GraphBuilder): The GraphBuilder to restore the API-method dict in.
+
+        Returns:
+            list: The variables that need to be initialized at session start.
+        """
+        entry_directory = os.path.join(self.directory, key)
+        with open(os.path.join(entry_directory, "graph.json")) as spec_file:
+            spec = json.load(spec_file)
+        tf.train.import_meta_graph(os.path.join(entry_directory, "graph.meta"))
+        graph = tf.get_default_graph()
+
+        variables = {var.name: var for var in tf.global_variables() + tf.local_variables()}
+        graph_builder.root_component = root_component
+        graph_builder.api = {
+            name: (
+                [DataOpRecord(op=_get_elements(graph, names)) for names in api_spec["inputs"]],
+                [DataOpRecord(op=_get_elements(graph, out["op"]), kwarg=out["kwarg"]) for out in api_spec["outputs"]]
+            ) for name, api_spec in spec["api"].items()
+        }
+        for component in root_component.get_all_sub_components():
+            component.variable_registry = {
+                key: variables[name] for key, name in spec["variables"].get(component.global_scope, {}).items()
+            }
+            component.summaries = {
+                key: graph.as_graph_element(name)
+                for key, name in spec["summaries"].get(component.global_scope, {}).items()
+            }
+        self.logger.info("Imported graph build from cache (key {}).".format(key))
+        return [variables[name] for name in spec["init_variables"]]
+
+
+def _get_element_names(op):
+    """
+    Returns:
+        dict: Flat-key to graph element name (None for None ops) of the given (container) op.
+    """
+    return {flat_key: (element.name if element is not None else None) for flat_key, element in flatten_op(op).items()}
+
+
+def _get_elements(graph, names):
+    return unflatten_op({
+        flat_key: (graph.as_graph_element(name) if name is not None else None) for flat_key, name in names.items()
+    })
+
+
+def _get_backend_version():
+    if get_backend() == "tf":
+        return tf.__version__
+    elif get_backend() == "pytorch":
+        return torch.__version__
+    return None
+
+
+def _get_type_name(type_):
+    return type_.__module__ + "." + type_.__qualname__
+
+
+def _get_class_fingerprint(class_):
+    """
+    Returns:
+        str: A hex-digest of the source code of the given class and all its base classes (falls back to the code of
+            their functions if the source is not available), so that code changes (e.g. of graph_fns) change the
+            cache key.
+    """
+    fingerprint = _class_fingerprints.get(class_)
+    if fingerprint is None:
+        hasher = hashlib.sha256()
+        for base in class_.__mro__:
+            if base is object:
+                continue
+            try:
+                hasher.update(inspect.getsource(base).encode())
+            except (OSError, TypeError):
+                for name, attr in sorted(vars(base).items()):
+                    function = getattr(attr, "__func__", attr)
+                    if isinstance(function, types.FunctionType):
+                        hasher.update(name.encode())
+                        _hash_code(function.__code__, hasher)
+        fingerprint = hasher.hexdigest()
+        _class_fingerprints[class_] = fingerprint
+    return fingerprint
+
+
+def _hash_code(code, hasher):
+    """
+    Updates `hasher` with the bytecode, names and constants (recursively for nested code objects) of a code object.
+    """
+    hasher.update(code.co_code)
+    hasher.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, hasher)
+        # Set-constants: repr order depends on the hash seed.
+        elif isinstance(const, frozenset):
+            hasher.update(repr(sorted(repr(c) for c in const)).encode())
+        else:
+            hasher.update(repr(const).encode())
+
+
+def _fingerprint(value, _stack=None):
+    """
+    Returns a json-serializable, process-independent representation of the given value. Components are represented
+    by their global scope (they are fingerprinted separately), callables by their qualified name, code (incl.
+    constants and names), closure and bound object, other objects by their type and (recursively) their attributes.
+
+    Raises:
+        TypeError: If the value (or some part of it) has no process-independent representation (e.g. backend objects
+            or objects without a `__dict__`).
+    """
+    # Import here to avoid circular imports (Components import the graph package).
+    from rlgraph.components.component import Component
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, np.ndarray):
+        return [str(value.dtype), value.shape, hashlib.sha256(value.tobytes()).hexdigest()]
+    elif isinstance(value, Space):
+        return [repr(value)] + [_fingerprint(getattr(value, attr, None)) for attr in ["low", "high", "num_categories"]]
+    elif isinstance(value, Component):
+        return ["component", value.global_scope]
+    elif isinstance(value, type):
+        return ["type", _get_type_name(value)]
+    elif isinstance(value, (types.BuiltinFunctionType, types.BuiltinMethodType)):
+        return ["function", "{}.{}".format(getattr(value, "__module__", None), value.__qualname__)]
+    elif isinstance(value, logging.Logger):
+        return ["logger", value.name]
+
+    # Callables, containers and objects: Guard against reference cycles.
+    _stack = _stack or []
+    if any(value is v for v in _stack):
+        return ["cycle", _get_type_name(type(value))]
+    _stack = _stack + [value]
+    if isinstance(value, (types.FunctionType, types.MethodType)):
+        function = getattr(value, "__func__", value)
+        hasher = hashlib.sha256()
+        _hash_code(function.__code__, hasher)
+        return [
+            "function", function.__module__ + "." + function.__qualname__, hasher.hexdigest(),
+            [_fingerprint(_get_cell_contents(cell), _stack) for cell in function.__closure__ or ()],
+            _fingerprint(getattr(value, "__self__", None), _stack)
+        ]
+    elif isinstance(value, dict):
+        return [[str(key), _fingerprint(value[key], _stack)] for key in sorted(value, key=str)]
+    elif isinstance(value, (list, tuple)):
+        return [_fingerprint(v, _stack) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        return sorted((_fingerprint(v, _stack) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    elif type(value).__module__.split(".")[0] in _BACKEND_MODULES or not hasattr(value, "__dict__"):
+        raise TypeError("Value of type {} cannot be fingerprinted.".format(_get_type_name(type(value))))
+    return [_get_type_name(type(value)), _fingerprint(vars(value), _stack)]
+
+
+def _get_cell_contents(cell):
+    try:
+        return cell.cell_contents
+    # Empty cell.
+    except ValueError:
+        return None
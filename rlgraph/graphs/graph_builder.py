@@ -21,7 +21,7 @@ import inspect
 import logging
 import re
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 from rlgraph import get_backend
 from rlgraph.components.component import Component
@@ -58,6 +58,8 @@ class GraphBuilder(Specifiable):
                 `when_input_complete` methods.
             summary_spec (Optional[dict]): A specification dict that defines, which summaries we would like to
                 create in the graph and register with each Component.
+            max_build_iterations (int): The max. number of graph_fn-call rounds a build may take before it is
+                aborted.
         """
         super(GraphBuilder, self).__init__()
 
@@ -95,6 +97,8 @@ class GraphBuilder(Specifiable):
         self.num_trainable_parameters = 0
         self.graph_call_times = []
         self.var_call_times = []
+        # Optional BuildProfiler collecting build times per phase and Component (set to enable profiling).
+        self.build_profiler = None
 
         # Create an empty root-Component into which everything will be assembled by an Algo.
         self.root_component = None
@@ -186,7 +190,10 @@ class GraphBuilder(Specifiable):
 
         # Create the first actual ops based on the input-spaces.
         # Some ops can only be created later when variable-based-Spaces are known (op_recs_depending_on_variables).
+        profile_start = self.build_profiler.start() if self.build_profiler is not None else None
         self.build_input_space_ops(input_spaces)
+        if self.build_profiler is not None:
+            self.build_profiler.record("input_spaces", profile_start)
 
         # Collect all components and add those op-recs to the set that are constant.
         components = self.root_component.get_all_sub_components()
@@ -207,6 +214,7 @@ class GraphBuilder(Specifiable):
         self.logger.info("Computation-Graph build completed in {} s ({} iterations).".format(time_build, iterations))
 
         # Get some stats on the graph and report.
+        profile_start = self.build_profiler.start() if self.build_profiler is not None else None
         self.num_ops = self.count_ops()
         self.logger.info("Actual graph ops generated: {}".format(self.num_ops))
 
@@ -215,6 +223,9 @@ class GraphBuilder(Specifiable):
 
         # Sanity check the build.
         self.sanity_check_build()
+        if self.build_profiler is not None:
+            self.build_profiler.record("graph_stats", profile_start)
+            self.finish_build_profile(time.perf_counter() - time_start, iterations)
 
         # The build here is the actual build overhead, so build time minus the tensorflow calls and variable
         # creations which would have to happen either way.
@@ -328,19 +339,27 @@ class GraphBuilder(Specifiable):
                                                gf.requires_variable_completeness is True]
         # Not input complete yet -> Check now.
         if component.input_complete is False or component.built is False:
+            profile_start = self.build_profiler.start() if self.build_profiler is not None else None
             component.check_input_completeness()
+            if self.build_profiler is not None:
+                self.build_profiler.record("input_completeness", profile_start, component)
             # Call `when_input_complete` once on that Component.
             if component.input_complete is True:
                 self.logger.debug("Component {} is input-complete; Spaces per API-method input parameter are: {}".
                                   format(component.name, component.api_method_inputs))
                 device = self.get_device(component, variables=True)
                 # This builds variables which would have to be done either way:
+                num_ops_before = self.get_graph_version() if self.build_profiler is not None else None
                 call_time = time.perf_counter()
                 component.when_input_complete(
                     input_spaces=None, action_space=self.action_space, device=device,
                     summary_regexp=self.summary_spec["summary_regexp"]
                 )
                 self.var_call_times.append(time.perf_counter() - call_time)
+                if self.build_profiler is not None:
+                    self.build_profiler.record(
+                        "variables", call_time, component, self._num_ops_since(num_ops_before)
+                    )
                 # Call all no-input graph_fns of the new Component.
                 for no_in_col in component.no_input_graph_fn_columns:
                     # Do not call _variables (only later, when Component is also variable-complete).
@@ -511,6 +530,9 @@ class GraphBuilder(Specifiable):
 
         call_time = None
         is_build_time = self.phase == "building"
+        if self.build_profiler is not None:
+            profile_start = self.build_profiler.start()
+            num_ops_before = self.get_graph_version()
 
         # Build the ops from this input-combination.
         # Flatten input items.
@@ -595,6 +617,10 @@ class GraphBuilder(Specifiable):
         # Always un-flatten all return values. Otherwise, we would allow Dict Spaces
         # with '/' keys in them, which is not allowed.
         ops = op_rec_column.unflatten_output_ops(*ops)
+        if self.build_profiler is not None:
+            self.build_profiler.record(
+                "graph_fns", profile_start, op_rec_column.component, self._num_ops_since(num_ops_before)
+            )
 
         # Should we create a new out op-rec column?
         if create_new_out_column is not False:
@@ -629,15 +655,53 @@ class GraphBuilder(Specifiable):
 
         # Determine the Spaces for each out op and then move it into the respective op and Space slot of the
         # out_graph_fn_column.
+        profile_start = self.build_profiler.start() if self.build_profiler is not None else None
         for i, op in enumerate(ops):
             space = get_space_from_op(op)
             # Make sure the receiving op-record is still empty.
             assert out_graph_fn_column.op_records[i].op is None
             out_graph_fn_column.op_records[i].op = op
             out_graph_fn_column.op_records[i].space = space
+        if self.build_profiler is not None:
+            self.build_profiler.record("space_inference", profile_start, op_rec_column.component)
 
         return out_graph_fn_column
 
+    @staticmethod
+    def get_graph_version():
+        """
+        Returns:
+            Optional[int]: A counter increasing with each backend op added to the graph (None for define-by-run
+                backends).
+        """
+        if get_backend() == "tf":
+            return tf.get_default_graph().version
+        return None
+
+    def _num_ops_since(self, graph_version):
+        if graph_version is None:
+            return None
+        return self.get_graph_version() - graph_version
+
+    def finish_build_profile(self, total_build_time, iterations):
+        """
+        Adds the overall build stats and the build loop's own overhead (op-record processing, sorting, etc.) to
+        the build profiler.
+        """
+        build_phases = ["input_spaces", "input_completeness", "variables", "graph_fns", "space_inference",
+                        "graph_stats"]
+        self.build_profiler.phase_times["build_loop_overhead"] = max(
+            0.0, total_build_time - sum(self.build_profiler.phase_times[phase] for phase in build_phases)
+        )
+        self.build_profiler.build_stats.update(dict(
+            total_build_time=total_build_time,
+            iterations=iterations,
+            num_meta_ops=self.num_meta_ops,
+            num_ops=self.num_ops,
+            num_trainable_parameters=self.num_trainable_parameters,
+            num_components=len(self.root_component.get_all_sub_components())
+        ))
+
     @staticmethod
     def count_trainable_parameters():
         """
@@ -915,8 +979,6 @@ class GraphBuilder(Specifiable):
         Returns:
             any: Results of executing this api-method.
         """
-        # Reset call profiler.
-        Component.reset_profile()
         if api_method not in self.api:
             raise RLGraphError("No API-method with name '{}' found!".format(api_method))
 
@@ -1085,7 +1147,10 @@ class GraphBuilder(Specifiable):
 
         # Create the first actual ops based on the input-spaces.
         # Some ops can only be created later when variable-based-Spaces are known (op_recs_depending_on_variables).
+        profile_start = self.build_profiler.start() if self.build_profiler is not None else None
         self.build_input_space_ops(input_spaces)
+        if self.build_profiler is not None:
+            self.build_profiler.record("input_spaces", profile_start)
 
         # Collect all components and add those op-recs to the set that are constant.
         components = self.root_component.get_all_sub_components()
@@ -1107,6 +1172,8 @@ class GraphBuilder(Specifiable):
         time_build = time.perf_counter() - time_start
         self.logger.info("Define-by-run computation-graph build completed in {} s ({} iterations).".
                          format(time_build, iterations))
+        if self.build_profiler is not None:
+            self.finish_build_profile(time_build, iterations)
         build_overhead = time_build - sum(self.graph_call_times) - sum(self.var_call_times)
         TraceContext.DEFINE_BY_RUN_CONTEXT = "execution"
         return dict(
@@ -1120,196 +1187,273 @@ class GraphBuilder(Specifiable):
         """
         Private implementation of the main build loop. For docs, see the respective build
         methods.
+
+        Works through a queue of op-recs, pushing each one's op and Space forward into its `next` op-recs exactly
+        once. Op-recs arriving in a column going into a graph_fn mark that column as pending. Only once the queue is
+        empty (all ops have been passed through the API-methods as far as possible), the pending graph_fn columns
+        that are complete and whose Components are input-/variable-complete are called (each exactly once, deeper
+        nested Components first) and their returned op-recs are queued.
+
+        Args:
+            op_records_list (List[DataOpRecord]): The (sorted) op-recs to start the build from.
+
+        Returns:
+            int: The number of graph_fn-call rounds the build took.
         """
-        loop_counter = 0
-        while len(op_records_list) > 0:
-            # In this iteration, do we still have API-method op-recs (which are part of columns that go into or come
-            # from API-methods).
-            have_api_method_recs = any(
-                isinstance(or_.column, (DataOpRecordColumnIntoAPIMethod, DataOpRecordColumnFromAPIMethod)) for or_ in
-                op_records_list
-            )
-            # Keep track of the highest nesting-level (depth of a component in the parent/child-component-tree) for
-            # a called graph_fn. Graph_fns with a lower nesting level will not be called in the same iteration.
-            # This allows for careful progress through the graph_fn-calls in case API methods of
-            # input/variable-incomplete components are called within these graph_fns (to be avoided at all costs
-            # as it will fail the build).
-            highest_nesting_of_called_graph_fn_column = -1
-
-            # Collect op-recs to process in the next iteration.
-            self.op_records_to_process = set()
+        queue = deque()
+        queued = set()
+        # The graph_fn columns that have received at least one op (ordered by arrival for determinism).
+        pending_graph_fn_columns = OrderedDict()
 
-            # Set of Components that have been tried last to get input-complete. If build gets stuck, it'll be because
-            # of the Components in this set.
-            non_complete_components = set()
-            for op_rec in op_records_list:  # type: DataOpRecord
-                # There are next records:
-                if len(op_rec.next) > 0:
-                    # Push actual op and Space forward one op-rec at a time.
-                    for next_op_rec in self._sort_op_recs(op_rec.next):  # type: DataOpRecord
-                        # Assert that next-record's `previous` field points back to op_rec.
-                        assert next_op_rec.previous is op_rec, \
-                            "ERROR: Op-rec {} in meta-graph has {} as next, but {}'s previous field points to {}!". \
-                            format(op_rec, next_op_rec, next_op_rec, next_op_rec.previous)
-                        # If not last op in this API-method -> continue.
-                        if next_op_rec.is_terminal_op is False:
-                            assert next_op_rec.op is None or is_constant(next_op_rec.op) or next_op_rec.op is op_rec.op
-                            self.op_records_to_process.add(next_op_rec)
-                        # Push op and Space into next op-record.
-                        # With op-instructions?
-                        if "key-lookup" in next_op_rec.op_instructions:
-                            lookup_key = next_op_rec.op_instructions["key-lookup"]
-                            if isinstance(lookup_key, str) and (not isinstance(op_rec.op, dict) or lookup_key
-                                                                not in op_rec.op):
-                                raise RLGraphError(
-                                    "op_rec.op ({}) is not a dict or does not contain the lookup key '{}'!". \
-                                    format(op_rec.op, lookup_key)
-                                )
-                            elif isinstance(lookup_key, int) and (not isinstance(op_rec.op, (list, tuple)) or
-                                                                  lookup_key >= len(op_rec.op)):
-                                raise RLGraphError(
-                                    "op_rec.op ({}) is not a list/tuple or contains not enough items for lookup "
-                                    "index '{}'!".format(op_rec.op, lookup_key)
-                                )
-                            next_op_rec.op = op_rec.op[lookup_key]
-                            next_op_rec.space = op_rec.space[lookup_key]
-                        # No instructions -> simply pass on.
-                        else:
-                            next_op_rec.op = op_rec.op
-                            next_op_rec.space = op_rec.space
-
-                            # Also push Space into possible API-method record if slot's Space is still None.
-                            if isinstance(op_rec.column, DataOpRecordColumnIntoAPIMethod):
-                                param_name = get_call_param_name(op_rec)
-                                component = op_rec.column.api_method_rec.component
-
-                                # Place Space for this input-param name (valid for all input params of same name even of
-                                # different API-method of the same Component).
-                                if component.api_method_inputs[param_name] is None or \
-                                        component.api_method_inputs[param_name] == "flex":
-                                    component.api_method_inputs[param_name] = next_op_rec.space
-                                # For non-space agnostic Components: Sanity check, whether Spaces are equivalent.
-                                elif component.space_agnostic is False:
-                                    generic_space = check_space_equivalence(
-                                        component.api_method_inputs[param_name], next_op_rec.space
-                                    )
-                                    # Spaces are not equivalent.
-                                    if generic_space is False:
-                                        raise RLGraphError(
-                                            "ERROR: op-rec '{}' has Space '{}', but input-param '{}' already has Space "
-                                            "'{}'!".format(next_op_rec, next_op_rec.space, param_name,
-                                                           component.api_method_inputs[param_name])
-                                        )
-                                    # Overwrite both entries with the more generic Space.
-                                    next_op_rec.space = component.api_method_inputs[param_name] = generic_space
-
-                        # Did we enter a new Component? If yes, check input-completeness and
-                        # - If op_rec.column is None -> We are at the very beginning of the graph (op_rec.op is a
-                        # placeholder).
-                        next_component = next_op_rec.column.component
-                        if op_rec.column is None or op_rec.column.component is not next_component:
-                            self.build_component_when_input_complete(next_component)
-                            if next_component.input_complete is False:
-                                non_complete_components.add(next_component.global_scope)
+        def queue_op_recs(op_recs):
+            for op_rec in self._sort_op_recs(op_recs):
+                if op_rec not in queued:
+                    queue.append(op_rec)
+                    queued.add(op_rec)
 
+        self.op_records_to_process = set()
+        queue_op_recs(op_records_list)
+
+        rounds = 0
+        while True:
+            while len(queue) > 0:
+                op_rec = queue.popleft()  # type: DataOpRecord
+                queued.discard(op_rec)
+                # There are next records: Push actual op and Space forward.
+                if len(op_rec.next) > 0:
+                    self._push_op_rec_forward(op_rec)
                 # No next records:
-                # - Op belongs to a column going into a graph_fn.
+                # - Op belongs to a column going into a graph_fn -> Hold off the call until the queue is empty.
                 elif isinstance(op_rec.column, DataOpRecordColumnIntoGraphFn):
-                    # Only call the GraphFn iff:
-                    # There are no more DataOpRecordColumnIntoAPIMethod ops in our list: We would like to hold off
-                    # any graph fn calls for as long as possible.
-                    # We don't want to run through a graph_fn, then have to call an API-method from within that graph_fn
-                    # and the component of that API-method is not input-/variable-complete yet.
-                    if have_api_method_recs:
-                        # Recycle this op-rec.
-                        self.op_records_to_process.add(op_rec)
-                    # There are other graph_fn columns that have a higher Component nesting_level and are
-                    # actually callable -> Call those first.
-                    elif highest_nesting_of_called_graph_fn_column > op_rec.column.component.nesting_level:
-                        # Recycle this op-rec.
-                        self.op_records_to_process.add(op_rec)
-                    # GraphFn column must be complete AND has not been sent through the graph_fn yet.
-                    elif op_rec.column.is_complete() and op_rec.column.already_sent is False:
-                        do_call = False  # Do the actual graph_fn call?
-
-                        # Only call the graph_fn if the Component is already input-complete.
-                        if op_rec.column.component.variable_complete or \
-                                (op_rec.column.requires_variable_completeness is False and
-                                 op_rec.column.component.input_complete):
-                            do_call = True
-                        # Component not input-/variable-complete yet. Recycle this op-rec.
-                        else:
-                            self.build_component_when_input_complete(op_rec.column.component)
-                            self.op_records_to_process.add(op_rec)
-                            if op_rec.column.component.input_complete is False:
-                                non_complete_components.add(op_rec.column.component.global_scope)
-                            # Call the graph_fn here right away iff component is ready now.
-                            elif op_rec.column.component.variable_complete or \
-                                    op_rec.column.requires_variable_completeness is False:
-                                do_call = True
-
-                        if do_call:
-                            # Call the graph_fn with the given column and call-options.
-                            self.run_through_graph_fn_with_device_and_scope(op_rec.column)
-                            # Store all resulting op_recs (returned by the graph_fn) to be processed next.
-                            self.op_records_to_process.update(op_rec.column.out_graph_fn_column.op_records)
-                            highest_nesting_of_called_graph_fn_column = op_rec.column.component.nesting_level
-
-                    # - There are still into-API-method-op-recs that should be handled first.
-                    # - Op column is not complete yet: Discard this one (as others will keep coming in anyway).
-                    # - Op column has already been sent (sibling ops may have arrived in same iteration).
+                    if op_rec.column.already_sent is False:
+                        pending_graph_fn_columns[op_rec.column] = True
                 # else: - Op belongs to a column coming from a graph_fn or an API-method, but the op is no longer used.
                 # -> Ignore Op.
+                # Queue all op-recs that received ops (also through Components having become input-complete).
+                if len(self.op_records_to_process) > 0:
+                    queue_op_recs(self.op_records_to_process)
+                    self.op_records_to_process = set()
+
+            # Check for API-methods' ops that are dependent on variables generated during the build and build these
+            # now.
+            # TODO is this necessary for define by run?
+            if get_backend() == "tf" and len(self.op_recs_depending_on_variables) > 0:
+                self._build_variable_dependent_op_recs()
+
+            # Call the next graph_fns (only if there is nothing else to push through the API-methods).
+            if len(self.op_records_to_process) == 0:
+                graph_fn_columns = self._get_callable_graph_fn_columns(pending_graph_fn_columns)
+                if len(graph_fn_columns) > 0:
+                    rounds += 1
+                    if rounds > self.max_build_iterations:
+                        raise RLGraphBuildError(
+                            "Build did not finish after {} rounds of graph_fn calls!".format(self.max_build_iterations)
+                        )
+                for graph_fn_column in graph_fn_columns:
+                    del pending_graph_fn_columns[graph_fn_column]
+                    # May have been called meanwhile by its Component becoming input-complete.
+                    if graph_fn_column.already_sent is False:
+                        self.run_through_graph_fn_with_device_and_scope(graph_fn_column)
+                        # Store all resulting op_recs (returned by the graph_fn) to be processed next.
+                        self.op_records_to_process.update(graph_fn_column.out_graph_fn_column.op_records)
+
+            # Nothing left to do.
+            if len(self.op_records_to_process) == 0:
+                break
+            queue_op_recs(self.op_records_to_process)
+            self.op_records_to_process = set()
 
-            # If we are done with the build, check for API-methods' ops that are dependent on variables
-            # generated during the build and build these now.
-            # TODO is this loop necessary for define by run?
-            if get_backend() == "tf":
-                if len(self.op_recs_depending_on_variables) > 0:
-                    op_records_list = list(self.op_recs_depending_on_variables)
-                    self.op_recs_depending_on_variables = set()
-
-                    # Loop through the op_records list and sanity check for "variables"-dependent Spaces, then get these
-                    # Spaces (iff respective component is input-complete), create the placeholders and keep building.
-                    for op_rec in op_records_list:
-                        space_desc = op_rec.space  # type: str
-                        mo = re.search(r'^variables:(.+)', space_desc)
-                        assert mo
-                        component_path = mo.group(1).split("/")
-                        component = self.root_component
-                        for level in component_path:
-                            assert level in component.sub_components, \
-                                "ERROR: `component_path` ('{}') contains non-existent Components!".format(
-                                    component_path)
-                            component = component.sub_components[level]
-                        if component.variable_complete is True:
-                            var_space = Dict({key: get_space_from_op(value) for key, value in sorted(
-                                component.get_variables(custom_scope_separator="-").items()
-                            )})
-                            op_rec.space = var_space
-                            placeholder_name = next(iter(op_rec.next)).column.api_method_rec.input_names[op_rec.position]
-                            assert len(op_rec.next) == 1, \
-                                "ERROR: root_component API op-rec ('{}') expected to have only one `next` op-rec!". \
-                                format(placeholder_name)
-                            op_rec.op = self.get_placeholder(
-                                placeholder_name, space=var_space, component=self.root_component
+        # Report graph_fn columns that were never called (and the reasons).
+        unresolved_graph_fn_columns = [c for c in pending_graph_fn_columns if c.already_sent is False]
+        if len(unresolved_graph_fn_columns) > 0 or \
+                (get_backend() == "tf" and len(self.op_recs_depending_on_variables) > 0):
+            report = self._get_unresolved_report(unresolved_graph_fn_columns)
+            self.logger.warning(report)
+            # Complete columns that could not be called point to a deadlock (e.g. a circular dependency between
+            # Components). Do a premature sanity check to report possible problems.
+            if any(c.is_complete() for c in unresolved_graph_fn_columns):
+                try:
+                    self.sanity_check_build(still_building=True)
+                except RLGraphBuildError as e:
+                    raise RLGraphBuildError("{}\n{}".format(e, report))
+
+        return rounds
+
+    def _push_op_rec_forward(self, op_rec):
+        """
+        Pushes the op and Space of the given op-rec into all its `next` op-recs and collects these in
+        `self.op_records_to_process`. Tries to build Components that are entered this way.
+
+        Args:
+            op_rec (DataOpRecord): The op-rec (with an actual op) to push forward.
+        """
+        for next_op_rec in self._sort_op_recs(op_rec.next):  # type: DataOpRecord
+            # Assert that next-record's `previous` field points back to op_rec.
+            assert next_op_rec.previous is op_rec, \
+                "ERROR: Op-rec {} in meta-graph has {} as next, but {}'s previous field points to {}!". \
+                format(op_rec, next_op_rec, next_op_rec, next_op_rec.previous)
+            # If not last op in this API-method -> continue.
+            if next_op_rec.is_terminal_op is False:
+                assert next_op_rec.op is None or is_constant(next_op_rec.op) or next_op_rec.op is op_rec.op
+                self.op_records_to_process.add(next_op_rec)
+            # Push op and Space into next op-record.
+            # With op-instructions?
+            if "key-lookup" in next_op_rec.op_instructions:
+                lookup_key = next_op_rec.op_instructions["key-lookup"]
+                if isinstance(lookup_key, str) and (not isinstance(op_rec.op, dict) or lookup_key
+                                                    not in op_rec.op):
+                    raise RLGraphError(
+                        "op_rec.op ({}) is not a dict or does not contain the lookup key '{}'!". \
+                        format(op_rec.op, lookup_key)
+                    )
+                elif isinstance(lookup_key, int) and (not isinstance(op_rec.op, (list, tuple)) or
+                                                      lookup_key >= len(op_rec.op)):
+                    raise RLGraphError(
+                        "op_rec.op ({}) is not a list/tuple or contains not enough items for lookup "
+                        "index '{}'!".format(op_rec.op, lookup_key)
+                    )
+                next_op_rec.op = op_rec.op[lookup_key]
+                next_op_rec.space = op_rec.space[lookup_key]
+            # No instructions -> simply pass on.
+            else:
+                next_op_rec.op = op_rec.op
+                next_op_rec.space = op_rec.space
+
+                # Also push Space into possible API-method record if slot's Space is still None.
+                if isinstance(op_rec.column, DataOpRecordColumnIntoAPIMethod):
+                    param_name = get_call_param_name(op_rec)
+                    component = op_rec.column.api_method_rec.component
+
+                    # Place Space for this input-param name (valid for all input params of same name even of
+                    # different API-method of the same Component).
+                    if component.api_method_inputs[param_name] is None or \
+                            component.api_method_inputs[param_name] == "flex":
+                        component.api_method_inputs[param_name] = next_op_rec.space
+                    # For non-space agnostic Components: Sanity check, whether Spaces are equivalent.
+                    elif component.space_agnostic is False:
+                        generic_space = check_space_equivalence(
+                            component.api_method_inputs[param_name], next_op_rec.space
+                        )
+                        # Spaces are not equivalent.
+                        if generic_space is False:
+                            raise RLGraphError(
+                                "ERROR: op-rec '{}' has Space '{}', but input-param '{}' already has Space "
+                                "'{}'!".format(next_op_rec, next_op_rec.space, param_name,
+                                               component.api_method_inputs[param_name])
                             )
-                            self.op_records_to_process.add(op_rec)
-                        else:
-                            self.op_recs_depending_on_variables.add(op_rec)
+                        # Overwrite both entries with the more generic Space.
+                        next_op_rec.space = component.api_method_inputs[param_name] = generic_space
 
-            # Sanity check, whether we are stuck.
-            new_op_records_list = self._sort_op_recs(self.op_records_to_process)
-            if op_records_list == new_op_records_list:
-                # Probably deadlocked. Do a premature sanity check to report possible problems.
-                if loop_counter > self.max_build_iterations:
-                    self.sanity_check_build(still_building=True)
-                    return
+            # Did we enter a new Component? If yes, check input-completeness and
+            # - If op_rec.column is None -> We are at the very beginning of the graph (op_rec.op is a
+            # placeholder).
+            next_component = next_op_rec.column.component
+            if op_rec.column is None or op_rec.column.component is not next_component:
+                self.build_component_when_input_complete(next_component)
 
-            op_records_list = new_op_records_list
+    def _get_callable_graph_fn_columns(self, pending_graph_fn_columns):
+        """
+        Returns those pending graph_fn columns that can be called now: The column is complete and its Component
+        is input-complete (or variable-complete, if required). Only columns of the deepest nested Components are
+        returned, so that API-methods called from within graph_fns of shallower Components find their Components
+        input-/variable-complete.
+
+        Args:
+            pending_graph_fn_columns (OrderedDict[DataOpRecordColumnIntoGraphFn,bool]): The graph_fn columns that
+                have received ops but have not been called yet.
 
-            loop_counter += 1
-        return loop_counter
+        Returns:
+            List[DataOpRecordColumnIntoGraphFn]: The columns to call in this round.
+        """
+        callable_columns = []
+        for column in sorted(pending_graph_fn_columns, key=lambda c: c.component.nesting_level, reverse=True):
+            if len(callable_columns) > 0 and \
+                    column.component.nesting_level < callable_columns[0].component.nesting_level:
+                break
+            if column.is_complete():
+                # Component not input-/variable-complete yet -> Try to build it.
+                if self._is_graph_fn_column_callable(column) is False:
+                    self.build_component_when_input_complete(column.component)
+                # Already called (e.g. by its Component becoming input-complete).
+                if column.already_sent is True:
+                    del pending_graph_fn_columns[column]
+                elif self._is_graph_fn_column_callable(column):
+                    callable_columns.append(column)
+        return callable_columns
+
+    @staticmethod
+    def _is_graph_fn_column_callable(column):
+        return column.component.variable_complete or \
+            (column.requires_variable_completeness is False and column.component.input_complete)
+
+    def _build_variable_dependent_op_recs(self):
+        """
+        Creates the placeholders for those root API-method inputs whose Spaces depend on the variables of a (now
+        variable-complete) Component ("variables:[Component path]") and collects them in
+        `self.op_records_to_process`.
+        """
+        op_records_list = list(self.op_recs_depending_on_variables)
+        self.op_recs_depending_on_variables = set()
+
+        # Loop through the op_records list and sanity check for "variables"-dependent Spaces, then get these
+        # Spaces (iff respective component is input-complete), create the placeholders and keep building.
+        for op_rec in op_records_list:
+            space_desc = op_rec.space  # type: str
+            mo = re.search(r'^variables:(.+)', space_desc)
+            assert mo
+            component_path = mo.group(1).split("/")
+            component = self.root_component
+            for level in component_path:
+                assert level in component.sub_components, \
+                    "ERROR: `component_path` ('{}') contains non-existent Components!".format(
+                        component_path)
+                component = component.sub_components[level]
+            if component.variable_complete is True:
+                var_space = Dict({key: get_space_from_op(value) for key, value in sorted(
+                    component.get_variables(custom_scope_separator="-").items()
+                )})
+                op_rec.space = var_space
+                placeholder_name = next(iter(op_rec.next)).column.api_method_rec.input_names[op_rec.position]
+                assert len(op_rec.next) == 1, \
+                    "ERROR: root_component API op-rec ('{}') expected to have only one `next` op-rec!". \
+                    format(placeholder_name)
+                op_rec.op = self.get_placeholder(
+                    placeholder_name, space=var_space, component=self.root_component
+                )
+                self.op_records_to_process.add(op_rec)
+            else:
+                self.op_recs_depending_on_variables.add(op_rec)
+
+    def _get_unresolved_report(self, graph_fn_columns):
+        """
+        Args:
+            graph_fn_columns (List[DataOpRecordColumnIntoGraphFn]): The graph_fn columns that were never called.
+
+        Returns:
+            str: A report on why the given graph_fn columns and the variable-dependent API-method inputs could not be
+                built (e.g. due to a circular dependency between Components).
+        """
+        op_recs_depending_on_variables = self.op_recs_depending_on_variables if get_backend() == "tf" else []
+        lines = ["Build finished with {} uncalled graph_fn column(s) and {} unresolved variable-dependent "
+                 "input(s):".format(len(graph_fn_columns), len(op_recs_depending_on_variables))]
+        for column in graph_fn_columns:
+            component = column.component
+            if not column.is_complete():
+                reason = "{} of {} inputs missing".format(
+                    len([op_rec for op_rec in column.op_records if op_rec.op is None]), len(column.op_records)
+                )
+            elif component.input_complete is False:
+                reason = "Component input-incomplete (no Spaces for args {})".format(
+                    [name for name, space in component.api_method_inputs.items() if space is None]
+                )
+            else:
+                reason = "Component variable-incomplete (input-incomplete sub-Components: {})".format(
+                    [c.global_scope for c in component.get_all_sub_components() if c.input_complete is False]
+                )
+            lines.append("  {} in '{}': {}".format(column, component.global_scope, reason))
+        for op_rec in op_recs_depending_on_variables:
+            lines.append("  {}: Spaces of '{}' not known".format(op_rec, op_rec.space))
+        return "\n".join(lines)
 
     @staticmethod
     def _sort_op_recs(recs):
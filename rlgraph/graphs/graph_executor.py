@@ -17,12 +17,17 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import csv
+import io
 import logging
+import time
 
 from rlgraph.graphs import MetaGraphBuilder
 from rlgraph.utils.rlgraph_errors import RLGraphError
 from rlgraph.utils.specifiable import Specifiable
 from rlgraph.utils.input_parsing import parse_saver_spec, parse_execution_spec
+from rlgraph.utils.profiling import ApiCallMetrics, BuildProfiler
+from rlgraph.utils.util import force_list
 
 
 class GraphExecutor(Specifiable):
@@ -60,6 +65,10 @@ class GraphExecutor(Specifiable):
         self.summary_spec = self.graph_builder.summary_spec
         self.execution_spec = parse_execution_spec(execution_spec)  # sanitize again (after Agent); one never knows
 
+        # Opt-in profiling of the graph build (times per build phase and Component, see `BuildProfiler`).
+        if self.execution_spec.get("profile_build", False) is True:
+            self.graph_builder.build_profiler = BuildProfiler()
+
         # A global training/update counter. Should be increased by 1 each update/learning step.
         self.global_training_timestep = None
 
@@ -92,6 +101,10 @@ class GraphExecutor(Specifiable):
         self.default_device = None
         self.device_map = None
 
+        # Per API-method call metrics (counts, latencies, batch sizes), see `get_api_metrics`.
+        self.api_metrics_enabled = self.execution_spec.get("record_api_metrics", True)
+        self.api_metrics = {}
+
     def build(self, root_components, input_spaces, **kwargs):
         """
         Sets up the computation graph by:
@@ -125,6 +138,79 @@ class GraphExecutor(Specifiable):
         """
         raise NotImplementedError
 
+    def record_api_call(self, api_method, start_time, params=None):
+        """
+        Records the latency (from `start_time` until now) and batch size of a single `execute` call.
+
+        Args:
+            api_method (str): The name of the API-method called (or the names of several API-methods
+                executed together, joined by "+").
+            start_time (float): The `time.perf_counter()` value at the start of the call.
+            params (Optional[any]): The call's input params. The batch size is taken from the first one.
+        """
+        latency = time.perf_counter() - start_time
+        metrics = self.api_metrics.get(api_method)
+        if metrics is None:
+            metrics = ApiCallMetrics()
+            self.api_metrics[api_method] = metrics
+        metrics.record(latency, get_batch_size(params))
+
+    def record_api_calls(self, api_method_calls, start_time):
+        """
+        Records a (possibly multi-API-method) `execute` call, given as the raw `api_method_calls` specifiers.
+        """
+        if len(api_method_calls) == 1:
+            api_method_call = api_method_calls[0]
+            if isinstance(api_method_call, (list, tuple)):
+                self.record_api_call(
+                    get_api_method_name(api_method_call[0]), start_time,
+                    api_method_call[1] if len(api_method_call) > 1 else None
+                )
+            else:
+                self.record_api_call(get_api_method_name(api_method_call), start_time)
+        else:
+            names = [get_api_method_name(call[0] if isinstance(call, (list, tuple)) else call)
+                     for call in api_method_calls if call is not None]
+            self.record_api_call("+".join(names), start_time)
+
+    def get_api_metrics(self):
+        """
+        Metrics are recorded per `execute` call (including the conversion of the results). `execute` calls with
+        several API-methods are recorded under the API-method names joined by "+" (e.g. "update+sync").
+
+        Returns:
+            dict: Per API-method: Number of calls, latency stats in s (mean, min, max, p50, p95, p99), mean/max batch
+                size and throughput (calls and batch items per s spent in these calls).
+        """
+        return {api_method: metrics.to_dict() for api_method, metrics in sorted(self.api_metrics.items())}
+
+    def export_api_metrics_csv(self, path=None):
+        """
+        Exports the API-method metrics (see `get_api_metrics`) as CSV (one row per API-method).
+
+        Args:
+            path (Optional[str]): The file to write to. If None, only returns the CSV string.
+
+        Returns:
+            str: The CSV string.
+        """
+        api_metrics = self.get_api_metrics()
+        columns = ["calls", "total", "mean", "min", "max", "p50", "p95", "p99", "mean_batch_size",
+                   "max_batch_size", "calls_per_s", "items_per_s"]
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["api_method"] + columns)
+        for api_method, metrics in api_metrics.items():
+            writer.writerow([api_method] + [metrics[column] for column in columns])
+        csv_string = out.getvalue()
+        if path is not None:
+            with open(path, "w") as csv_file:
+                csv_file.write(csv_string)
+        return csv_string
+
+    def reset_api_metrics(self):
+        self.api_metrics = {}
+
     def read_variable_values(self, variables):
         """
         Read variable values from a graph, e.g. by calling the underlying graph
@@ -260,3 +346,28 @@ class GraphExecutor(Specifiable):
                 )
         if core_found is False:
             raise RLGraphError("ERROR: Root-component '{}' was not found in meta-graph!".format(root_component))
+
+
+def get_batch_size(params):
+    """
+    Returns the batch size (size of the first dim) of the first (possibly nested) input param or None if unknown.
+    """
+    params = force_list(params)
+    if len(params) == 0:
+        return None
+    param = params[0]
+    while isinstance(param, (dict, tuple)) and len(param) > 0:
+        param = next(iter(param.values())) if isinstance(param, dict) else param[0]
+    shape = getattr(param, "shape", None)
+    if shape is not None:
+        return int(shape[0]) if len(shape) > 0 else None
+    return len(param) if isinstance(param, list) else None
+
+
+def get_api_method_name(api_method):
+    """
+    Returns:
+        str: The name of an API-method specifier (API-method name or the API-method itself, e.g.
+            `root_component.insert_records`).
+    """
+    return api_method.__name__ if callable(api_method) else api_method
@@ -26,7 +26,8 @@ from rlgraph.components.component import Component
 from rlgraph.graphs import GraphExecutor
 from rlgraph.utils import util
 from rlgraph.utils.define_by_run_ops import define_by_run_flatten, define_by_run_unflatten
-from rlgraph.utils.util import force_torch_tensors
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.util import force_torch_tensors, convert_dtype
 
 if get_backend() == "pytorch":
     import torch
@@ -58,6 +59,23 @@ class PyTorchExecutor(GraphExecutor):
         # Squeeze result dims, often necessary in tests.
         self.remove_batch_dims = True
 
+        # Compiled API-calls: (API-method name, return ops) -> callable (see `compile_api_call`).
+        self.compile_api_calls = self.execution_spec.get("compile_api_calls", True)
+        self.compiled_api_calls = {}
+        # Param-converters (to torch tensors) by param type (and numpy dtype).
+        self.param_converters = {}
+        # Whether to wrap numpy input params via `torch.from_numpy` (sharing memory) instead of copying them.
+        # Callers must then not modify arrays they passed in as long as the graph may still hold them (e.g. memories
+        # or sequence preprocessors).
+        self.zero_copy_inputs = self.execution_spec.get("zero_copy_inputs", False)
+
+        # Define-by-run call profiling (off by default as it times and records every API-method call).
+        # Profiling is process-wide (see `Component.set_profiling`): Only switch it on here, so that executors
+        # without profiler do not switch it off for others.
+        self.profiling_enabled = self.execution_spec.get("enable_profiler", False)
+        if self.profiling_enabled:
+            Component.set_profiling(True, self.execution_spec.get("max_profiled_calls", 10000))
+
     def build(self, root_components, input_spaces, **kwargs):
         start = time.perf_counter()
         self.init_execution()
@@ -68,6 +86,8 @@ class PyTorchExecutor(GraphExecutor):
             start = time.perf_counter()
             meta_graph = self.meta_graph_builder.build(component, input_spaces)
             meta_build_times.append(time.perf_counter() - start)
+            if self.graph_builder.build_profiler is not None:
+                self.graph_builder.build_profiler.record("meta_graph", start)
 
             build_time = self.graph_builder.build_define_by_run_graph(
                 meta_graph=meta_graph, input_spaces=input_spaces, available_devices=self.available_devices
@@ -81,19 +101,41 @@ class PyTorchExecutor(GraphExecutor):
         )
 
     def execute(self, *api_method_calls):
+        # Same as in the TensorFlowExecutor: One metrics record per `execute` call (after results were cleaned).
+        if self.api_metrics_enabled is True:
+            start = time.perf_counter()
+            ret = self._execute(*api_method_calls)
+            self.record_api_calls(api_method_calls, start)
+            return ret
+        return self._execute(*api_method_calls)
+
+    def _execute(self, *api_method_calls):
         # Have to call each method separately.
         ret = []
         for api_method in api_method_calls:
             if api_method is None:
                 continue
-            elif isinstance(api_method, (list, tuple)):
+            if isinstance(api_method, (list, tuple)):
                 # Which ops are supposed to be returned?
                 op_or_indices_to_return = api_method[2] if len(api_method) > 2 else None
                 params = util.force_list(api_method[1])
                 api_method = api_method[0]
-                tensor_params = force_torch_tensors(params=params)
+
+                if self.compile_api_calls:
+                    key = (api_method, tuple(util.force_list(op_or_indices_to_return))
+                           if op_or_indices_to_return is not None else None)
+                    compiled_call = self.compiled_api_calls.get(key)
+                    if compiled_call is None:
+                        compiled_call = self.compile_api_call(api_method, op_or_indices_to_return)
+                        self.compiled_api_calls[key] = compiled_call
+                    ret.extend(compiled_call(params))
+                    continue
+
+                tensor_params = force_torch_tensors(params=params, copy=not self.zero_copy_inputs)
 
                 api_ret = self.graph_builder.execute_define_by_run_op(api_method, tensor_params)
+                if api_ret is None:
+                    continue
                 is_dict_result = isinstance(api_ret, dict)
                 if not isinstance(api_ret, list) and not isinstance(api_ret, tuple):
                     api_ret = [api_ret]
@@ -118,11 +160,10 @@ class PyTorchExecutor(GraphExecutor):
 
                 else:
                     # Just return everything in the order it was returned by the API method.
-                    if api_ret is not None:
-                        for op_result in api_ret:
-                            if isinstance(op_result, torch.Tensor) and op_result.requires_grad is True:
-                                op_result = op_result.detach()
-                            to_return.append(op_result)
+                    for op_result in api_ret:
+                        if isinstance(op_result, torch.Tensor) and op_result.requires_grad is True:
+                            op_result = op_result.detach()
+                        to_return.append(op_result)
 
                 # Clean and return.
                 self.clean_results(ret, to_return)
@@ -146,6 +187,87 @@ class PyTorchExecutor(GraphExecutor):
         ret = ret[0] if len(ret) == 1 else ret
         return ret
 
+    def compile_api_call(self, api_method, op_or_indices_to_return=None):
+        """
+        Compiles a call to a root API-method into a flat callable: The API-function and the selection of return
+        values are resolved once, and params are converted through cached (per param type) converters. Results
+        are cleaned via `clean_results` (same as in `execute`).
+
+        Args:
+            api_method (str): The name of the root API-method.
+            op_or_indices_to_return (Optional[Union[int,str,list]]): Indices (or keys for dict results) of the
+                return values to return. None for all.
+
+        Returns:
+            callable: Takes the list of params for the API-method and returns the list of cleaned results.
+        """
+        if api_method not in self.graph_builder.api:
+            raise RLGraphError("No API-method with name '{}' found!".format(api_method))
+        root_component = self.graph_builder.root_component
+        api_fn = root_component.api_fn_by_name[api_method]
+        root_args = (root_component,) if api_method in root_component.synthetic_methods else ()
+
+        return_keys = return_indices = None
+        if op_or_indices_to_return is not None:
+            return_keys = util.force_list(op_or_indices_to_return)
+            # Indices are returned in sorted order.
+            if not isinstance(op_or_indices_to_return, str):
+                return_indices = sorted(return_keys)
+
+        convert = self._convert_param
+        clean_results = self.clean_results
+
+        def compiled_call(params):
+            ret = []
+            api_ret = api_fn(*root_args, *[convert(param) for param in params])
+            # API-methods without return values add no results.
+            if api_ret is None:
+                return ret
+
+            if isinstance(api_ret, dict):
+                if return_keys is not None:
+                    api_ret = {key: api_ret[key] for key in return_keys}
+                to_return = [api_ret]
+            else:
+                if not isinstance(api_ret, (list, tuple)):
+                    api_ret = [api_ret]
+                to_return = api_ret if return_indices is None else [api_ret[i] for i in return_indices]
+            clean_results(ret, to_return)
+            return ret
+
+        return compiled_call
+
+    def _convert_param(self, param):
+        """
+        Converts a single API-method param into a torch tensor (or a flat dict of tensors), the same way as
+        `force_torch_tensors`, using a converter cached by param type (and dtype).
+        """
+        param_type = type(param)
+        dtype = param.dtype if param_type is np.ndarray else None
+        converter = self.param_converters.get((param_type, dtype))
+        if converter is None:
+            converter = self._create_param_converter(param_type, dtype)
+            self.param_converters[(param_type, dtype)] = converter
+        return converter(param)
+
+    def _create_param_converter(self, param_type, dtype):
+        if issubclass(param_type, torch.Tensor):
+            return lambda param: param
+        elif param_type is np.ndarray:
+            convert_type = convert_dtype(dtype, to="pytorch")
+            # PyTorch cannot convert from a np.bool_, must be uint (the converted array is new -> no copy).
+            if dtype == np.bool_:
+                return lambda param: torch.from_numpy(param.astype(np.uint8))
+            elif self.zero_copy_inputs and torch.from_numpy(np.zeros(0, dtype=dtype)).dtype == convert_type:
+                return _from_numpy
+            return lambda param: torch.tensor(param, dtype=convert_type)
+        elif param_type in (bool, int, float):
+            convert_type = convert_dtype(param_type, to="pytorch")
+            return lambda param: torch.tensor(param, dtype=convert_type)
+        # Containers, lists, etc..: Generic conversion.
+        copy = not self.zero_copy_inputs
+        return lambda param: force_torch_tensors([param], copy=copy)[0]
+
     def clean_results(self, ret, to_return):
         for result in to_return:
             if isinstance(result, dict):
@@ -154,6 +276,8 @@ class PyTorchExecutor(GraphExecutor):
                 ret.append(cleaned_dict)
             elif self.remove_batch_dims and isinstance(result, np.ndarray):
                 ret.append(np.array(np.squeeze(result)))
+            elif isinstance(result, torch.Tensor):
+                ret.append(_to_numpy(result))
             elif hasattr(result, "numpy"):
                 ret.append(np.array(result.numpy()))
             else:
@@ -218,3 +342,26 @@ class PyTorchExecutor(GraphExecutor):
 
     def terminate(self):
         pass
+
+
+def _to_numpy(tensor):
+    """
+    Converts a torch tensor result into a numpy array. Freshly computed tensors (with a grad-fn and their own
+    storage) are returned as (zero-copy) views, all others (e.g. variables, passed-through inputs or views into
+    these) are copied to not alias graph state.
+    """
+    array = tensor.detach().numpy()
+    return array if tensor.grad_fn is not None and tensor._base is None else array.copy()
+
+
+def _from_numpy(array):
+    """
+    Wraps a numpy array as torch tensor without copying (copies only if not possible).
+    """
+    if array.flags.writeable:
+        try:
+            return torch.from_numpy(array)
+        # E.g. negative strides.
+        except ValueError:
+            pass
+    return torch.tensor(array)
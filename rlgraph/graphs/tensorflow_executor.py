@@ -24,7 +24,9 @@ from rlgraph import get_backend, get_distributed_backend
 import rlgraph.utils as util
 from rlgraph.components.common.multi_gpu_synchronizer import MultiGpuSynchronizer
 from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.graphs.graph_build_cache import GraphBuildCache
 from rlgraph.graphs.graph_executor import GraphExecutor
+from rlgraph.utils.ops import ContainerDataOp, flatten_op
 from rlgraph.utils.util import force_list
 
 if get_backend() == "tf":
@@ -114,6 +116,18 @@ class TensorFlowExecutor(GraphExecutor):
             if not self.disable_monitoring:
                 self.tf_session_options = tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE)
 
+        # Cached session callables (plus feed plans) for `callable_api_methods`,
+        # keyed by (API-method name, number of given params, return_ops).
+        self.callable_api_methods = set(self.execution_spec["callable_api_methods"] or [])
+        self.api_callables = {}
+
+        # Optional cache of built graphs (see GraphBuildCache).
+        build_cache_spec = self.execution_spec["build_cache"]
+        self.build_cache = GraphBuildCache(build_cache_spec["directory"]) if build_cache_spec is not None else None
+        self.build_cache_key = build_cache_spec.get("key") if build_cache_spec is not None else None
+        # The variables to initialize at session start if the graph was imported from the build cache.
+        self.cached_init_variables = None
+
         self.init_device_strategy()
 
         # # Initialize distributed backend.
@@ -175,6 +189,17 @@ class TensorFlowExecutor(GraphExecutor):
 
         # Check graph setup and construct the static graph object.
         self.init_execution()
+
+        # Import the graph instead of building it, if a build with the same settings is in the cache.
+        cache_key = None
+        if self.build_cache is not None and len(root_components) == 1:
+            cache_key = self.build_cache_key or GraphBuildCache.get_key(
+                root_components[0], input_spaces, execution_spec=self.execution_spec, batch_size=batch_size,
+                build_options=build_options, optimizer=optimizer.global_scope if optimizer is not None else None
+            )
+            if cache_key is not None and self.build_cache.contains(cache_key):
+                return self._build_from_cache(cache_key, root_components[0], optimizer, build_options, batch_size)
+
         self.setup_graph()
 
         # 1. Build phase: Meta graph construction -> All of the root_component's API methods are being called once,
@@ -192,6 +217,8 @@ class TensorFlowExecutor(GraphExecutor):
             start = time.perf_counter()
             meta_graph = self.meta_graph_builder.build(component, input_spaces)
             meta_build_times.append(time.perf_counter() - start)
+            if self.graph_builder.build_profiler is not None:
+                self.graph_builder.build_profiler.record("meta_graph", start)
 
             # 2. Build phase: Backend compilation, build actual TensorFlow graph from meta graph.
             # -> Inputs/Operations/variables
@@ -207,6 +234,12 @@ class TensorFlowExecutor(GraphExecutor):
             # Check device assignments for inconsistencies or unused devices.
             self._sanity_check_devices()
 
+            # Store the built graph (before adding savers, summaries and init ops) for later builds.
+            if cache_key is not None:
+                self.build_cache.store(
+                    cache_key, self.graph, component, self.graph_builder.api, self.get_variables_to_initialize()
+                )
+
             # Set up any remaining session or monitoring configurations.
             self.finish_graph_setup()
 
@@ -216,7 +249,40 @@ class TensorFlowExecutor(GraphExecutor):
             build_times=build_times,
         )
 
+    def _build_from_cache(self, cache_key, root_component, optimizer, build_options, batch_size):
+        """
+        Imports the graph of a previous build (with the same settings) from the build cache instead of building it.
+        """
+        start = time.perf_counter()
+        self.sanity_check_component_tree(root_component=root_component)
+        self._build_device_strategy(root_component, optimizer, batch_size=batch_size, extra_build_args=build_options)
+        self.graph_builder.root_component = root_component
+        self.setup_graph(import_from_cache=cache_key)
+        self.finish_graph_setup()
+
+        return dict(
+            total_build_time=time.perf_counter() - start,
+            meta_graph_build_times=[],
+            build_times=[],
+            cache_key=cache_key
+        )
+
     def execute(self, *api_method_calls):
+        if self.api_metrics_enabled is True:
+            start = time.perf_counter()
+            ret = self._execute(*api_method_calls)
+            self.record_api_calls(api_method_calls, start)
+            return ret
+        return self._execute(*api_method_calls)
+
+    def _execute(self, *api_method_calls):
+        # Fast path: Single call to a callable API-method with a list of params.
+        if len(api_method_calls) == 1 and not self.profiling_enabled and not self.timeline_enabled:
+            api_method_call = api_method_calls[0]
+            if isinstance(api_method_call, (list, tuple)) and api_method_call[0] in self.callable_api_methods \
+                    and not isinstance(api_method_call[1], dict):
+                return self.execute_callable(*api_method_call)
+
         # Fetch inputs for the different API-methods.
         fetch_dict, feed_dict = self.graph_builder.get_execution_inputs(*api_method_calls)
         ret = self.monitored_session.run(
@@ -239,6 +305,73 @@ class TensorFlowExecutor(GraphExecutor):
 
         return ret
 
+    def execute_callable(self, api_method, params, return_ops=None):
+        """
+        Executes a single API-method through a cached session callable: The fetches and the ordered
+        placeholders to feed are looked up only once per (API-method, number of params, return_ops). Session hooks
+        are not run for these calls.
+
+        Args:
+            api_method (str): The name of the API-method to call.
+            params (any): The input param(s) for the API-method (None for no params, no more params after a None).
+            return_ops (Optional[Union[int,str,list]]): The return op indices (or keys) to fetch. None for all.
+
+        Returns:
+            any: The same results as `execute` for this single call.
+        """
+        params = force_list(params)
+        if None in params:
+            params = params[:params.index(None)]
+        return_ops = force_list(return_ops) if return_ops is not None else None
+        key = (api_method, len(params), tuple(return_ops) if return_ops is not None else None)
+
+        plan = self.api_callables.get(key)
+        if plan is None:
+            plan = self._create_callable_plan(api_method, params, return_ops)
+            self.api_callables[key] = plan
+        session_callable, flat_keys = plan
+
+        # Feed values in the order of the callable's feed list.
+        feed_values = []
+        for param, param_flat_keys in zip(params, flat_keys):
+            if param_flat_keys is None:
+                feed_values.append(param)
+            else:
+                flat_param = flatten_op(param)
+                feed_values.extend(flat_param[flat_key] for flat_key in param_flat_keys)
+        ret = session_callable(*feed_values)
+
+        # Return single values instead of lists of 1 item, but keep dicts as-are (same as `execute`).
+        if isinstance(ret, dict):
+            return ret
+        return ret[0] if len(ret) == 1 else tuple(ret)
+
+    def _create_callable_plan(self, api_method, params, return_ops):
+        """
+        Creates the session callable and the feed plan for `execute_callable`.
+
+        Returns:
+            Tuple[callable,list]: The session callable and - per param - the flat keys of its (container)
+                placeholder (None for primitive placeholders).
+        """
+        fetch_dict, _ = self.graph_builder.get_execution_inputs((api_method, params, return_ops))
+        in_op_records = self.graph_builder.api[api_method][0]
+
+        feed_list = []
+        flat_keys = []
+        for i in range(len(params)):
+            placeholder = in_op_records[i].op
+            if isinstance(placeholder, ContainerDataOp):
+                flat_placeholders = flatten_op(placeholder)
+                flat_keys.append(list(flat_placeholders.keys()))
+                feed_list.extend(flat_placeholders.values())
+            else:
+                flat_keys.append(None)
+                feed_list.append(placeholder)
+
+        session_callable = self.session.make_callable(fetch_dict[api_method], feed_list=feed_list)
+        return session_callable, flat_keys
+
     def update_profiler_if_necessary(self):
         """
         Updates profiler according to specification.
@@ -338,18 +471,28 @@ class TensorFlowExecutor(GraphExecutor):
                     assignments[device] = self.graph_builder.device_component_assignments[device]
             return assignments
 
-    def setup_graph(self):
+    def setup_graph(self, import_from_cache=None):
         """
         Generates the tf-Graph object and enters its scope as default graph.
         Also creates the global time step variable.
+
+        Args:
+            import_from_cache (Optional[str]): A build cache key. If given, imports the cached graph (including
+                the global time step variable) instead.
         """
         self.graph = tf.Graph()
         self.graph_default_context = self.graph.as_default()
         self.graph_default_context.__enter__()
 
-        self.global_training_timestep = tf.get_variable(
-            name="global-timestep", dtype=util.convert_dtype("int"), trainable=False, initializer=0,
-            collections=["global-timestep", tf.GraphKeys.GLOBAL_STEP])
+        if import_from_cache is not None:
+            self.cached_init_variables = self.build_cache.load(
+                import_from_cache, self.graph_builder.root_component, self.graph_builder
+            )
+            self.global_training_timestep = tf.train.get_global_step(self.graph)
+        else:
+            self.global_training_timestep = tf.get_variable(
+                name="global-timestep", dtype=util.convert_dtype("int"), trainable=False, initializer=0,
+                collections=["global-timestep", tf.GraphKeys.GLOBAL_STEP])
 
         # Set the random seed graph-wide.
         if self.seed is not None:
@@ -448,14 +591,7 @@ class TensorFlowExecutor(GraphExecutor):
         Assigns the scaffold object to `self.scaffold`.
         """
         # Determine init_op and ready_op.
-        var_list = list(self.graph_builder.root_component.variable_registry.values())
-        var_list.append(self.global_training_timestep)
-
-        # We can not fetch optimizer vars.
-        # TODO let graph builder do this
-        if self.optimizers is not None:
-            for optimizer in self.optimizers:
-                var_list.extend(optimizer.get_optimizer_variables())
+        var_list = self.get_variables_to_initialize()
 
         if self.execution_mode == "single":
             self.init_op = tf.variables_initializer(var_list=var_list)
@@ -507,6 +643,25 @@ class TensorFlowExecutor(GraphExecutor):
                 copy_from_scaffold=None
             )
 
+    def get_variables_to_initialize(self):
+        """
+        Returns:
+            list: All variables of the graph (Component-, optimizer- and the global time step variables) to be
+                initialized at session start.
+        """
+        if self.cached_init_variables is not None:
+            return list(self.cached_init_variables)
+
+        var_list = list(self.graph_builder.root_component.variable_registry.values())
+        var_list.append(self.global_training_timestep)
+
+        # We can not fetch optimizer vars.
+        # TODO let graph builder do this
+        if self.optimizers is not None:
+            for optimizer in self.optimizers:
+                var_list.extend(optimizer.get_optimizer_variables())
+        return var_list
+
     @staticmethod
     def setup_specifiable_servers(hooks):
         # Add the hook only if there have been SpecifiableServer objects created.
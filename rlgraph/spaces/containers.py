@@ -30,6 +30,57 @@ class ContainerSpace(Space):
     """
     A simple placeholder class for Spaces that contain other Spaces.
     """
+    def get_flat_plan(self):
+        """
+        Returns:
+            FlatSpacePlan: The flat plan of this Space (computed on first use and cached until the Space changes).
+        """
+        plan = self.__dict__.get("_flat_plan")
+        if plan is None:
+            plan = self._flat_plan = FlatSpacePlan(self)
+        return plan
+
+    def _invalidate_flat_plan(self):
+        self._flat_plan = None
+
+    def get_record_dtype(self):
+        """
+        Returns:
+            np.dtype: A (C-aligned) numpy structured dtype with one field (named by the flat key) per primitive
+                sub-Space, such that a batch of samples of this Space can be held in a single numpy array.
+        """
+        return self.get_flat_plan().get_record_dtype()
+
+    def to_records(self, samples, out=None):
+        """
+        Writes a batch of (container) samples into a numpy array of `get_record_dtype()` records.
+
+        Args:
+            samples (any): The batch of samples (with batch rank).
+            out (Optional[np.ndarray]): The records array (of the samples' batch size) to write into. If None,
+                allocates a new one.
+
+        Returns:
+            np.ndarray: The records array.
+        """
+        return self.get_flat_plan().to_records(samples, out=out)
+
+    def from_records(self, records):
+        """
+        Args:
+            records (np.ndarray): An array of `get_record_dtype()` records.
+
+        Returns:
+            any: The records as a (container) batch of samples, whose leaves are views (no copies) into `records`.
+        """
+        return self.get_flat_plan().from_records(records)
+
+    def __getstate__(self):
+        # The plan holds functions (not picklable) and is cheap to re-compute.
+        state = dict(self.__dict__)
+        state.pop("_flat_plan", None)
+        return state
+
     def sample(self, size=None, horizontal=False):
         """
         Child classes must overwrite this one again with support for the `horizontal` parameter.
@@ -94,14 +145,24 @@ class Dict(ContainerSpace, dict):
         super(Dict, self)._add_batch_rank(add_batch_rank)
         for v in self.values():
             v._add_batch_rank(add_batch_rank)
+        self._invalidate_flat_plan()
 
     def _add_time_rank(self, add_time_rank=False, time_major=False):
         super(Dict, self)._add_time_rank(add_time_rank, time_major)
         for v in self.values():
             v._add_time_rank(add_time_rank, time_major)
+        self._invalidate_flat_plan()
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._invalidate_flat_plan()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._invalidate_flat_plan()
 
     def force_batch(self, samples):
-        return dict([(key, self[key].force_batch(samples[key])) for key in sorted(self.keys())])
+        return self.get_flat_plan().force_batch(samples)
 
     @property
     def shape(self):
@@ -144,10 +205,10 @@ class Dict(ContainerSpace, dict):
         if horizontal:
             return np.array([{key: self[key].sample() for key in sorted(self.keys())}] * (size or 1))
         else:
-            return {key: self[key].sample(size=size) for key in sorted(self.keys())}
+            return self.get_flat_plan().sample(size=size)
 
     def zeros(self, size=None):
-        return DataOpDict([(key, subspace.zeros(size=size)) for key, subspace in self.items()])
+        return self.get_flat_plan().zeros(size=size)
 
     def contains(self, sample):
         return isinstance(sample, dict) and all(self[key].contains(sample[key]) for key in self.keys())
@@ -216,14 +277,16 @@ class Tuple(ContainerSpace, tuple):
         super(Tuple, self)._add_batch_rank(add_batch_rank)
         for v in self:
             v._add_batch_rank(add_batch_rank)
+        self._invalidate_flat_plan()
 
     def _add_time_rank(self, add_time_rank=False, time_major=False):
         super(Tuple, self)._add_time_rank(add_time_rank, time_major)
         for v in self:
             v._add_time_rank(add_time_rank, time_major)
+        self._invalidate_flat_plan()
 
     def force_batch(self, samples):
-        return tuple([c.force_batch(samples[i]) for i, c in enumerate(self)])
+        return self.get_flat_plan().force_batch(samples)
 
     @property
     def shape(self):
@@ -268,10 +331,10 @@ class Tuple(ContainerSpace, tuple):
         if horizontal:
             return np.array([tuple(subspace.sample() for subspace in self)] * (size or 1))
         else:
-            return tuple(x.sample(size=size) for x in self)
+            return self.get_flat_plan().sample(size=size)
 
     def zeros(self, size=None):
-        return tuple([c.zeros(size=size) for i, c in enumerate(self)])
+        return self.get_flat_plan().zeros(size=size)
 
     def contains(self, sample):
         return isinstance(sample, (tuple, list, np.ndarray)) and len(self) == len(sample) and \
@@ -289,3 +352,96 @@ class Tuple(ContainerSpace, tuple):
 
     def __eq__(self, other):
         return tuple.__eq__(self, other)
+
+
+class FlatSpacePlan(object):
+    """
+    The flat layout of a ContainerSpace: Its primitive sub-Spaces (in the order of `flatten()`) with their flat
+    keys, shapes and dtypes, plus functions to extract the leaves of a (nested) container sample and to re-assemble
+    them. Sampling, zeros and batch-forcing then only need a single pass over the leaves instead of recursing
+    through the container structure each call.
+    """
+    def __init__(self, space):
+        """
+        Args:
+            space (ContainerSpace): The Space to compute the plan for.
+        """
+        # Import here to avoid circular imports.
+        from rlgraph.spaces.space_utils import get_space_leaf_builder, get_space_leaf_getter
+
+        flat_space = space.flatten()
+        self.keys = list(flat_space.keys())
+        self.leaf_spaces = list(flat_space.values())
+        self.shapes = [leaf_space.shape for leaf_space in self.leaf_spaces]
+        self.dtypes = [np.dtype(leaf_space.dtype) for leaf_space in self.leaf_spaces]
+        self.has_time_rank = any(leaf_space.has_time_rank for leaf_space in self.leaf_spaces)
+
+        self.get_leaves = get_space_leaf_getter(space)
+        self.build = get_space_leaf_builder(space)
+        self.build_zeros = get_space_leaf_builder(space, dict_class=DataOpDict)
+
+        # Numpy shapes (incl. batch/time ranks) of all leaves per `size` argument.
+        self.np_shapes = {}
+        self.record_dtype = None
+
+    def get_np_shapes(self, size=None):
+        """
+        Returns:
+            List[tuple]: The shapes (incl. batch/time ranks) of all leaves for a sample of the given `size` (see
+                `Space.sample`).
+        """
+        key = tuple(size) if isinstance(size, list) else size
+        shapes = self.np_shapes.get(key)
+        if shapes is None:
+            shapes = self.np_shapes[key] = [
+                leaf_space._get_np_shape(num_samples=size) or () for leaf_space in self.leaf_spaces
+            ]
+        return shapes
+
+    def get_record_dtype(self):
+        if self.record_dtype is None:
+            for key, dtype in zip(self.keys, self.dtypes):
+                if dtype.itemsize == 0:
+                    raise RLGraphError("ERROR: Cannot create a record dtype for field '{}' with variable-size dtype "
+                                       "{}!".format(key, dtype))
+            # Aligned, so that all field views have strides that are multiples of their itemsizes.
+            self.record_dtype = np.dtype(list(zip(self.keys, self.dtypes, self.shapes)), align=True)
+        return self.record_dtype
+
+    def to_records(self, samples, out=None):
+        leaves = self.get_leaves(samples)
+        if out is None:
+            out = np.empty(len(leaves[0]), dtype=self.get_record_dtype())
+        for key, leaf in zip(self.keys, leaves):
+            out[key] = leaf
+        return out
+
+    def from_records(self, records):
+        return self.build([records[key] for key in self.keys])
+
+    def sample(self, size=None):
+        return self.build([leaf_space.sample(size=size) for leaf_space in self.leaf_spaces])
+
+    def zeros(self, size=None):
+        return self.build_zeros([
+            np.zeros(shape, dtype=dtype) if dtype.kind in "biuf" else leaf_space.zeros(size=size)
+            for shape, dtype, leaf_space in zip(self.get_np_shapes(size), self.dtypes, self.leaf_spaces)
+        ])
+
+    def force_batch(self, samples):
+        """
+        Adds a batch rank (of size 1) to all leaves of `samples` that don't have one yet (without copying).
+        """
+        assert self.has_time_rank is False, "ERROR: Cannot force a batch rank if Space `has_time_rank` is True!"
+        batched = []
+        for leaf, shape in zip(self.get_leaves(samples), self.shapes):
+            array = np.asarray(leaf)
+            # 0D (means: certainly no batch rank) or no extra rank given (compared to this Space), add a batch rank.
+            if array.ndim == 0 or array.ndim == len(shape):
+                batched.append(array[np.newaxis])
+            # Samples is a list (whose len is interpreted as the batch size) -> return as np.array.
+            elif isinstance(leaf, list):
+                batched.append(array)
+            else:
+                batched.append(leaf)
+        return self.build(batched)
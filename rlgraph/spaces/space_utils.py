@@ -498,3 +498,140 @@ def is_bounded_space(box_space):
             "Semi-bounded spaces for distribution-generation are not supported yet! You passed in low={} high={}.".
             format(box_space.low, box_space.high)
         )
+
+
+def get_space_unbatcher(space):
+    """
+    Compiles a function that splits a batch of samples from `space` into a list of single samples, e.g. to hand
+    out the actions of a batched `get_action` call to the individual environments of a vector-env.
+    The Space's (possibly nested) container structure is resolved once here, so that the returned
+    function does not have to inspect the batch's structure on each call.
+
+    E.g. Dict(a=.., b=Tuple(.., ..)):
+        {'a': array([0, 1]), 'b': (array([2, 3]), array([4, 5]))} -> [{'a': 0, 'b': (2, 4)}, {'a': 1, 'b': (3, 5)}]
+
+    Args:
+        space (Space): The (container or primitive) Space whose samples should be unbatched.
+
+    Returns:
+        callable: A function taking a batch (nested container of np.ndarrays with batch rank) and returning a list
+            of single (non-batched) samples. A batch without batch rank (leaves have the rank of their Spaces) is
+            returned as a list with one item.
+    """
+    # Primitive Space: Iterating over the batch is all we need.
+    if not isinstance(space, (Dict, Tuple)):
+        def unbatch(batch):
+            return [batch] if np.ndim(batch) == space.rank else batch
+        return unbatch
+
+    get_leaves = get_space_leaf_getter(space)
+    build = get_space_leaf_builder(space)
+    # Dict and Tuple Spaces are dicts and tuples themselves.
+    first_leaf_rank = get_leaves(space)[0].rank
+
+    def unbatch(batch):
+        leaves = get_leaves(batch)
+        # No batch rank -> A single sample.
+        if np.ndim(leaves[0]) == first_leaf_rank:
+            return [build(leaves)]
+        return [build(single_leaves) for single_leaves in zip(*leaves)]
+    return unbatch
+
+
+def get_space_batcher(space):
+    """
+    Compiles the inverse of `get_space_unbatcher`: A function that merges a list of single samples from `space`
+    into one batch (same container structure as `space`, but with np.ndarrays with batch rank as leaves).
+
+    Args:
+        space (Space): The (container or primitive) Space whose samples should be batched.
+
+    Returns:
+        callable: A function taking a list of single samples and returning the batch (with the Space's dtypes). An
+            empty list results in a batch of size 0 (with the Space's shapes).
+    """
+    if not isinstance(space, (Dict, Tuple)):
+        dtype = convert_dtype(space.dtype, "np")
+
+        def batch_primitive(samples):
+            return np.asarray(samples, dtype=dtype) if len(samples) > 0 else space.zeros(size=0)
+        return batch_primitive
+
+    get_leaves = get_space_leaf_getter(space)
+    build = get_space_leaf_builder(space)
+    empty_leaves = get_leaves(space.zeros(size=0))
+    dtypes = [convert_dtype(leaf_space.dtype, "np") for leaf_space in get_leaves(space)]
+
+    def batch(samples):
+        if len(samples) == 0:
+            return build(empty_leaves)
+        return build([np.asarray(column, dtype=dtype) for column, dtype in
+                      zip(zip(*[get_leaves(sample) for sample in samples]), dtypes)])
+    return batch
+
+
+def get_space_leaf_getter(space):
+    """
+    Returns a function that extracts the leaves of a (nested) container sample of `space` as a flat list
+    (in the same order as `space.flatten()`).
+    """
+    if isinstance(space, Dict):
+        keys = sorted(space.keys())
+        # Fast path: No further nesting.
+        if not any(isinstance(space[key], (Dict, Tuple)) for key in keys):
+            return lambda sample: [sample[key] for key in keys]
+        getters = [(key, get_space_leaf_getter(space[key])) for key in keys]
+    elif isinstance(space, Tuple):
+        if not any(isinstance(sub_space, (Dict, Tuple)) for sub_space in space):
+            return list
+        getters = [(i, get_space_leaf_getter(sub_space)) for i, sub_space in enumerate(space)]
+    else:
+        return lambda sample: [sample]
+
+    def get_leaves(sample):
+        leaves = []
+        for key, getter in getters:
+            leaves.extend(getter(sample[key]))
+        return leaves
+    return get_leaves
+
+
+def get_space_leaf_builder(space, dict_class=dict):
+    """
+    Returns a function that re-assembles the (nested) container structure of `space` from a flat list of leaves
+    (as returned by the function from `get_space_leaf_getter`).
+
+    Args:
+        space (Space): The Space whose structure to re-assemble.
+        dict_class (type): The dict type to build for Dict (sub-)Spaces.
+    """
+    return _compile_leaf_builder(space, 0, dict_class)[0]
+
+
+def _compile_leaf_builder(space, start, dict_class=dict):
+    """
+    Returns a function that re-assembles the container structure of `space` from a flat list of leaves,
+    plus the index of the first leaf not used by `space`.
+    """
+    if isinstance(space, Dict):
+        keys = sorted(space.keys())
+        builders = []
+        end = start
+        for key in keys:
+            builder, end = _compile_leaf_builder(space[key], end, dict_class)
+            builders.append((key, builder))
+        # Fast path: No further nesting.
+        if not any(isinstance(space[key], (Dict, Tuple)) for key in keys):
+            return (lambda leaves: dict_class(zip(keys, leaves[start:end]))), end
+        return (lambda leaves: dict_class((key, builder(leaves)) for key, builder in builders)), end
+    elif isinstance(space, Tuple):
+        builders = []
+        end = start
+        for sub_space in space:
+            builder, end = _compile_leaf_builder(sub_space, end, dict_class)
+            builders.append(builder)
+        if not any(isinstance(sub_space, (Dict, Tuple)) for sub_space in space):
+            return (lambda leaves: tuple(leaves[start:end])), end
+        return (lambda leaves: tuple(builder(leaves) for builder in builders)), end
+    else:
+        return (lambda leaves: leaves[start]), start + 1
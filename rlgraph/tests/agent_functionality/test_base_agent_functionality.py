@@ -18,9 +18,12 @@ from __future__ import division
 from __future__ import print_function
 
 import logging
+import time
 import unittest
 
-from rlgraph.agents import Agent, PPOAgent
+import numpy as np
+
+from rlgraph.agents import Agent, InferenceAgent, PPOAgent
 from rlgraph.environments import GridWorld, OpenAIGymEnv
 from rlgraph.tests.test_util import config_from_path, recursive_assert_almost_equal
 from rlgraph.utils import root_logger
@@ -102,3 +105,172 @@ class TestBaseAgentFunctionality(unittest.TestCase):
         self.assertGreater(build_times["op_creation"], 0.0)
         self.assertGreater(build_times["var_creation"], 0.0)
         self.assertGreater(build_times["total_build_time"], build_times["build_overhead"])
+
+    def test_build_profiler(self):
+        """
+        Tests the opt-in build profiler's per-phase and per-Component breakdown.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent_config["execution_spec"]["profile_build"] = True
+        agent = Agent.from_spec(
+            agent_config,
+            state_space=env.state_space,
+            action_space=env.action_space
+        )
+        report = agent.graph_builder.build_profiler.report()
+        self.assertGreater(report["build"]["total_build_time"], 0.0)
+        self.assertEqual(report["build"]["num_components"], len(agent.root_component.get_all_sub_components()))
+        for phase in ["meta_graph", "input_spaces", "variables", "graph_fns", "space_inference"]:
+            self.assertGreater(report["phases"][phase], 0.0)
+        # Components are sorted by their total build time.
+        totals = [component["total"] for component in report["components"]]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+        self.assertGreater(sum(component["graph_fn_calls"] for component in report["components"]), 0)
+
+        # Off by default.
+        del agent_config["execution_spec"]["profile_build"]
+        agent = Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        self.assertIsNone(agent.graph_builder.build_profiler)
+
+    def test_inference_agent_weights_and_actions(self):
+        """
+        Tests an acting-only InferenceAgent built from a learner's config: Weights can be synced from the learner
+        and (greedy) actions match the learner's.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent = Agent.from_spec(
+            agent_config,
+            state_space=env.state_space,
+            action_space=env.action_space
+        )
+        agent_config["state_space"] = env.state_space
+        agent_config["action_space"] = env.action_space
+        inference_agent = InferenceAgent.from_agent_config(agent_config)
+        self.assertEqual(inference_agent.name, agent.name)
+        self.assertNotIn("replay-memory", inference_agent.root_component.sub_components)
+
+        weights = agent.get_weights()["policy_weights"]
+        new_weights = {}
+        for key, weight in weights.items():
+            new_weights[key] = weight + 0.01
+        agent.set_weights(new_weights)
+        inference_agent.set_weights(new_weights)
+        recursive_assert_almost_equal(inference_agent.get_weights()["policy_weights"], new_weights)
+
+        states = [env.state_space.sample() for _ in range(4)]
+        recursive_assert_almost_equal(
+            inference_agent.get_action(states, use_exploration=False),
+            agent.get_action(states, use_exploration=False)
+        )
+
+    def test_coalesced_inserts_of_env_buffers(self):
+        """
+        Tests that flushed buffers of different envs are collected and inserted with one graph call once
+        `insert_batch_size` is reached, keeping each env's records contiguous and in order.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent_config["observe_spec"] = dict(buffer_size=3, insert_batch_size=4)
+        agent = Agent.from_spec(
+            agent_config,
+            state_space=env.state_space,
+            action_space=env.action_space
+        )
+        # Record the graph inserts.
+        inserts = []
+
+        def record_inserts(**kwargs):
+            inserts.append(dict(rewards=np.array(kwargs["rewards"]), terminals=np.array(kwargs["terminals"])))
+        agent._observe_graph = record_inserts
+
+        state = np.array([1.0, 0.0, 0.0, 0.0])
+        for env_id, reward, terminal in [("env_0", 0.0, False), ("env_0", 1.0, True), ("env_1", 2.0, True),
+                                         ("env_0", 3.0, False)]:
+            agent.observe(state, 0, [], reward, state, terminal, env_id=env_id)
+        # Only the env_0 and env_1 episodes are pending.
+        self.assertEqual(len(inserts), 0)
+
+        agent.observe(state, 0, [], 4.0, state, True, env_id="env_0")
+        self.assertEqual(len(inserts), 1)
+        recursive_assert_almost_equal(inserts[0]["rewards"], np.array([0.0, 1.0, 2.0, 3.0, 4.0]))
+        recursive_assert_almost_equal(inserts[0]["terminals"], np.array([False, True, True, False, True]))
+
+        # Explicit flush of the remaining pending records (none left).
+        agent.flush_pending_inserts()
+        self.assertEqual(len(inserts), 1)
+
+        # Updates, resets and terminating insert all pending records first.
+        events = []
+
+        def record_execute(*api_method_calls):
+            events.extend(call[0] if isinstance(call, tuple) else call for call in api_method_calls if call)
+            return None, 0.0, 0.0
+        agent._observe_graph = lambda **kwargs: events.append("insert_records")
+        agent.graph_executor.execute = record_execute
+        for method in [agent.update, agent.reset, agent.terminate]:
+            del events[:]
+            agent.observe(state, 0, [], 5.0, state, True, env_id="env_0")
+            self.assertEqual(len(events), 0)
+            method()
+            self.assertEqual(events[0], "insert_records")
+            self.assertEqual(events.count("insert_records"), 1)
+            if method == agent.update:
+                self.assertEqual(events[1], "update_from_memory")
+
+    def test_coalesced_inserts_must_fit_into_memory(self):
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        # Memory capacity is 6.
+        agent_config["observe_spec"] = dict(buffer_size=3, insert_batch_size=5)
+        self.assertRaises(
+            AssertionError, Agent.from_spec, agent_config, state_space=env.state_space, action_space=env.action_space
+        )
+
+    def test_api_metrics(self):
+        """
+        Tests per API-method call counts, latencies and batch sizes recorded by the graph executor.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent = Agent.from_spec(
+            agent_config,
+            state_space=env.state_space,
+            action_space=env.action_space
+        )
+        executor = agent.graph_executor
+        executor.reset_api_metrics()
+
+        agent.get_action(np.array([0, 1, 0]))
+        agent.get_action(np.array([1]))
+        agent.get_weights()
+
+        metrics = executor.get_api_metrics()
+        action_metrics = metrics["get_preprocessed_state_and_action"]
+        self.assertEqual(action_metrics["calls"], 2)
+        self.assertEqual(action_metrics["mean_batch_size"], 2.0)
+        self.assertEqual(action_metrics["max_batch_size"], 3)
+        self.assertGreater(action_metrics["mean"], 0.0)
+        self.assertLessEqual(action_metrics["p50"], action_metrics["p99"])
+        self.assertLessEqual(action_metrics["p99"], action_metrics["max"])
+        self.assertEqual(metrics["get_weights"]["calls"], 1)
+
+        # Several API-methods executed together are recorded as one call.
+        executor.execute("sync_target_qnet", "get_weights")
+        metrics = executor.get_api_metrics()
+        self.assertEqual(metrics["sync_target_qnet+get_weights"]["calls"], 1)
+        self.assertEqual(metrics["get_weights"]["calls"], 1)
+        self.assertNotIn("sync_target_qnet", metrics)
+
+        # API-methods given as callables (e.g. `root_component.insert_records`) are recorded by name.
+        start = time.perf_counter()
+        executor.record_api_calls(((agent.root_component.get_weights, None),), start)
+        executor.record_api_calls((agent.root_component.sync_target_qnet, ("get_weights", None)), start)
+        metrics = executor.get_api_metrics()
+        self.assertEqual(metrics["get_weights"]["calls"], 2)
+        self.assertEqual(metrics["sync_target_qnet+get_weights"]["calls"], 2)
+
+        csv_lines = executor.export_api_metrics_csv().splitlines()
+        self.assertEqual(csv_lines[0].split(",")[:3], ["api_method", "calls", "total"])
+        self.assertEqual(len(csv_lines), len(metrics) + 1)
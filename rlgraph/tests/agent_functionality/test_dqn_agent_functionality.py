@@ -18,6 +18,8 @@ from __future__ import division
 from __future__ import print_function
 
 import logging
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -28,7 +30,7 @@ from rlgraph.components.loss_functions.dqn_loss_function import DQNLossFunction
 from rlgraph.environments import GridWorld
 from rlgraph.execution.single_threaded_worker import SingleThreadedWorker
 from rlgraph.tests.agent_test import AgentTest
-from rlgraph.tests.test_util import config_from_path
+from rlgraph.tests.test_util import config_from_path, recursive_assert_almost_equal
 from rlgraph.utils import root_logger, one_hot
 
 
@@ -39,6 +41,66 @@ class TestDQNAgentFunctionality(unittest.TestCase):
     """
     root_logger.setLevel(level=logging.DEBUG)
 
+    def test_get_action_through_session_callables(self):
+        """
+        Tests that acting through cached session callables (default for the acting API-methods) returns
+        the same actions as regular session runs.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent = Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        # Same (constant) weight initializers.
+        agent_config["execution_spec"]["callable_api_methods"] = []
+        agent_no_callables = Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+
+        states = [env.state_space.sample() for _ in range(3)]
+        for _ in range(2):
+            actions, preprocessed_states = agent.get_action(
+                states, use_exploration=False, extra_returns="preprocessed_states"
+            )
+            expected_actions, expected_preprocessed_states = agent_no_callables.get_action(
+                states, use_exploration=False, extra_returns="preprocessed_states"
+            )
+            recursive_assert_almost_equal(actions, expected_actions)
+            recursive_assert_almost_equal(preprocessed_states, expected_preprocessed_states)
+            recursive_assert_almost_equal(
+                agent.get_action(states[0], use_exploration=False),
+                agent_no_callables.get_action(states[0], use_exploration=False)
+            )
+
+        # One cached callable per return-op set.
+        self.assertEqual(len(agent.graph_executor.api_callables), 2)
+        self.assertEqual(len(agent_no_callables.graph_executor.api_callables), 0)
+
+    def test_graph_build_cache(self):
+        """
+        Tests that a second build with the same settings imports the cached graph and behaves like the built one.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent_config["execution_spec"]["build_cache"] = dict(directory=tempfile.mkdtemp())
+        agent = Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        self.assertEqual(len(os.listdir(agent_config["execution_spec"]["build_cache"]["directory"])), 1)
+        self.assertIsNone(agent.graph_executor.cached_init_variables)
+
+        cached_agent = Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        self.assertIsNotNone(cached_agent.graph_executor.cached_init_variables)
+
+        # Same weights and greedy actions after syncing.
+        cached_agent.set_weights(agent.get_weights()["policy_weights"])
+        recursive_assert_almost_equal(
+            cached_agent.get_weights()["policy_weights"], agent.get_weights()["policy_weights"]
+        )
+        states = [env.state_space.sample() for _ in range(3)]
+        recursive_assert_almost_equal(
+            cached_agent.get_action(states, use_exploration=False), agent.get_action(states, use_exploration=False)
+        )
+
+        # Different settings -> No cache hit.
+        agent_config["update_spec"]["batch_size"] += 1
+        other_agent = Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        self.assertIsNone(other_agent.graph_executor.cached_init_variables)
+
     def test_dqn_functionality(self):
         """
         Creates a DQNAgent and runs it for a few steps in a GridWorld to vigorously test
@@ -104,7 +166,7 @@ class TestDQNAgentFunctionality(unittest.TestCase):
         # Also check the policy and target policy values (Should be equal at this point).
         test.step(1)
         test.check_env("state", 0)
-        test.check_agent("states_buffer", [], key_or_index="env_0")
+        test.check_agent("states_buffer", np.zeros(shape=(0, 4)), key_or_index="env_0")
         test.check_agent("actions_buffer", [], key_or_index="env_0")
         test.check_agent("rewards_buffer", [], key_or_index="env_0")
         test.check_agent("terminals_buffer", [], key_or_index="env_0")
@@ -126,7 +188,7 @@ class TestDQNAgentFunctionality(unittest.TestCase):
         # Expect an update to the policy variables (leave target as is (no sync yet)).
         test.step(2, use_exploration=True)
         test.check_env("state", 0)
-        test.check_agent("states_buffer", [], key_or_index="env_0")
+        test.check_agent("states_buffer", np.zeros(shape=(0, 4)), key_or_index="env_0")
         test.check_agent("actions_buffer", [], key_or_index="env_0")
         test.check_agent("rewards_buffer", [], key_or_index="env_0")
         test.check_agent("terminals_buffer", [], key_or_index="env_0")
@@ -166,7 +228,7 @@ class TestDQNAgentFunctionality(unittest.TestCase):
         # action: down (2) (weights have been updated -> different actions)
         test.step(1)
         test.check_env("state", 3)
-        test.check_agent("states_buffer", [], key_or_index="env_0")  # <- all empty b/c we reached end of episode (buffer gets force-flushed)
+        test.check_agent("states_buffer", np.zeros(shape=(0, 4)), key_or_index="env_0")  # <- all empty b/c we reached end of episode (buffer gets force-flushed)
         test.check_agent("actions_buffer", [], key_or_index="env_0")
         test.check_agent("rewards_buffer", [], key_or_index="env_0")
         test.check_agent("terminals_buffer", [], key_or_index="env_0")
@@ -187,7 +249,7 @@ class TestDQNAgentFunctionality(unittest.TestCase):
         # action: up, down (0, 2)
         test.step(2, use_exploration=True)
         test.check_env("state", 1)
-        test.check_agent("states_buffer", [], key_or_index="env_0")  # <- all empty again; flushed after 6th step (when buffer was full).
+        test.check_agent("states_buffer", np.zeros(shape=(0, 4)), key_or_index="env_0")  # <- all empty again; flushed after 6th step (when buffer was full).
         test.check_agent("actions_buffer", [], key_or_index="env_0")
         test.check_agent("rewards_buffer", [], key_or_index="env_0")
         test.check_agent("terminals_buffer", [], key_or_index="env_0")
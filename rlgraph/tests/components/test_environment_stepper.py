@@ -91,6 +91,49 @@ class TestEnvironmentStepper(unittest.TestCase):
         # Make sure we close the session (to shut down the Env on the server).
         test.terminate()
 
+    def test_environment_stepper_on_many_deterministic_envs(self):
+        preprocessor_spec = None
+        network_spec = config_from_path("configs/test_simple_nn.json")
+        exploration_spec = None
+        actor_component = ActorComponent(
+            preprocessor_spec,
+            dict(network_spec=network_spec, action_space=self.deterministic_env_action_space),
+            exploration_spec
+        )
+        environment_stepper = EnvironmentStepper(
+            environment_spec=dict(type="deterministic_env", steps_to_terminal=5),
+            actor_component_spec=actor_component,
+            state_space=self.deterministic_env_state_space,
+            reward_space="float32",
+            add_reward=True,
+            num_steps=3,
+            num_environments=4
+        )
+
+        test = ComponentTest(
+            component=environment_stepper,
+            action_space=self.deterministic_env_action_space,
+        )
+
+        # Step 3 times through all 4 Envs at once (outputs are time x env x ...).
+        expected = (
+            np.array([[False] * 4] * 3),  # t_
+            np.array([[[0.0]] * 4, [[1.0]] * 4, [[2.0]] * 4, [[3.0]] * 4]),  # s' (raw)
+            np.array([[-100.0] * 4, [-99.0] * 4, [-98.0] * 4])  # r
+        )
+        test.test("step", expected_outputs=expected)
+
+        # Step again, check whether stitching of states/etc.. works.
+        expected = (
+            np.array([[False] * 4, [True] * 4, [False] * 4]),  # t_
+            np.array([[[3.0]] * 4, [[4.0]] * 4, [[0.0]] * 4, [[1.0]] * 4]),  # s' (raw)
+            np.array([[-97.0] * 4, [-96.0] * 4, [-100.0] * 4])  # r
+        )
+        test.test("step", expected_outputs=expected)
+
+        # Make sure we close the session (to shut down the Envs on the server).
+        test.terminate()
+
     def test_environment_stepper_on_2x2_grid_world(self):
         preprocessor_spec = [dict(
             type="reshape", flatten=True, flatten_categories=self.grid_world_2x2_action_space.num_categories
@@ -24,7 +24,8 @@ import cv2
 import numpy as np
 
 from rlgraph.components.layers import GrayScale, ReShape, Multiply, Divide, Clip, ImageBinary, ImageResize, ImageCrop, \
-    MovingStandardize
+    ImagePipeline, MovingStandardize
+from rlgraph.components.layers.preprocessing.moving_standardize import merge_statistics
 from rlgraph.environments import OpenAIGymEnv
 from rlgraph.spaces import *
 from rlgraph.tests import ComponentTest, recursive_assert_almost_equal
@@ -219,6 +220,34 @@ class TestPreprocessLayers(unittest.TestCase):
         out = image_crop._graph_fn_call(input_image)
         recursive_assert_almost_equal(out, expected)
 
+    def test_python_image_pipeline(self):
+        space = IntBox(256, shape=(16, 16, 3), dtype="uint8", add_batch_rank=True)
+        input_ = space.sample(size=5)
+
+        # Expected: The single (unfused) cv2 ops applied to each image.
+        expected = np.asarray([
+            cv2.resize(
+                cv2.cvtColor(np.ascontiguousarray(image[1:13, 7:15]), cv2.COLOR_RGB2GRAY), dsize=(4, 6),
+                interpolation=cv2.INTER_AREA
+            ) for image in input_
+        ])
+
+        for num_threads in [1, 3]:
+            image_pipeline = ImagePipeline(
+                crop=dict(x=7, y=1, width=8, height=12), grayscale=True, keep_rank=True, width=4, height=6,
+                dtype="float32", num_threads=num_threads, backend="python"
+            )
+            image_pipeline.create_variables(input_spaces=dict(inputs=space))
+            self.assertEqual(image_pipeline.output_spaces[""].shape, (6, 4, 1))
+
+            out = image_pipeline._graph_fn_call(input_)
+            self.assertEqual(out.dtype, np.float32)
+            recursive_assert_almost_equal(out, expected[:, :, :, np.newaxis].astype(np.float32))
+
+            # Single image.
+            out = image_pipeline._graph_fn_call(input_[0])
+            recursive_assert_almost_equal(out, expected[0, :, :, np.newaxis].astype(np.float32))
+
     def test_black_and_white(self):
         binary = ImageBinary()
         # Color image of 2x2x3 size.
@@ -236,6 +265,57 @@ class TestPreprocessLayers(unittest.TestCase):
         ])
         test.test(("call", input_images), expected_outputs=expected)
 
+    def test_moving_standardize_python_with_batch_position_reset(self):
+        space = FloatBox(shape=(3,), add_batch_rank=True)
+        moving_standardize = MovingStandardize(batch_size=2, backend="python")
+        moving_standardize.create_variables(input_spaces=dict(inputs=space), action_space=None)
+
+        samples = [space.sample(size=2) for _ in range(20)]
+        for sample in samples:
+            moving_standardize._graph_fn_call(sample)
+        # Each batch position keeps its own statistics.
+        self.assertTrue(np.allclose(moving_standardize.mean_est, np.mean(samples, axis=0), atol=1e-5))
+
+        # Reset the statistics of position 0 only.
+        moving_standardize.reset_batch_positions([0])
+        new_samples = [space.sample(size=2) for _ in range(5)]
+        for sample in new_samples:
+            moving_standardize._graph_fn_call(sample)
+        expected_mean = np.mean(samples + new_samples, axis=0)
+        expected_mean[0] = np.mean(new_samples, axis=0)[0]
+        self.assertTrue(np.allclose(moving_standardize.mean_est, expected_mean, atol=1e-5))
+        self.assertTrue(np.allclose(moving_standardize.sample_count, [5.0, 25.0]))
+
+    def test_moving_standardize_python_merge_statistics(self):
+        space = FloatBox(shape=(3,), add_batch_rank=True)
+        # Two workers: One stepping 2 envs at once, one standardizing whole batches of 10 states.
+        workers = [MovingStandardize(batch_size=2, backend="python"), MovingStandardize(backend="python")]
+        for worker in workers:
+            worker.create_variables(input_spaces=dict(inputs=space), action_space=None)
+
+        samples = [[space.sample(size=2) for _ in range(20)], [space.sample(size=10) for _ in range(3)]]
+        for worker, worker_samples in zip(workers, samples):
+            for sample in worker_samples:
+                worker._graph_fn_call(sample)
+        # The batched update matches numpy's statistics.
+        self.assertTrue(np.allclose(workers[1].mean_est[0], np.mean(np.concatenate(samples[1]), axis=0), atol=1e-5))
+
+        statistics = merge_statistics(*[worker.pop_statistics() for worker in workers])
+        all_samples = np.concatenate([np.concatenate(worker_samples) for worker_samples in samples])
+        self.assertEqual(statistics["count"], 70)
+        self.assertTrue(np.allclose(statistics["mean"], np.mean(all_samples, axis=0), atol=1e-5))
+        self.assertTrue(np.allclose(statistics["m2"] / 69, np.var(all_samples, axis=0, ddof=1), atol=1e-5))
+        # Statistics are popped only once.
+        self.assertEqual(workers[0].pop_statistics()["count"], 0.0)
+
+        # Both workers standardize with the merged statistics (plus their new samples).
+        for worker in workers:
+            worker.set_statistics(statistics)
+        sample = space.sample(size=1)
+        all_samples = np.concatenate([all_samples, sample])
+        expected = (sample - np.mean(all_samples, axis=0)) / (np.std(all_samples, axis=0, ddof=1) + SMALL_NUMBER)
+        recursive_assert_almost_equal(workers[1]._graph_fn_call(sample), expected, decimals=4)
+
     def test_moving_standardize_python(self):
         env = OpenAIGymEnv("Pong-v0")
         space = env.state_space
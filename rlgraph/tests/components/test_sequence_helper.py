@@ -191,3 +191,40 @@ class TestSequenceHelper(unittest.TestCase):
             ("reverse_apply_decays_to_sequence", [td_errors, indices, decay_value]),
             expected_outputs=expected_output_sequence_manual
         )
+
+    def test_long_sequences_with_many_sub_sequences(self):
+        """
+        Tests boot-strapping and reverse decaying on a long batch with many (terminal and non-terminal)
+        sub-sequences against the sequential reference implementations.
+        """
+        sequence_helper = SequenceHelper()
+        discount = 0.99
+        decay_value = 0.95
+
+        test = ComponentTest(component=sequence_helper, input_spaces=self.input_spaces)
+
+        size = 1000
+        values = np.random.random(size=size)
+        rewards = np.random.random(size=size)
+        sequence_indices = np.random.random(size=size) < 0.05
+        sequence_indices[-1] = True
+        terminals = np.logical_and(sequence_indices, np.random.random(size=size) < 0.5)
+
+        expected_deltas = self.deltas(values, rewards, discount, terminals, sequence_indices)
+        deltas = test.test(("bootstrap_values", [rewards, values, terminals, sequence_indices]))
+        recursive_assert_almost_equal(expected_deltas, deltas, decimals=4)
+
+        ends = np.where(sequence_indices)[0]
+        expected_decayed = np.concatenate([
+            self.decay_td_sequence(expected_deltas[start:end + 1], decay=decay_value)
+            for start, end in zip(np.concatenate([[0], ends[:-1] + 1]), ends)
+        ])
+        test.test(
+            ("reverse_apply_decays_to_sequence", [expected_deltas, sequence_indices, decay_value]),
+            expected_outputs=expected_decayed, decimals=4
+        )
+
+        lengths, decays = test.test(("calc_sequence_decays", [sequence_indices, decay_value]))
+        recursive_assert_almost_equal(lengths, np.diff(np.concatenate([[-1], ends])))
+        expected_decays = np.concatenate([decay_value ** np.arange(length) for length in lengths])
+        recursive_assert_almost_equal(decays, expected_decays, decimals=4)
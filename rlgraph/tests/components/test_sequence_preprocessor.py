@@ -101,6 +101,36 @@ class TestSequencePreprocessor(unittest.TestCase):
                 out, np.asarray([[[1.1, 1.11, 10]], [[2.2, 2.22, 20]], [[3.3, 3.33, 30]], [[4.4, 4.44, 40]]])
             )
 
+    def test_python_sequence_preprocessor_batch_position_reset(self):
+        space = FloatBox(shape=(1,), add_batch_rank=True)
+        sequencer = Sequence(sequence_length=2, batch_size=2, add_rank=True, backend="python")
+        sequencer.create_variables(input_spaces=dict(inputs=space))
+
+        sequencer._graph_fn_reset()
+        sequencer._graph_fn_call(np.asarray([[1.0], [2.0]]))
+        out = sequencer._graph_fn_call(np.asarray([[1.1], [2.2]]))
+        recursive_assert_almost_equal(out, np.asarray([[[1.0, 1.1]], [[2.0, 2.2]]]))
+
+        # Only reset the 2nd batch position (e.g. env 1's episode ended).
+        sequencer.reset_batch_positions([1])
+        out = sequencer._graph_fn_call(np.asarray([[1.11], [5.0]]))
+        recursive_assert_almost_equal(out, np.asarray([[[1.1, 1.11]], [[5.0, 5.0]]]))
+        out = sequencer._graph_fn_call(np.asarray([[1.111], [5.5]]))
+        recursive_assert_almost_equal(out, np.asarray([[[1.11, 1.111]], [[5.0, 5.5]]]))
+
+    def test_python_sequence_preprocessor_without_rank(self):
+        space = FloatBox(shape=(2,), add_batch_rank=True)
+        sequencer = Sequence(sequence_length=3, batch_size=2, add_rank=False, backend="python")
+        sequencer.create_variables(input_spaces=dict(inputs=space))
+
+        sequencer._graph_fn_reset()
+        first = sequencer._graph_fn_call(np.asarray([[1.0, 2.0], [3.0, 4.0]]))
+        recursive_assert_almost_equal(first, np.asarray([[1.0, 2.0] * 3, [3.0, 4.0] * 3]))
+        out = sequencer._graph_fn_call(np.asarray([[5.0, 6.0], [7.0, 8.0]]))
+        recursive_assert_almost_equal(out, np.asarray([[1.0, 2.0, 1.0, 2.0, 5.0, 6.0], [3.0, 4.0, 3.0, 4.0, 7.0, 8.0]]))
+        # Returned sequences are not overwritten by later inputs.
+        recursive_assert_almost_equal(first, np.asarray([[1.0, 2.0] * 3, [3.0, 4.0] * 3]))
+
     def test_sequence_preprocessor_with_batch(self):
         space = FloatBox(shape=(2,), add_batch_rank=True)
         sequencer = Sequence(sequence_length=2, batch_size=3, add_rank=True)
@@ -19,7 +19,9 @@ from __future__ import print_function
 
 import logging
 import unittest
+from unittest import mock
 
+from rlgraph.graphs.graph_builder import GraphBuilder
 from rlgraph.tests import ComponentTest
 from rlgraph.utils import root_logger
 from rlgraph.tests.dummy_components import *
@@ -152,6 +154,24 @@ class TestAPIMethods(unittest.TestCase):
         # Expected: (1): 2*in + 10
         test.test(("run", 1.1), expected_outputs=12.2, decimals=4)
 
+    def test_each_graph_fn_column_called_once(self):
+        a = DummyCallingSubComponentsAPIFromWithinGraphFn(scope="A")
+        run_through_graph_fn = GraphBuilder.run_through_graph_fn_with_device_and_scope
+        with mock.patch.object(GraphBuilder, "run_through_graph_fn_with_device_and_scope", autospec=True,
+                               side_effect=run_through_graph_fn) as mocked:
+            test = ComponentTest(component=a, input_spaces=dict(input_=float))
+
+        called_columns = [call[0][1] for call in mocked.call_args_list]
+        self.assertEqual(len(called_columns), len(set(called_columns)))
+        # All graph_fn columns have been called.
+        for component in a.get_all_sub_components():
+            for graph_fn_rec in component.graph_fns.values():
+                for column in graph_fn_rec.in_op_columns:
+                    self.assertTrue(column.already_sent)
+                    self.assertIn(column, called_columns)
+
+        test.test(("run", 1.1), expected_outputs=12.2, decimals=4)
+
     def test_component_that_defines_custom_api_methods(self):
         a = DummyThatDefinesCustomAPIMethod()
 
@@ -0,0 +1,97 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import unittest
+
+from rlgraph.components.layers.nn.dense_layer import DenseLayer
+from rlgraph.graphs.graph_build_cache import GraphBuildCache
+from rlgraph.spaces import FloatBox
+
+
+class Settings(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class TestGraphBuildCache(unittest.TestCase):
+    """
+    Tests the (backend-independent) cache keys of GraphBuildCache.
+    """
+    input_spaces = dict(inputs=FloatBox(shape=(4,), add_batch_rank=True))
+
+    def get_key(self, component, **build_settings):
+        return GraphBuildCache.get_key(component, self.input_spaces, **build_settings)
+
+    def test_same_settings_same_key(self):
+        key = self.get_key(DenseLayer(units=3, scope="dense"), batch_size=32)
+        self.assertIsNotNone(key)
+        self.assertEqual(key, self.get_key(DenseLayer(units=3, scope="dense"), batch_size=32))
+
+    def test_different_settings_different_keys(self):
+        key = self.get_key(DenseLayer(units=3, scope="dense"), batch_size=32)
+        self.assertNotEqual(key, self.get_key(DenseLayer(units=4, scope="dense"), batch_size=32))
+        self.assertNotEqual(key, self.get_key(DenseLayer(units=3, scope="dense"), batch_size=64))
+        self.assertNotEqual(key, GraphBuildCache.get_key(
+            DenseLayer(units=3, scope="dense"), dict(inputs=FloatBox(shape=(5,), add_batch_rank=True)), batch_size=32
+        ))
+
+    def test_object_valued_settings_do_not_collide(self):
+        """
+        Settings held in arbitrary objects or callables must be part of the key as well.
+        """
+        keys = set()
+        for settings in [Settings(1), Settings(2), Settings([1, 2]), abs, len]:
+            layer = DenseLayer(units=3, scope="dense")
+            layer.settings = settings
+            keys.add(self.get_key(layer))
+        self.assertEqual(len(keys), 5)
+
+        # Sub-Components: Referenced by scope, fingerprinted separately.
+        layer = DenseLayer(units=3, scope="dense")
+        layer.add_components(DenseLayer(units=2, scope="sub"))
+        other_layer = DenseLayer(units=3, scope="dense")
+        other_layer.add_components(DenseLayer(units=5, scope="sub"))
+        self.assertNotEqual(self.get_key(layer), self.get_key(other_layer))
+
+    def test_code_changes_change_key(self):
+        """
+        Callables differing only in their constants or closures, and Component classes differing only in their
+        code must not collide.
+        """
+        keys = set()
+        factor = 0.5
+        for settings in [lambda x: x * 0.5, lambda x: x * 0.9, lambda x: x * factor]:
+            layer = DenseLayer(units=3, scope="dense")
+            layer.settings = settings
+            keys.add(self.get_key(layer))
+        factor = 0.9
+        keys.add(self.get_key(layer))
+        self.assertEqual(len(keys), 4)
+
+        # Classes without source (fall back to hashing their functions' code).
+        self.assertNotEqual(
+            self.get_key(type("ScaledDenseLayer", (DenseLayer,), dict(scale=lambda self, x: x * 0.5))(units=3)),
+            self.get_key(type("ScaledDenseLayer", (DenseLayer,), dict(scale=lambda self, x: x * 0.9))(units=3))
+        )
+
+    def test_unfingerprintable_settings_are_not_cached(self):
+        layer = DenseLayer(units=3, scope="dense")
+        layer.settings = Settings(threading.Lock())
+        self.assertIsNone(self.get_key(layer))
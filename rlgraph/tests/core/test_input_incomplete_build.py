@@ -44,6 +44,24 @@ class TestInputIncompleteTest(unittest.TestCase):
         else:
             raise RLGraphError("Not seeing expected RLGraphBuildError with input-incomplete model!")
 
+    def test_unresolved_report_of_blocked_build(self):
+        """
+        The graph_fn columns that could not be called (and why) are logged as a warning and added to the error.
+        """
+        a = DummyProducingInputIncompleteBuild(scope="A")
+        with self.assertLogs("rlgraph.graphs.graph_builder", level="WARNING") as logs:
+            with self.assertRaises(RLGraphBuildError) as context:
+                ComponentTest(component=a, input_spaces=dict(input_=float))
+
+        report = "\n".join(logs.output)
+        self.assertIn("1 uncalled graph_fn column(s)", report)
+        self.assertIn(
+            "in 'A/dummy-calling-one-api-from-within-other': Component input-incomplete (no Spaces for args "
+            "['inner_input'])", report
+        )
+        self.assertIn("circular dependency via API call arg 'inner_input'", str(context.exception))
+        self.assertIn("1 uncalled graph_fn column(s)", str(context.exception))
+
     def test_solution_of_inner_deadlock_of_component_with_must_be_complete_false(self):
         """
         Component can be built due to its sub-component resolving a deadlock with `must_be_complete`.
@@ -0,0 +1,59 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+
+from rlgraph.spaces import Dict, FloatBox, IntBox
+from rlgraph.tests.test_util import recursive_assert_almost_equal
+from rlgraph.utils.observe_buffer import ObserveBuffer
+
+
+class TestObserveBuffer(unittest.TestCase):
+    """
+    Tests the preallocated per-env numpy buffers used by `Agent.observe`.
+    """
+    def test_observe_buffer_in_place_writes_and_views(self):
+        """
+        Tests the preallocated per-env observe buffers with a container Space: Single and batched writes,
+        growth beyond the preallocated capacity and resets.
+        """
+        space = Dict(a=FloatBox(shape=(2,)), b=IntBox(3))
+        buffer = ObserveBuffer(space, capacity=2)
+
+        buffer.append("env_0", dict(a=np.array([1.0, 2.0]), b=2))
+        buffer.extend("env_0", dict(a=np.array([[3.0, 4.0], [5.0, 6.0]]), b=np.array([0, 1])))
+        buffer.append("env_1", dict(a=np.array([7.0, 8.0]), b=1))
+        self.assertEqual(buffer.size("env_0"), 3)
+        self.assertEqual(buffer.size("env_1"), 1)
+        recursive_assert_almost_equal(
+            buffer["env_0"], dict(a=np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]), b=np.array([2, 0, 1]))
+        )
+        recursive_assert_almost_equal(buffer["env_1"], dict(a=np.array([[7.0, 8.0]]), b=np.array([1])))
+
+        # Views write through into the buffer.
+        buffer["env_0"]["b"][-1] = 2
+        recursive_assert_almost_equal(buffer["env_0"]["b"], np.array([2, 0, 2]))
+
+        # Resets keep the storage, but start writing from the beginning.
+        buffer.reset("env_0")
+        self.assertEqual(buffer.size("env_0"), 0)
+        buffer.append("env_0", dict(a=np.array([9.0, 9.0]), b=0))
+        recursive_assert_almost_equal(buffer["env_0"], dict(a=np.array([[9.0, 9.0]]), b=np.array([0])))
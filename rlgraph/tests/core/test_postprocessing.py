@@ -0,0 +1,125 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+
+from rlgraph.components.helpers import GeneralizedAdvantageEstimation
+from rlgraph.components.helpers.v_trace_function import VTraceFunction
+from rlgraph.spaces import BoolBox, FloatBox
+from rlgraph.tests import ComponentTest, recursive_assert_almost_equal
+from rlgraph.utils import postprocessing
+from rlgraph.utils.numpy import one_hot, softmax
+
+
+class TestPostprocessing(unittest.TestCase):
+    """
+    Tests the numpy post-processing functions against the respective Components and sequential references.
+    """
+    @staticmethod
+    def sample_sequences(size, p_end=0.1, p_terminal=0.5):
+        sequence_indices = np.random.random(size=size) < p_end
+        sequence_indices[-1] = True
+        terminals = np.logical_and(sequence_indices, np.random.random(size=size) < p_terminal)
+        return terminals, sequence_indices
+
+    def test_gae_against_component(self):
+        gamma = 0.99
+        gae_lambda = 0.95
+        gae = GeneralizedAdvantageEstimation(gae_lambda=gae_lambda, discount=gamma)
+        test = ComponentTest(component=gae, input_spaces=dict(
+            rewards=FloatBox(add_batch_rank=True),
+            baseline_values=FloatBox(add_batch_rank=True),
+            terminals=BoolBox(add_batch_rank=True),
+            sequence_indices=BoolBox(add_batch_rank=True)
+        ))
+
+        size = 200
+        rewards = np.random.random(size=size)
+        baseline_values = np.random.random(size=size)
+        terminals, sequence_indices = self.sample_sequences(size)
+        input_ = [baseline_values, rewards, terminals, sequence_indices]
+
+        test.test(("calc_td_errors", input_), expected_outputs=postprocessing.td_errors(
+            baseline_values, rewards, terminals, sequence_indices, discount=gamma
+        ), decimals=4)
+        test.test(("calc_gae_values", input_), expected_outputs=postprocessing.generalized_advantage_estimation(
+            baseline_values, rewards, terminals, sequence_indices, discount=gamma, gae_lambda=gae_lambda
+        ), decimals=4)
+
+    def test_v_trace_against_component(self):
+        v_trace_function_reference = VTraceFunction(backend="python")
+
+        size = (20, 4)
+        logits_actions_pi = np.random.random(size=size + (3,))
+        log_probs_actions_mu = np.log(softmax(np.random.random(size=size + (3,))))
+        actions = np.random.randint(0, 3, size=size)
+        actions_flat = one_hot(actions, depth=3)
+        discounts = np.random.choice([0.0, 0.99], size=size + (1,), p=[0.2, 0.8])
+        rewards = np.random.random(size=size + (1,))
+        values = np.random.random(size=size + (1,))
+        bootstrapped_values = np.random.random(size=(1, size[1], 1))
+
+        vs_expected, pg_advantages_expected = v_trace_function_reference._graph_fn_calc_v_trace_values(
+            logits_actions_pi, log_probs_actions_mu, actions, actions_flat, discounts, rewards, values,
+            bootstrapped_values
+        )
+
+        log_is_weights = np.sum(
+            (np.log(softmax(logits_actions_pi)) - log_probs_actions_mu) * actions_flat, axis=-1, keepdims=True
+        )
+        vs, pg_advantages = postprocessing.v_trace(log_is_weights, discounts, rewards, values, bootstrapped_values)
+        recursive_assert_almost_equal(vs, vs_expected, decimals=5)
+        recursive_assert_almost_equal(pg_advantages, pg_advantages_expected, decimals=5)
+
+    def test_discounted_returns_and_n_step_targets(self):
+        gamma = 0.9
+        size = 100
+        rewards = np.random.random(size=size)
+        terminals, sequence_indices = self.sample_sequences(size)
+        bootstrap_values = np.random.random(size=size)
+
+        # Sequential reference.
+        expected_returns = np.zeros(size)
+        running_return = 0.0
+        for t in reversed(range(size)):
+            if sequence_indices[t]:
+                running_return = 0.0 if terminals[t] else bootstrap_values[t]
+            running_return = rewards[t] + gamma * running_return
+            expected_returns[t] = running_return
+        returns = postprocessing.discounted_returns(
+            rewards, terminals, gamma, sequence_indices=sequence_indices, bootstrap_values=bootstrap_values
+        )
+        recursive_assert_almost_equal(returns, expected_returns, decimals=5)
+
+        n_step = 3
+        n_step_rewards, last, n_step_terminals, discounts = postprocessing.n_step_targets(
+            rewards, terminals, gamma, n_step, sequence_indices=sequence_indices
+        )
+        for t in range(size):
+            expected_reward = 0.0
+            for k in range(n_step):
+                expected_reward += gamma ** k * rewards[t + k]
+                if sequence_indices[t + k]:
+                    break
+            self.assertEqual(last[t], t + k)
+            self.assertEqual(n_step_terminals[t], terminals[t + k])
+            self.assertAlmostEqual(discounts[t], gamma ** (k + 1))
+            self.assertAlmostEqual(n_step_rewards[t], expected_reward)
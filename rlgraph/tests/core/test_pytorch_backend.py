@@ -21,16 +21,25 @@ import logging
 import time
 import unittest
 
+from rlgraph import get_backend
 from rlgraph.agents import DQNAgent, ApexAgent
 from rlgraph.components import Policy, MemPrioritizedReplay
-from rlgraph.environments import OpenAIGymEnv
+from rlgraph.environments import GridWorld, OpenAIGymEnv
 from rlgraph.spaces import FloatBox, IntBox, Dict, BoolBox
 from rlgraph.tests import ComponentTest
 from rlgraph.tests.dummy_components import *
 from rlgraph.tests.dummy_components_with_sub_components import *
-from rlgraph.tests.test_util import config_from_path
+from rlgraph.tests.test_util import config_from_path, recursive_assert_almost_equal
 from rlgraph.utils import root_logger, softmax
-from rlgraph.utils.define_by_run_ops import print_call_chain
+from rlgraph.utils.define_by_run_ops import print_call_chain, define_by_run_flatten, define_by_run_unflatten, \
+    _define_by_run_flatten, _define_by_run_unflatten
+from rlgraph.utils.ops import DataOpDict, DataOpTuple
+from rlgraph.utils.util import force_torch_tensors
+
+if get_backend() == "pytorch":
+    import torch
+
+    from rlgraph.graphs.pytorch_executor import _to_numpy
 
 
 class TestPytorchBackend(unittest.TestCase):
@@ -238,6 +247,7 @@ class TestPytorchBackend(unittest.TestCase):
         agent_config = config_from_path("configs/ray_apex_for_pong.json")
         if get_backend() == "pytorch":
             agent_config["memory_spec"]["type"] = "mem_prioritized_replay"
+        agent_config["execution_spec"]["enable_profiler"] = True
         agent = DQNAgent.from_spec(
             # Uses 2015 DQN parameters as closely as possible.
             agent_config,
@@ -269,6 +279,141 @@ class TestPytorchBackend(unittest.TestCase):
         profile = Component.call_times
         print_call_chain(profile, False, 0.03)
 
+    def test_compiled_api_calls(self):
+        """
+        Tests that compiled (cached) API-calls return the same results as regular define-by-run calls.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent = DQNAgent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        executor = agent.graph_executor
+        states = np.array([env.state_space.sample() for _ in range(4)])
+
+        compiled_results = [agent.get_action(states, use_exploration=False, extra_returns="preprocessed_states")
+                            for _ in range(2)]
+        compiled_weights = agent.get_weights()
+        self.assertGreater(len(executor.compiled_api_calls), 0)
+
+        # Methods without return values add no results.
+        weights = compiled_weights["policy_weights"]
+        self.assertEqual(executor.execute(("set_weights", [weights])), [])
+
+        executor.compile_api_calls = False
+        results = agent.get_action(states, use_exploration=False, extra_returns="preprocessed_states")
+        for compiled_result in compiled_results:
+            recursive_assert_almost_equal(compiled_result, results)
+        recursive_assert_almost_equal(compiled_weights, agent.get_weights())
+        self.assertEqual(executor.execute(("set_weights", [weights])), [])
+
+    def test_zero_copy_conversions(self):
+        """
+        Tests zero-copy input params and results: Inputs share memory with the passed numpy arrays, fresh results
+        are returned as views, variables are copied.
+        """
+        states = np.random.random(size=(3, 4)).astype(np.float32)
+        tensor = force_torch_tensors([states], copy=False)[0]
+        states[0, 0] = 5.0
+        self.assertEqual(tensor[0, 0].item(), 5.0)
+        # Copies by default.
+        tensor = force_torch_tensors([states])[0]
+        states[0, 0] = 6.0
+        self.assertEqual(tensor[0, 0].item(), 5.0)
+        # Bool arrays are converted to uint8.
+        self.assertEqual(force_torch_tensors([np.array([True, False])], copy=False)[0].dtype, torch.uint8)
+
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent_config["execution_spec"]["zero_copy_inputs"] = True
+        agent = DQNAgent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        expected = agent.get_action(np.array([0, 1]), use_exploration=False)
+        weights = agent.get_weights()
+        weights_copy = {key: np.copy(value) for key, value in weights["policy_weights"].items()}
+        recursive_assert_almost_equal(agent.get_action(np.array([0, 1]), use_exploration=False), expected)
+        recursive_assert_almost_equal(agent.get_weights()["policy_weights"], weights_copy)
+
+    def test_to_numpy_results(self):
+        """
+        Tests that fresh results are returned as views, views into variables (leaves) as copies.
+        """
+        variable = torch.nn.Parameter(torch.zeros(3))
+        fresh = variable + 1.0
+        self.assertTrue(np.shares_memory(_to_numpy(fresh), fresh.detach().numpy()))
+        view = variable[:2]
+        array = _to_numpy(view)
+        with torch.no_grad():
+            variable.add_(1.0)
+        recursive_assert_almost_equal(array, np.zeros(2))
+
+    def test_cached_flatten_and_unflatten_layouts(self):
+        """
+        Tests that (un)flattening via cached layouts produces the same results as the uncached recursive versions,
+        also for differently ordered dicts and changing leaf values.
+        """
+        containers = [
+            dict(a=1, b=(2, dict(x=3, y=[4, 5])), c=dict(e=(6, 7), d=8)),
+            dict(c=dict(d=8, e=(6, 7)), b=(2, dict(y=[4, 5], x=3)), a=1),
+            (dict(b=1, a=2), 3),
+            dict(a=dict()),
+            DataOpDict({"/a": 1, "b": 2})
+        ]
+        for container in containers:
+            for scope_separator_at_start in [True, False]:
+                for _ in range(2):
+                    flat = define_by_run_flatten(container, scope_separator_at_start=scope_separator_at_start)
+                    expected = _define_by_run_flatten(container, scope_separator_at_start=scope_separator_at_start)
+                    self.assertEqual(list(flat.items()), list(expected.items()))
+
+        # Only the leaves change: Same layout, new values.
+        flat = define_by_run_flatten(dict(a=10, b=(20, dict(x=30, y=40)), c=dict(d=80, e=(60, 70))))
+        self.assertEqual(list(flat.values()), [10, 20, 30, 40, 80, 60, 70])
+
+        for flat in [
+            {"/a": 1, "/b/_T0_": 2, "/b/_T1_/x": 3, "/b/_T1_/y": [4, 5], "/c/d": 8},
+            {"/c/d": 8, "/b/_T1_/x": 3, "/a": 1, "/b/_T1_/y": [4, 5], "/b/_T0_": 2},
+            {"_T0_/a": 1, "_T1_": 2},
+            {"": 5}
+        ]:
+            for _ in range(2):
+                unflattened = define_by_run_unflatten(flat)
+                expected = _define_by_run_unflatten(flat) if "" not in flat else flat[""]
+                self.assertEqual(unflattened, expected)
+                self.assertEqual(type(unflattened), type(expected))
+        unflattened = define_by_run_unflatten({"/a": 1, "/b/_T0_": 2, "/b/_T1_/x": 3, "/b/_T1_/y": [4, 5], "/c/d": 8})
+        self.assertTrue(isinstance(unflattened["b"], DataOpTuple) and isinstance(unflattened["b"][1], DataOpDict))
+        self.assertTrue(isinstance(unflattened["b"][1]["y"], DataOpTuple))
+
+    def test_define_by_run_profiling(self):
+        """
+        Tests that define-by-run calls are only profiled if enabled and that profiles are bounded.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent = DQNAgent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        Component.reset_profile(histograms=True)
+        agent.get_action(np.array([0, 1]))
+        self.assertEqual(Component.call_count, 0)
+        self.assertEqual(len(Component.call_times), 0)
+        self.assertEqual(len(Component.call_histograms), 0)
+
+        agent_config["execution_spec"] = dict(enable_profiler=True, max_profiled_calls=5)
+        agent = DQNAgent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        Component.reset_profile(histograms=True)
+        for _ in range(3):
+            agent.get_action(np.array([0, 1]))
+        self.assertGreater(Component.call_count, 5)
+        self.assertEqual(len(Component.call_times), 5)
+
+        histograms = Component.get_profile_histograms()
+        self.assertEqual(sum(histogram["count"] for histogram in histograms.values()), Component.call_count)
+        # Each top-level call shows up once per `get_action`.
+        self.assertEqual(histograms["dqn-agent.get_preprocessed_state_and_action"]["count"], 3)
+
+        # Agents without profiler do not switch off profiling for others.
+        agent_config["execution_spec"] = dict(enable_profiler=False)
+        DQNAgent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        self.assertTrue(Component.profiling_enabled)
+        Component.set_profiling(False)
+
     def test_post_processing(self):
         env = OpenAIGymEnv("Pong-v0", frameskip=4, max_num_noops=30, episodic_life=True)
         agent_config = config_from_path("configs/ray_apex_for_pong.json")
@@ -277,6 +422,7 @@ class TestPytorchBackend(unittest.TestCase):
         agent_config["memory_spec"]["type"] = "mem_prioritized_replay"
         agent_config["execution_spec"]["torch_num_threads"] = 1
         agent_config["execution_spec"]["OMP_NUM_THREADS"] = 1
+        agent_config["execution_spec"]["enable_profiler"] = True
 
         agent = ApexAgent.from_spec(
             # Uses 2015 DQN parameters as closely as possible.
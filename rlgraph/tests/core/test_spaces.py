@@ -19,10 +19,12 @@ from __future__ import print_function
 
 import unittest
 
+import numpy as np
 from six.moves import xrange as range_
 
 from rlgraph.spaces import *
-from rlgraph.utils.ops import FLAT_TUPLE_CLOSE, FLAT_TUPLE_OPEN
+from rlgraph.spaces.space_utils import get_space_batcher, get_space_unbatcher
+from rlgraph.utils.ops import DataOpDict, FLAT_TUPLE_CLOSE, FLAT_TUPLE_OPEN
 
 
 class TestSpaces(unittest.TestCase):
@@ -159,3 +161,121 @@ class TestSpaces(unittest.TestCase):
         self.assertTrue(mapped_space["a"].num_categories == 5)
         self.assertTrue(isinstance(mapped_space["b"], IntBox))
         self.assertTrue(mapped_space["c"]["d"].num_categories == 5)
+
+    def test_container_space_unbatcher_and_batcher(self):
+        space = Dict(
+            a=IntBox(4),
+            b=Tuple(FloatBox(shape=(2,)), BoolBox()),
+            c=Dict(
+                d=IntBox(3)
+            ),
+            add_batch_rank=True
+        )
+        unbatch = get_space_unbatcher(space)
+        batch = get_space_batcher(space)
+
+        samples = space.sample(size=3)
+        singles = unbatch(samples)
+        self.assertTrue(len(singles) == 3)
+        for i, single in enumerate(singles):
+            self.assertTrue(space.contains(single))
+            self.assertTrue(single["a"] == samples["a"][i])
+            self.assertTrue((single["b"][0] == samples["b"][0][i]).all())
+            self.assertTrue(single["b"][1] == samples["b"][1][i])
+            self.assertTrue(single["c"]["d"] == samples["c"]["d"][i])
+
+        # Batching the singles again restores the original batch.
+        rebatched = batch(singles)
+        self.assertTrue((rebatched["a"] == samples["a"]).all())
+        self.assertTrue((rebatched["b"][0] == samples["b"][0]).all())
+        self.assertTrue((rebatched["b"][1] == samples["b"][1]).all())
+        self.assertTrue((rebatched["c"]["d"] == samples["c"]["d"]).all())
+
+        # Empty lists result in batches of size 0.
+        empty = batch([])
+        self.assertTrue(isinstance(empty, dict) and isinstance(empty["b"], tuple))
+        self.assertEqual(empty["b"][0].shape, (0, 2))
+        self.assertEqual(empty["b"][0].dtype, np.float32)
+        self.assertEqual(empty["c"]["d"].shape, (0,))
+
+        # Tuple spaces and primitive Spaces.
+        space = Tuple(IntBox(2), IntBox(5), add_batch_rank=True)
+        unbatch = get_space_unbatcher(space)
+        samples = space.sample(size=4)
+        self.assertTrue(unbatch(samples) == [(samples[0][i], samples[1][i]) for i in range_(4)])
+
+        space = IntBox(5, add_batch_rank=True)
+        unbatch = get_space_unbatcher(space)
+        self.assertTrue(unbatch(np.array(3)) == [3])
+        self.assertTrue((get_space_batcher(space)(unbatch(np.array([1, 2]))) == np.array([1, 2])).all())
+        self.assertEqual(get_space_batcher(space)([]).shape, (0,))
+        self.assertEqual(get_space_batcher(space)([]).dtype, space.dtype)
+
+        # Batch rank is detected per leaf Space rank (a single sample may have non-scalar leaves).
+        space = Dict(a=FloatBox(shape=(2,)), b=IntBox(3), add_batch_rank=True)
+        self.assertEqual(get_space_unbatcher(space)(dict(a=[0.1, 0.2], b=1)), [dict(a=[0.1, 0.2], b=1)])
+        space = FloatBox(shape=(2,), add_batch_rank=True)
+        self.assertEqual(get_space_unbatcher(space)([0.1, 0.2]), [[0.1, 0.2]])
+        self.assertEqual(len(get_space_unbatcher(space)(np.zeros(shape=(3, 2)))), 3)
+
+        # Batches have the Space's dtypes.
+        self.assertEqual(get_space_batcher(space)([[0.1, 0.2]]).dtype, np.float32)
+        space = Dict(a=FloatBox(shape=(2,)), b=IntBox(3), add_batch_rank=True)
+        batched = get_space_batcher(space)([dict(a=[0.1, 0.2], b=1)])
+        self.assertEqual(batched["a"].dtype, np.float32)
+        self.assertEqual(batched["b"].dtype, get_space_batcher(space)([])["b"].dtype)
+
+    def test_container_space_flat_plan(self):
+        space = Dict(
+            a=FloatBox(shape=(2,)), b=Tuple(IntBox(3), BoolBox(shape=(2,))), c=dict(d=IntBox(4)), add_batch_rank=True
+        )
+        plan = space.get_flat_plan()
+        self.assertTrue(space.get_flat_plan() is plan)
+        self.assertEqual(plan.keys, list(space.flatten().keys()))
+        self.assertEqual(plan.shapes, [(2,), (), (2,), ()])
+
+        # Zeros (incl. nested DataOpDicts).
+        zeros = space.zeros(size=3)
+        self.assertTrue(isinstance(zeros, DataOpDict) and isinstance(zeros["c"], DataOpDict))
+        self.assertTrue(zeros["a"].shape == (3, 2) and zeros["a"].dtype == np.float32 and not zeros["a"].any())
+        self.assertTrue(zeros["b"][0].shape == (3,) and zeros["b"][0].dtype == np.int32)
+        self.assertTrue(zeros["b"][1].shape == (3, 2) and zeros["b"][1].dtype == np.bool_)
+        self.assertTrue(space.contains(space.with_batch_rank(False).zeros()))
+
+        # Forcing a batch rank on single and already batched samples.
+        single = space.with_batch_rank(False).sample()
+        batched = space.force_batch(single)
+        self.assertTrue(batched["a"].shape == (1, 2) and batched["b"][0].shape == (1,))
+        self.assertTrue(batched["b"][1].shape == (1, 2) and batched["c"]["d"].shape == (1,))
+        samples = space.sample(size=4)
+        self.assertTrue(space.force_batch(samples)["c"]["d"] is samples["c"]["d"])
+
+        # The plan is re-computed when the Space changes.
+        space["e"] = FloatBox()
+        self.assertTrue(space.get_flat_plan() is not plan)
+        self.assertEqual(space.sample(size=2)["e"].shape, (2,))
+        self.assertEqual(space.with_batch_rank(False).zeros(size=None)["a"].shape, (2,))
+
+    def test_container_space_record_dtype(self):
+        space = Dict(a=FloatBox(shape=(2,)), b=Tuple(IntBox(3), BoolBox()), c=dict(d=FloatBox()), add_batch_rank=True)
+        dtype = space.get_record_dtype()
+        self.assertEqual(list(dtype.names), list(space.flatten().keys()))
+        self.assertEqual(dtype["/a"].shape, (2,))
+
+        samples = space.sample(size=5)
+        records = space.to_records(samples)
+        self.assertEqual(records.shape, (5,))
+
+        # Per-key views into the single records buffer.
+        batch = space.from_records(records)
+        self.assertTrue(batch["a"].base is not None and (batch["a"] == samples["a"]).all())
+        self.assertTrue((batch["b"][0] == samples["b"][0]).all() and (batch["b"][1] == samples["b"][1]).all())
+        self.assertTrue((batch["c"]["d"] == samples["c"]["d"]).all())
+        batch["c"]["d"][0] = 42.0
+        self.assertEqual(records["/c/d"][0], 42.0)
+
+        # Writing into (a slice of) an existing records array.
+        out = np.zeros(10, dtype=dtype)
+        space.to_records(samples, out=out[2:7])
+        self.assertTrue((out["/b/" + FLAT_TUPLE_OPEN + "0" + FLAT_TUPLE_CLOSE][2:7] == samples["b"][0]).all())
+        self.assertTrue((out["/a"][:2] == 0.0).all())
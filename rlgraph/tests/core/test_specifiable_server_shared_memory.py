@@ -0,0 +1,98 @@
+# Copyright 2018/2019 The RLgraph authors, All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import unittest
+
+from rlgraph.environments.environment import Environment
+from rlgraph.tests.test_util import recursive_assert_almost_equal
+from rlgraph.utils.specifiable_server import SpecifiableServer, SharedMemoryResults
+from rlgraph.spaces import IntBox, FloatBox, BoolBox
+
+
+class TestSpecifiableServerSharedMemory(unittest.TestCase):
+    """
+    Tests passing the return values of SpecifiableServer calls through shared memory (backend-independent).
+    """
+    def test_shared_memory_return_values(self):
+        state_space = FloatBox(shape=(2, 3))
+        output_spaces = dict(step_flow=[state_space, FloatBox(), BoolBox()], reset_flow=[state_space])
+        shared_buffers = SpecifiableServer.allocate_shared_buffers(output_spaces)
+        self.assertEqual(set(shared_buffers.keys()), {"step_flow", "reset_flow"})
+
+        server_views = SpecifiableServer.get_shared_views(shared_buffers["step_flow"], output_spaces["step_flow"])
+        client_views = SpecifiableServer.get_shared_views(shared_buffers["step_flow"], output_spaces["step_flow"])
+        state = state_space.sample()
+        self.assertTrue(SpecifiableServer.write_shared_views(server_views, (state, 0.5, True)))
+        recursive_assert_almost_equal(client_views[0], state)
+        self.assertAlmostEqual(client_views[1], 0.5)
+        self.assertTrue(client_views[2])
+
+        # Return values that don't fit the Spaces must be sent through the pipe.
+        self.assertFalse(SpecifiableServer.write_shared_views(server_views, (state[0], 0.5, True)))
+        self.assertFalse(SpecifiableServer.write_shared_views(server_views, (state, 0.5)))
+
+    def test_step_calls_through_shared_memory(self):
+        """
+        Starts a server running an environment and compares its `step_flow` results (returned through shared
+        memory) with those of the same environment stepped locally.
+        """
+        action_space = IntBox(2)
+        state_space = FloatBox(shape=(2, 3))
+        env_spec = dict(type="random_env", state_space=state_space, action_space=action_space, deterministic=True)
+        specifiable_server = SpecifiableServer(Environment, env_spec, dict(
+            step_flow=[state_space, float, bool]
+        ), "terminate")
+        # Started manually (not through a session hook).
+        SpecifiableServer.INSTANCES.remove(specifiable_server)
+
+        # Record the headers the server sends back.
+        headers = []
+        specifiable_server.start_server()
+        self.assertEqual(set(specifiable_server.shared_buffers.keys()), {"step_flow"})
+        pipe = specifiable_server.out_pipe
+
+        class RecordingPipe(object):
+            def send(self, obj):
+                pipe.send(obj)
+
+            def recv(self):
+                received = pipe.recv()
+                headers.append(received)
+                return received
+
+        specifiable_server.out_pipe = RecordingPipe()
+        try:
+            results = [specifiable_server.call_server("step_flow", action) for action in [0, 1, 1]]
+        finally:
+            specifiable_server.out_pipe = pipe
+            specifiable_server.stop_server()
+
+        self.assertTrue(all(isinstance(header, SharedMemoryResults) for header in headers))
+        self.assertEqual(len(headers), 3)
+
+        env = Environment.from_spec(env_spec)
+        for action, (state, reward, terminal) in zip([0, 1, 1], results):
+            expected_state, expected_reward, expected_terminal, _ = env.step(action)
+            self.assertEqual(state.shape, (2, 3))
+            recursive_assert_almost_equal(state, expected_state, decimals=5)
+            self.assertAlmostEqual(float(reward), float(expected_reward), places=5)
+            self.assertEqual(bool(terminal), bool(expected_terminal))
+        # Results are copies (the shared buffers get overwritten by the next call).
+        self.assertFalse(np.shares_memory(results[0][0], specifiable_server.shared_views["step_flow"][0]))
@@ -17,9 +17,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
 import unittest
 
-from rlgraph.environments import SequentialVectorEnv
+import numpy as np
+
+from rlgraph.environments import GridWorld, SequentialVectorEnv
+from rlgraph.environments.sequential_vector_env import ThreadedResetter
 from rlgraph.tests.test_util import recursive_assert_almost_equal
 
 
@@ -70,3 +74,70 @@ class TestSequentialVectorEnv(unittest.TestCase):
         all(recursive_assert_almost_equal(r_, -0.1) for r_ in r)
         all(self.assertTrue(not t_) for t_ in t)
 
+
+    def test_sequential_vector_env_with_background_resets(self):
+        num_envs = 2
+        for async_reset in ["thread", "process"]:
+            env = SequentialVectorEnv(
+                num_environments=num_envs, env_spec={"type": "gridworld", "world": "2x2"}, num_background_envs=2,
+                async_reset=async_reset, reset_timeout=10.0
+            )
+            s = env.reset_all()
+            all(self.assertTrue(s_ == 0) for s_ in s)
+
+            s, r, t, _ = env.step([1 for _ in range(num_envs)])  # right: [" X", " G"] -> in the hole
+            all(self.assertTrue(s_ == 2) for s_ in s)
+            all(self.assertTrue(t_) for t_ in t)
+
+            # Swapped in envs must be freshly reset.
+            for i in range(num_envs):
+                self.assertTrue(env.reset(index=i) == 0)
+            s, r, t, _ = env.step([2 for _ in range(num_envs)])  # down: [" H", "XG"]
+            all(self.assertTrue(s_ == 1) for s_ in s)
+
+            stats = env.get_reset_statistics()
+            self.assertEqual(stats["num_resets"], 2 * num_envs)
+            self.assertGreaterEqual(stats["max_reset_latency"], stats["mean_reset_latency"])
+            env.terminate_all()
+
+    def test_threaded_resetter_terminates_resetting_envs(self):
+        terminated = []
+
+        class SlowResetGridWorld(GridWorld):
+            def reset(self, randomize=False):
+                time.sleep(0.2)
+                return super(SlowResetGridWorld, self).reset(randomize=randomize)
+
+            def terminate(self):
+                terminated.append(self)
+
+        resetter = ThreadedResetter(lambda: SlowResetGridWorld(world="2x2"), num_environments=1, timeout=10.0)
+        env = SlowResetGridWorld(world="2x2")
+        # `env` is still being reset in the background when terminating.
+        resetter.swap(env)
+        resetter.terminate()
+        self.assertFalse(resetter.is_alive())
+        self.assertEqual(terminated, [env])
+
+    def test_sequential_vector_env_from_callable(self):
+        env = SequentialVectorEnv(
+            num_environments=2, env_spec=lambda: GridWorld(world="2x2"), num_background_envs=1, async_reset=True
+        )
+        s = env.reset_all()
+        all(self.assertTrue(s_ == 0) for s_ in s)
+        env.terminate_all()
+
+    def test_sequential_vector_env_flow_methods(self):
+        num_envs = 3
+        env = SequentialVectorEnv(num_environments=num_envs, env_spec={"type": "gridworld", "world": "2x2"})
+
+        s = env.reset_flow()
+        recursive_assert_almost_equal(s, np.zeros(shape=(num_envs,)))
+
+        # Env 0 falls into the hole (and is reset automatically), the others move down.
+        s, r, t = env.step_flow(np.array([1, 2, 2]))
+        recursive_assert_almost_equal(s, np.array([0, 1, 1]))
+        recursive_assert_almost_equal(r, np.array([-5.0, -0.1, -0.1], dtype=np.float32))
+        recursive_assert_almost_equal(t, np.array([True, False, False]))
+        self.assertEqual(r.dtype, np.float32)
+        self.assertEqual(t.dtype, np.bool_)
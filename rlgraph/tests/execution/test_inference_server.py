@@ -0,0 +1,97 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+from threading import Thread
+
+import numpy as np
+
+from rlgraph.agents import InferenceAgent
+from rlgraph.environments import GridWorld
+from rlgraph.execution.inference_server import InferenceServer
+from rlgraph.tests.test_util import config_from_path, recursive_assert_almost_equal
+
+
+class TestInferenceServer(unittest.TestCase):
+
+    env = GridWorld(world="2x2")
+
+    def start_server(self, num_clients, max_batch_size=None):
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent_config["state_space"] = self.env.state_space
+        agent_config["action_space"] = self.env.action_space
+
+        server = InferenceServer(agent_config, num_clients=num_clients, max_batch_size=max_batch_size,
+                                 batch_timeout=0.5, use_exploration=False)
+        server.start_server()
+
+        local_agent = InferenceAgent.from_agent_config(agent_config)
+        local_agent.set_weights(server.get_weights()["policy_weights"])
+        return server, local_agent
+
+    def request_actions(self, server, local_agent, num_clients):
+        """
+        Requests actions for i + 1 states from the i-th client (concurrently) and checks them against a local agent
+        with the same weights.
+        """
+        states = [np.array([self.env.state_space.sample() for _ in range(i + 1)]) for i in range(num_clients)]
+        results = [None] * num_clients
+
+        def request(index):
+            results[index] = server.get_client(index).get_action(states[index])
+
+        threads = [Thread(target=request, args=(i,)) for i in range(num_clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for i in range(num_clients):
+            self.assertEqual(len(results[i]), i + 1)
+            recursive_assert_almost_equal(results[i], local_agent.get_action(states[i], use_exploration=False))
+
+    def test_batched_inference_for_many_clients(self):
+        """
+        Serves greedy actions to several concurrent clients.
+        """
+        num_clients = 4
+        server, local_agent = self.start_server(num_clients)
+        self.request_actions(server, local_agent, num_clients)
+
+        stats = server.get_statistics()
+        self.assertEqual(stats["num_requests"], num_clients)
+        # All requests are answered by fewer policy calls than requests.
+        self.assertLess(stats["num_policy_calls"], num_clients)
+        server.stop_server()
+
+    def test_max_batch_size(self):
+        """
+        Policy calls must not act on more than `max_batch_size` states (larger requests are split).
+        """
+        num_clients = 4
+        server, local_agent = self.start_server(num_clients, max_batch_size=3)
+        self.request_actions(server, local_agent, num_clients)
+
+        stats = server.get_statistics()
+        self.assertEqual(stats["num_requests"], num_clients)
+        self.assertLessEqual(stats["max_batch_size"], 3)
+        # All 1 + 2 + 3 + 4 states were acted on, in at least 4 policy calls.
+        self.assertGreaterEqual(stats["num_policy_calls"], 4)
+        self.assertAlmostEqual(stats["mean_batch_size"] * stats["num_policy_calls"], 10)
+        server.stop_server()
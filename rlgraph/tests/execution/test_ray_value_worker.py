@@ -21,7 +21,7 @@ import unittest
 from time import sleep
 
 from rlgraph.execution.ray.ray_value_worker import RayValueWorker
-from rlgraph.execution.ray.ray_util import RayWeight
+from rlgraph.execution.ray.ray_util import RayWeight, ray_decompress
 from rlgraph.tests.test_util import recursive_assert_almost_equal, config_from_path
 import numpy as np
 
@@ -101,6 +101,35 @@ class TestRayWorker(unittest.TestCase):
         # We do not break on terminal so there should be exactly 100 steps.
         self.assertEqual(len(observations["terminals"]), size)
 
+    def test_batched_preprocessing_with_max_timesteps_per_episode(self):
+        """
+        Tests that episodes cut off by `max_timesteps_per_episode` store their real (preprocessed) next state,
+        not a zero state.
+        """
+        agent_config = config_from_path("configs/apex_agent_cartpole.json")
+        agent_config["preprocessing_spec"] = [dict(type="sequence", sequence_length=2, add_rank=False, scope="sequence")]
+        ray_spec = agent_config["execution_spec"].pop("ray_spec")
+        worker_spec = ray_spec["worker_spec"]
+        worker_spec["worker_sample_size"] = 10
+        worker_spec["batched_preprocessing"] = True
+        worker_spec["worker_executes_postprocessing"] = False
+        env_spec = dict(
+            type="random-env", state_space=dict(type="float-box", shape=(2,), low=1.0, high=2.0),
+            action_space=dict(type="int-box", low=0, high=2), reward_space=dict(type="float-box"),
+            terminal_prob=0.0
+        )
+        worker = RayValueWorker(agent_config, worker_spec, env_spec)
+
+        # Episodes never terminate but get cut off after 3 steps.
+        result = worker.execute_and_get_timesteps(12, max_timesteps_per_episode=3)
+        observations = result.get_batch()
+        self.assertFalse(np.any(observations["terminals"]))
+        # Each next state is the state's sequence shifted by one step, including the last next state of a cut-off
+        # episode (which used to be all zeros).
+        for state, next_state in zip(observations["states"], observations["next_states"]):
+            state, next_state = ray_decompress(state), ray_decompress(next_state)
+            recursive_assert_almost_equal(next_state[:2], state[2:])
+
     def test_metrics(self):
         """
         Tests metric collection for 1 and multiple environments.
@@ -0,0 +1,116 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import logging
+import time
+import unittest
+
+from rlgraph import get_backend
+from rlgraph.agents import Agent
+from rlgraph.environments import GridWorld
+from rlgraph.spaces import FloatBox, IntBox
+from rlgraph.tests.test_util import config_from_path
+from rlgraph.utils import root_logger
+
+
+class TestBuildPerformance(unittest.TestCase):
+    """
+    Tracks the build times (with per-phase and per-Component breakdown) of the different Agents.
+    """
+    root_logger.setLevel(level=logging.INFO)
+
+    grid_world_state_space = GridWorld.grid_world_2x2_flattened_state_space
+    grid_world_action_space = GridWorld("2x2").action_space
+    cart_pole_state_space = FloatBox(shape=(4,))
+    cart_pole_action_space = IntBox(2)
+
+    # Agents that cannot be built in some backends (backend -> config path -> reason).
+    unsupported = dict(
+        pytorch={
+            "configs/ppo_agent_for_2x2_gridworld.json": "masked_select requires bool masks",
+            "configs/actor_critic_agent_for_2x2_gridworld.json": "masked_select requires bool masks",
+            "configs/impala_agent_for_2x2_gridworld.json": "IMPALA only supports tf",
+            "configs/sac_agent_for_cartpole.json": "parts of the SAC graph still use tf ops"
+        }
+    )
+
+    def test_dqn_build_time(self):
+        self._build_and_profile(
+            "configs/dqn_agent_for_functionality_test.json", GridWorld("2x2").state_space, self.grid_world_action_space
+        )
+
+    def test_apex_build_time(self):
+        self._build_and_profile(
+            "configs/apex_agent_for_2x2_gridworld.json", self.grid_world_state_space, self.grid_world_action_space,
+            preprocessing_spec=None
+        )
+
+    def test_dqfd_build_time(self):
+        self._build_and_profile(
+            "configs/dqfd_agent_for_cartpole.json", self.cart_pole_state_space, self.cart_pole_action_space
+        )
+
+    def test_ppo_build_time(self):
+        self._build_and_profile(
+            "configs/ppo_agent_for_2x2_gridworld.json", self.grid_world_state_space, self.grid_world_action_space
+        )
+
+    def test_actor_critic_build_time(self):
+        self._build_and_profile(
+            "configs/actor_critic_agent_for_2x2_gridworld.json", self.grid_world_state_space,
+            self.grid_world_action_space
+        )
+
+    def test_impala_build_time(self):
+        self._build_and_profile(
+            "configs/impala_agent_for_2x2_gridworld.json", self.grid_world_state_space, self.grid_world_action_space,
+            update_spec=dict(batch_size=16)
+        )
+
+    def test_sac_build_time(self):
+        self._build_and_profile(
+            "configs/sac_agent_for_cartpole.json", self.cart_pole_state_space, self.cart_pole_action_space
+        )
+
+    def _build_and_profile(self, config_path, state_space, action_space, **kwargs):
+        """
+        Builds the Agent from the given config with build profiling and checks and prints its build profile.
+        """
+        reason = self.unsupported.get(get_backend(), {}).get(config_path)
+        if reason is not None:
+            self.skipTest("Cannot build {} with backend {}: {}.".format(config_path, get_backend(), reason))
+
+        agent_config = config_from_path(config_path)
+        agent_config.update(kwargs)
+        agent_config["execution_spec"] = dict(
+            agent_config.get("execution_spec") or {}, profile_build=True, disable_monitoring=True
+        )
+
+        start = time.perf_counter()
+        agent = Agent.from_spec(agent_config, state_space=state_space, action_space=action_space)
+        build_time = time.perf_counter() - start
+
+        report = agent.graph_builder.build_profiler.report(top=10)
+        self.assertGreater(report["build"]["total_build_time"], 0.0)
+        self.assertGreater(len(report["phases"]), 0)
+        self.assertGreater(len(report["components"]), 0)
+
+        print("Build profile for {} ({:.3f} s):".format(config_path, build_time))
+        agent.graph_builder.build_profiler.print_report(top=10)
+        agent.terminate()
@@ -97,19 +97,16 @@ def rlgraph_api(api_method=None, *, component=None, name=None, returns=None,
             api_fn_name = name or re.sub(r'^_graph_fn_', "", wrapped_func.__name__)
             # Direct evaluation of function.
             if self.execution_mode == "define_by_run":
-                type(self).call_count += 1
-
-                start = time.perf_counter()
                 # Check with owner if extra args needed.
                 if api_fn_name in self.api_methods and self.api_methods[api_fn_name].add_auto_key_as_first_param:
-                    output = wrapped_func(self, "", *args, **kwargs)
-                else:
-                    output = wrapped_func(self, *args, **kwargs)
+                    args = ("",) + args
+                if self.profiling_enabled is False:
+                    return wrapped_func(self, *args, **kwargs)
 
-                # Store runtime for this method.
-                type(self).call_times.append(  # Component.call_times
-                    (self.name, wrapped_func.__name__, time.perf_counter() - start)
-                )
+                start = time.perf_counter()
+                output = wrapped_func(self, *args, **kwargs)
+                # Store runtime for this method (Component.record_call).
+                self.record_call(self.name, wrapped_func.__name__, time.perf_counter() - start)
                 return output
 
             api_method_rec = self.api_methods[api_fn_name]
@@ -22,12 +22,20 @@ from collections import OrderedDict
 
 from rlgraph import get_backend
 from rlgraph.utils.ops import FLAT_TUPLE_OPEN, FLAT_TUPLE_CLOSE, deep_tuple, FlattenedDataOp, FLATTEN_SCOPE_PREFIX, \
-    DataOpDict
+    DataOpDict, DataOpTuple
 
 if get_backend() == "pytorch":
     import torch
 
 
+# Max. number of cached (un)flatten layouts (caches are cleared when full).
+MAX_CACHED_LAYOUTS = 1024
+# Container structure signature -> (flat keys, leaf order) for `define_by_run_flatten`.
+_flatten_layouts = {}
+# Tuple of flat keys -> builder function for `define_by_run_unflatten`.
+_unflatten_layouts = {}
+
+
 def print_call_chain(profile_data, sort=True, filter_threshold=None):
     """
     Prints a component call chain stdout. Useful to analyze define by run performance.
@@ -43,6 +51,9 @@ def print_call_chain(profile_data, sort=True, filter_threshold=None):
         assert isinstance(filter_threshold, float), "ERROR: Filter threshold must be float but is {}.".format(
             type(filter_threshold))
         profile_data = [data for data in profile_data if data[2] > filter_threshold]
+    if len(profile_data) == 0:
+        print("No profiled calls ({} before filter).".format(original_length))
+        return
     if sort:
         res = sorted(profile_data, key=lambda v: v[2], reverse=True)
         print("Call chain sorted by runtime ({} calls, {} before filter):".
@@ -73,6 +84,27 @@ def define_by_run_flatten(container, key_scope="", tensor_tuple_list=None, scope
     Returns:
         Dict: Flattened container.
     """
+    # Top-level call: Use the cached layout of the container's structure, only moving the leaves.
+    if tensor_tuple_list is None and key_scope == "":
+        if not isinstance(container, (dict, tuple)):
+            return DataOpDict([("", container)])
+        leaves = []
+        signature = (scope_separator_at_start, _get_structure_signature(container, leaves))
+        layout = _flatten_layouts.get(signature)
+        if layout is None:
+            layout = _compile_flatten_layout(container, scope_separator_at_start)
+            if len(_flatten_layouts) >= MAX_CACHED_LAYOUTS:
+                _flatten_layouts.clear()
+            _flatten_layouts[signature] = layout
+        keys, order = layout
+        return DataOpDict(zip(keys, [leaves[i] for i in order]))
+    return _define_by_run_flatten(container, key_scope, tensor_tuple_list, scope_separator_at_start)
+
+
+def _define_by_run_flatten(container, key_scope="", tensor_tuple_list=None, scope_separator_at_start=True):
+    """
+    Recursive implementation of `define_by_run_flatten` (without layout caching).
+    """
     ret = False
 
     # Are we in the non-recursive (first) call?
@@ -90,15 +122,16 @@ def define_by_run_flatten(container, key_scope="", tensor_tuple_list=None, scope
         for key in sorted(container.keys()):
             # Make sure we have no double slashes from flattening an already FlattenedDataOp.
             scope = (key_scope[:-1] if len(key) == 0 or key[0] == "/" else key_scope) + key
-            define_by_run_flatten(container[key], key_scope=scope, tensor_tuple_list=tensor_tuple_list, scope_separator_at_start=True)
+            _define_by_run_flatten(container[key], key_scope=scope, tensor_tuple_list=tensor_tuple_list,
+                                   scope_separator_at_start=True)
     elif isinstance(container, tuple):
         if scope_separator_at_start:
             key_scope += FLATTEN_SCOPE_PREFIX + FLAT_TUPLE_OPEN
         else:
             key_scope += "" + FLAT_TUPLE_OPEN
         for i, c in enumerate(container):
-            define_by_run_flatten(c, key_scope=key_scope + str(i) + FLAT_TUPLE_CLOSE, tensor_tuple_list=tensor_tuple_list,
-                                  scope_separator_at_start=True)
+            _define_by_run_flatten(c, key_scope=key_scope + str(i) + FLAT_TUPLE_CLOSE,
+                                   tensor_tuple_list=tensor_tuple_list, scope_separator_at_start=True)
     else:
         assert not isinstance(container, (dict, tuple))
         tensor_tuple_list.append((key_scope, container))
@@ -108,6 +141,51 @@ def define_by_run_flatten(container, key_scope="", tensor_tuple_list=None, scope
         return DataOpDict(tensor_tuple_list)
 
 
+def _get_structure_signature(container, leaves):
+    """
+    Returns a hashable signature of the (nested) structure of `container` (dict keys in insertion order and
+    tuple lengths) and appends all its leaves (in the same order) to `leaves`.
+    """
+    if isinstance(container, dict):
+        values = container.values()
+    elif isinstance(container, tuple):
+        values = container
+    else:
+        leaves.append(container)
+        return None
+    # Leaves are handled inline (no recursive call).
+    signature = []
+    for value in values:
+        if isinstance(value, (dict, tuple)):
+            signature.append(_get_structure_signature(value, leaves))
+        else:
+            leaves.append(value)
+            signature.append(None)
+    if values is container:
+        return tuple, tuple(signature)
+    return dict, tuple(container.keys()), tuple(signature)
+
+
+def _compile_flatten_layout(container, scope_separator_at_start):
+    """
+    Returns:
+        tuple: The flat keys of `container` and - for each key - the index of its leaf in the order of
+            `_get_structure_signature`.
+    """
+    def index_template(container_, counter):
+        if isinstance(container_, dict):
+            return {key: index_template(value, counter) for key, value in container_.items()}
+        elif isinstance(container_, tuple):
+            return tuple([index_template(c, counter) for c in container_])
+        counter.append(None)
+        return len(counter) - 1
+
+    flat_template = _define_by_run_flatten(
+        index_template(container, []), scope_separator_at_start=scope_separator_at_start
+    )
+    return list(flat_template.keys()), list(flat_template.values())
+
+
 def define_by_run_split_args(add_auto_key_as_first_param, *args, **kwargs):
     """
     Splits any container in *args and **kwargs and collects them to be evaluated
@@ -198,6 +276,42 @@ def define_by_run_unflatten(result_dict):
     if len(result_dict) == 1 and "" in result_dict:
         return result_dict[""]
 
+    # Use the cached layout for these keys, only moving the values.
+    keys = tuple(result_dict.keys())
+    build = _unflatten_layouts.get(keys)
+    if build is None:
+        template = _define_by_run_unflatten({key: i for i, key in enumerate(keys)})
+        build = _compile_unflatten_builder(template)
+        if len(_unflatten_layouts) >= MAX_CACHED_LAYOUTS:
+            _unflatten_layouts.clear()
+        _unflatten_layouts[keys] = build
+    return build(list(result_dict.values()))
+
+
+def _compile_unflatten_builder(template):
+    """
+    Returns a function that re-nests a list of values into the structure of `template` (as returned by
+    `_define_by_run_unflatten` for a dict with the values' indices as values).
+    """
+    if isinstance(template, dict):
+        type_ = type(template)
+        builders = [(key, _compile_unflatten_builder(value)) for key, value in template.items()]
+        return lambda values: type_([(key, build(values)) for key, build in builders])
+    elif isinstance(template, tuple):
+        type_ = type(template)
+        builders = [_compile_unflatten_builder(value) for value in template]
+        return lambda values: type_([build(values) for build in builders])
+    elif template is None:
+        return lambda values: None
+    # Same conversion of list values as in `_define_by_run_unflatten`.
+    return lambda values: deep_tuple(values[template]) if isinstance(values[template], (list, dict)) else \
+        values[template]
+
+
+def _define_by_run_unflatten(result_dict):
+    """
+    Recursive implementation of `define_by_run_unflatten` (without layout caching).
+    """
     # Normal case: OrderedDict that came from a ContainerItem.
     base_structure = None
 
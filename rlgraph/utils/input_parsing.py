@@ -162,6 +162,17 @@ def parse_execution_spec(execution_spec):
             enable_timeline=False,
             # With which frequency do we write out a timeline file?
             timeline_frequency=1,
+            # API-methods (e.g. acting) to run through cached session callables (`tf.Session.make_callable`),
+            # skipping fetch-/feed-dict construction and session hooks on each call.
+            callable_api_methods=["get_preprocessed_state_and_action", "action_from_preprocessed_state"],
+            # Optional cache of built graphs, e.g. dict(directory="~/rlgraph_build_cache"). Builds with the same
+            # Component settings, input-Spaces and execution settings import the cached graph instead of rebuilding
+            # it. An explicit cache `key` may be given to skip the (settings-hash based) key computation.
+            build_cache=None,
+            # Record per API-method call counts, latencies and batch sizes (see `GraphExecutor.get_api_metrics`).
+            record_api_metrics=True,
+            # Profile the graph build (times per build phase and Component, see `GraphBuilder.build_profiler`).
+            profile_build=False
         )
         execution_spec = default_dict(execution_spec, default_spec)
 
@@ -210,7 +221,22 @@ def parse_execution_spec(execution_spec):
             device_map={},
             # TODO potentially set to nproc?
             torch_num_threads=1,
-            OMP_NUM_THREADS=1
+            OMP_NUM_THREADS=1,
+            # Compile root API-method calls into cached callables (resolved API-functions, return-value selection
+            # and param converters).
+            compile_api_calls=True,
+            # Wrap numpy input params via `torch.from_numpy` (no copies). Passed arrays must then not be modified
+            # while the graph may still hold them (e.g. in memories or sequence preprocessors).
+            zero_copy_inputs=False,
+            # Record runtimes of all define-by-run API-method calls (see `Component.call_times` and
+            # `Component.call_histograms`). Adds timing and bookkeeping overhead to each call.
+            enable_profiler=False,
+            # Max. number of most recent calls to keep in `Component.call_times`.
+            max_profiled_calls=10000,
+            # Record per API-method call counts, latencies and batch sizes (see `GraphExecutor.get_api_metrics`).
+            record_api_metrics=True,
+            # Profile the graph build (times per build phase and Component, see `GraphBuilder.build_profiler`).
+            profile_build=False
         )
         execution_spec = default_dict(execution_spec, default_spec)
 
@@ -240,9 +266,18 @@ def parse_observe_spec(observe_spec):
         buffer_size=100,  # only if buffer_enabled=True
         # Set to > 1 if we want to post-process buffered values for n-step learning.
         n_step=1,  # values > 1 are only allowed if buffer_enabled is True and buffer_size >> n.
+        # Collect the flushed buffers of all environments and insert them with one graph call once at least
+        # n records are pending. 0 for inserting each environment's flushed buffer right away.
+        insert_batch_size=0,  # only if buffer_enabled=True
     )
     observe_spec = default_dict(observe_spec, default_spec)
 
+    if observe_spec["insert_batch_size"] > 0 and observe_spec["buffer_enabled"] is False:
+        raise RLGraphError(
+            "Cannot coalesce memory inserts (insert_batch_size={}), while buffering is switched "
+            "off".format(observe_spec["insert_batch_size"])
+        )
+
     if observe_spec["n_step"] > 1:
         if observe_spec["buffer_enabled"] is False:
             raise RLGraphError(
@@ -0,0 +1,123 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import defaultdict
+
+import numpy as np
+
+from rlgraph.spaces.containers import ContainerSpace
+from rlgraph.utils.util import convert_dtype
+
+
+class ObserveBuffer(object):
+    """
+    Preallocated per-environment numpy storage for one record field (e.g. states or rewards) of buffered
+    `Agent.observe` calls. Records are written in place into an array of size `capacity` per environment (of
+    the Space's record dtype for container Spaces, holding all primitive sub-Spaces in one buffer).
+    `buffer[env_id]` returns views (no copies) of the records written so far, in the (container) structure of
+    the Space.
+    """
+    def __init__(self, space, capacity):
+        """
+        Args:
+            space (Space): The Space of a single record (without batch rank).
+            capacity (int): The number of records to preallocate per environment. Storage grows if more
+                records are written before a reset.
+        """
+        self.space = space
+        self.capacity = max(int(capacity), 1)
+
+        if isinstance(space, ContainerSpace):
+            self.plan = space.get_flat_plan()
+            self.dtype = self.plan.get_record_dtype()
+            self.shape = ()
+        else:
+            self.plan = None
+            self.dtype = convert_dtype(space.dtype, "np")
+            self.shape = space.shape
+
+        # Per env-id: The records array and the number of records written.
+        self.storage = {}
+        self.sizes = defaultdict(int)
+
+    def append(self, env_id, record):
+        """
+        Writes a single record (without batch rank) for the given environment.
+        """
+        storage = self._get_storage(env_id)
+        size = self.sizes[env_id]
+        if size == len(storage):
+            storage = self._allocate(env_id, 2 * size)
+        if self.plan is None:
+            storage[size] = record
+        else:
+            storage[size] = tuple(self.plan.get_leaves(record))
+        self.sizes[env_id] = size + 1
+
+    def extend(self, env_id, records):
+        """
+        Writes a batch of records (with batch rank) for the given environment.
+        """
+        storage = self._get_storage(env_id)
+        size = self.sizes[env_id]
+        end = size + (len(records) if self.plan is None else len(self.plan.get_leaves(records)[0]))
+        if end > len(storage):
+            storage = self._allocate(env_id, max(end, 2 * size))
+        if self.plan is None:
+            storage[size:end] = records
+        else:
+            self.plan.to_records(records, out=storage[size:end])
+        self.sizes[env_id] = end
+
+    def size(self, env_id):
+        return self.sizes[env_id]
+
+    def reset(self, env_id):
+        """
+        Marks all records of the given environment as consumed. Storage is kept for reuse.
+        """
+        self.sizes[env_id] = 0
+
+    def _allocate(self, env_id, capacity):
+        """
+        (Re)allocates the given environment's storage with the given capacity, keeping already written records.
+        """
+        old_storage = self.storage.get(env_id)
+        storage = np.zeros(shape=(capacity,) + self.shape, dtype=self.dtype)
+        if old_storage is not None:
+            size = self.sizes[env_id]
+            storage[:size] = old_storage[:size]
+        self.storage[env_id] = storage
+        return storage
+
+    def _get_storage(self, env_id):
+        storage = self.storage.get(env_id)
+        if storage is None:
+            storage = self._allocate(env_id, self.capacity)
+        return storage
+
+    def __getitem__(self, env_id):
+        storage = self._get_storage(env_id)
+        size = self.sizes[env_id]
+        if self.plan is None:
+            return storage[:size]
+        return self.plan.from_records(storage[:size])
+
+    def __delitem__(self, env_id):
+        self.reset(env_id)
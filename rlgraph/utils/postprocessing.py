@@ -0,0 +1,218 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+Numpy implementations of the trajectory post-processing steps (returns, GAE, n-step targets, V-trace) that can be
+called directly on (worker-side) trajectory arrays, without a round trip through an Agent's graph.
+
+Batches (in batch-major layout) may hold episode fragments of several environments one after another. As in
+`SequenceHelper`, the end of each fragment is marked by `sequence_indices` (the final element always ends a fragment)
+and `terminals` marks those fragment ends that are true episode ends.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+
+def sequence_ends(sequence_indices):
+    """
+    Args:
+        sequence_indices (np.ndarray): Bool or int (1=end of a sub-sequence) indicators.
+
+    Returns:
+        np.ndarray: Bool mask of the last elements of all sub-sequences (the final element always ends one).
+    """
+    ends = np.asarray(sequence_indices, dtype=bool).copy()
+    if len(ends) > 0:
+        ends[-1] = True
+    return ends
+
+
+def reverse_discounted_sum(values, decays):
+    """
+    Computes y[i] = values[i] + decays[i] * y[i + 1] (with y[n] = 0) along the first axis in log2(n) vectorized
+    steps: After each step, values[i] and decays[i] describe the composed map from y[i + offset] to y[i].
+
+    Args:
+        values (np.ndarray): The values to sum up (first axis = sequence axis).
+        decays (np.ndarray): The (1D) decays per position. 0.0 stops the accumulation (e.g. at episode ends).
+
+    Returns:
+        np.ndarray: The discounted reverse cumulative sums (same shape as `values`).
+    """
+    values = np.array(values, dtype=np.float64)
+    decays = np.array(decays, dtype=np.float64).reshape((-1,) + (1,) * (values.ndim - 1))
+    offset = 1
+    while offset < len(values):
+        values[:-offset] += decays[:-offset] * values[offset:]
+        decays[:-offset] *= decays[offset:]
+        decays[-offset:] = 0.0
+        offset *= 2
+    return values
+
+
+def discounted_returns(rewards, terminals, discount=0.99, sequence_indices=None, bootstrap_values=None):
+    """
+    Computes the discounted returns G[t] = r[t] + discount * G[t+1] for each sub-sequence.
+
+    Args:
+        rewards (np.ndarray): The rewards.
+        terminals (np.ndarray): The terminal flags.
+        discount (float): The discount factor gamma.
+        sequence_indices (Optional[np.ndarray]): The sub-sequence end indicators. Default: Use `terminals`.
+        bootstrap_values (Optional[np.ndarray]): Value estimates V(s[t+1]) (same length as `rewards`) to bootstrap
+            the returns with at the ends of non-terminal sub-sequences. Default: Bootstrap with 0.0.
+
+    Returns:
+        np.ndarray: The discounted returns.
+    """
+    rewards = np.asarray(rewards, dtype=np.float64)
+    terminals = np.asarray(terminals, dtype=bool)
+    ends = sequence_ends(terminals if sequence_indices is None else sequence_indices)
+    if bootstrap_values is not None:
+        rewards = rewards + discount * np.asarray(bootstrap_values).reshape(rewards.shape) * \
+            np.logical_and(ends, np.logical_not(terminals))
+    return reverse_discounted_sum(rewards, discount * np.logical_not(ends))
+
+
+def td_errors(baseline_values, rewards, terminals, sequence_indices, discount=0.99):
+    """
+    Computes 1-step TD errors (delta = r + gamma V(s') - V(s)) over a batch of sub-sequences (see
+    `SequenceHelper.bootstrap_values`): At the end of a sub-sequence, V(s') is 0.0 for true terminals and the
+    sub-sequence's last value estimate otherwise.
+
+    Args:
+        baseline_values (np.ndarray): Baseline predictions V(s).
+        rewards (np.ndarray): The rewards.
+        terminals (np.ndarray): The terminal flags.
+        sequence_indices (np.ndarray): The sub-sequence end indicators.
+        discount (float): The discount factor gamma.
+
+    Returns:
+        np.ndarray: The 1-step TD errors.
+    """
+    rewards = np.asarray(rewards, dtype=np.float64)
+    values = np.asarray(baseline_values, dtype=np.float64).reshape(rewards.shape)
+    ends = sequence_ends(sequence_indices)
+    next_values = np.concatenate([values[1:], values[-1:]])
+    next_values[ends] = values[ends] * np.logical_not(np.asarray(terminals, dtype=bool)[ends])
+    return rewards + discount * next_values - values
+
+
+def generalized_advantage_estimation(baseline_values, rewards, terminals, sequence_indices, discount=0.99,
+                                     gae_lambda=1.0, clip_rewards=0.0):
+    """
+    Computes advantages via generalized advantage estimation (GAE), analogous to the
+    `GeneralizedAdvantageEstimation` Component.
+
+    Args:
+        baseline_values (np.ndarray): Baseline predictions V(s).
+        rewards (np.ndarray): The rewards.
+        terminals (np.ndarray): The terminal flags.
+        sequence_indices (np.ndarray): The sub-sequence end indicators.
+        discount (float): The discount factor gamma.
+        gae_lambda (float): GAE-lambda.
+        clip_rewards (float): If not 0.0, clip rewards to [-clip_rewards, clip_rewards].
+
+    Returns:
+        np.ndarray: The PG-advantage values.
+    """
+    if clip_rewards != 0.0:
+        rewards = np.clip(rewards, -clip_rewards, clip_rewards)
+    deltas = td_errors(baseline_values, rewards, terminals, sequence_indices, discount)
+    decays = gae_lambda * discount * np.logical_not(np.asarray(sequence_indices, dtype=bool))
+    return reverse_discounted_sum(deltas, decays)
+
+
+def n_step_targets(rewards, terminals, discount=0.99, n_step=1, sequence_indices=None):
+    """
+    Computes n-step discounted rewards R[t] = SUM[k=0 to m-1](gamma^k * r[t+k]), where the window of m <= n steps
+    does not reach beyond the end of t's sub-sequence.
+
+    Args:
+        rewards (np.ndarray): The rewards.
+        terminals (np.ndarray): The terminal flags.
+        discount (float): The discount factor gamma.
+        n_step (int): The number of steps n.
+        sequence_indices (Optional[np.ndarray]): The sub-sequence end indicators. Default: Use `terminals`.
+
+    Returns:
+        tuple:
+            - np.ndarray: The n-step discounted rewards.
+            - np.ndarray: The index of the last step (t+m-1) of each window, e.g. to look up the next-state to
+                bootstrap from.
+            - np.ndarray: Whether each window ends with a terminal (no bootstrapping).
+            - np.ndarray: The discounts (gamma^m) to apply to the bootstrap values.
+    """
+    rewards = np.asarray(rewards, dtype=np.float64)
+    terminals = np.asarray(terminals, dtype=bool)
+    ends = sequence_ends(terminals if sequence_indices is None else sequence_indices)
+    size = len(rewards)
+    # The index of the end of each position's sub-sequence.
+    end_positions = np.where(ends)[0]
+    sequence_end = end_positions[np.searchsorted(end_positions, np.arange(size))]
+    last = np.minimum(np.arange(size) + n_step - 1, sequence_end)
+
+    n_step_rewards = np.zeros_like(rewards)
+    for k in range(n_step):
+        # Positions whose window still contains step t+k.
+        valid = np.arange(size) + k <= last
+        n_step_rewards[valid] += discount ** k * rewards[np.arange(size)[valid] + k]
+    return n_step_rewards, last, terminals[last], discount ** (last - np.arange(size) + 1)
+
+
+def v_trace(log_is_weights, discounts, rewards, values, bootstrapped_values, rho_bar=1.0, rho_bar_pg=1.0,
+            c_bar=1.0):
+    """
+    Computes V-trace targets and PG-advantages (see `VTraceFunction` for details).
+
+    Args:
+        log_is_weights (np.ndarray): The log importance weights log(pi(a|s)) - log(mu(a|s)) of the actions taken
+            (time x batch x 1).
+        discounts (np.ndarray): The discounts (time x batch x 1). 0.0 at episode ends.
+        rewards (np.ndarray): The rewards (time x batch x 1).
+        values (np.ndarray): The value estimates wrt. the learner's policy (time x batch x 1).
+        bootstrapped_values (np.ndarray): The value estimates after the last time step (1 x batch x 1).
+        rho_bar (Optional[float]): The max. IS-weight for the temporal differences. None for no clipping.
+        rho_bar_pg (Optional[float]): The max. IS-weight for the PG-advantages. None for no clipping.
+        c_bar (Optional[float]): The max. IS-weight for the time trace. None for no clipping.
+
+    Returns:
+        tuple:
+            - np.ndarray: The v-trace values (vs).
+            - np.ndarray: The PG-advantage values.
+    """
+    is_weights = np.exp(log_is_weights)
+    rho_t = is_weights if rho_bar is None else np.minimum(rho_bar, is_weights)
+    rho_t_pg = is_weights if rho_bar_pg is None else np.minimum(rho_bar_pg, is_weights)
+    c_i = is_weights if c_bar is None else np.minimum(c_bar, is_weights)
+
+    values_t_plus_1 = np.concatenate([values[1:], bootstrapped_values], axis=0)
+    deltas = rho_t * (rewards + discounts * values_t_plus_1 - values)
+
+    # Recursive calculation of vs - V(xs) (vectorized over the batch).
+    vs_minus_v_xs = np.zeros_like(deltas)
+    acc = np.zeros_like(deltas[0])
+    for t in reversed(range(len(deltas))):
+        acc = deltas[t] + discounts[t] * c_i[t] * acc
+        vs_minus_v_xs[t] = acc
+    vs = vs_minus_v_xs + values
+
+    vs_t_plus_1 = np.concatenate([vs[1:], bootstrapped_values], axis=0)
+    pg_advantages = rho_t_pg * (rewards + discounts * vs_t_plus_1 - values)
+    return vs, pg_advantages
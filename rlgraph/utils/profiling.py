@@ -0,0 +1,234 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import math
+import time
+from collections import defaultdict
+
+
+class LatencyHistogram(object):
+    """
+    Aggregates latencies (in s) into count, total, min, max and a histogram with logarithmic (power of 2) buckets,
+    starting at `min_latency`. Recording is O(1) and memory is bounded by the number of buckets.
+    """
+    def __init__(self, min_latency=1e-6, num_buckets=32):
+        """
+        Args:
+            min_latency (float): The upper bound of the first bucket (in s). Bucket i holds latencies up to
+                `min_latency` * 2^i.
+            num_buckets (int): The number of buckets. The last bucket holds all larger latencies.
+        """
+        self.min_latency = min_latency
+        self.num_buckets = num_buckets
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * self.num_buckets
+
+    def record(self, latency):
+        """
+        Args:
+            latency (float): The latency (in s) to record.
+        """
+        self.count += 1
+        self.total += latency
+        if latency < self.min:
+            self.min = latency
+        if latency > self.max:
+            self.max = latency
+        if latency <= self.min_latency:
+            index = 0
+        else:
+            index = min(int(math.ceil(math.log2(latency / self.min_latency))), self.num_buckets - 1)
+        self.buckets[index] += 1
+
+    def bucket_bounds(self):
+        """
+        Returns:
+            List[float]: The upper bound of each bucket (the last one is inf).
+        """
+        return [self.min_latency * 2 ** i for i in range(self.num_buckets - 1)] + [float("inf")]
+
+    def percentile(self, percentile):
+        """
+        Args:
+            percentile (float): The percentile (0 to 100).
+
+        Returns:
+            float: The upper bound of the bucket containing the given percentile (capped by `max`).
+        """
+        if self.count == 0:
+            return 0.0
+        threshold = self.count * percentile / 100.0
+        cumulative = 0
+        for bound, bucket_count in zip(self.bucket_bounds(), self.buckets):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Count, total, mean, min, max, p50/p90/p95/p99 and the non-empty buckets (upper bound -> count).
+        """
+        return dict(
+            count=self.count,
+            total=self.total,
+            mean=self.total / self.count if self.count > 0 else 0.0,
+            min=self.min if self.count > 0 else 0.0,
+            max=self.max,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p95=self.percentile(95),
+            p99=self.percentile(99),
+            buckets={bound: count for bound, count in zip(self.bucket_bounds(), self.buckets) if count > 0}
+        )
+
+
+class ApiCallMetrics(object):
+    """
+    Call count, latency histogram and batch sizes of the calls to a single API-method.
+    """
+    def __init__(self):
+        self.latencies = LatencyHistogram()
+        # Number of calls with a known batch size, their summed and max. batch sizes.
+        self.num_batched_calls = 0
+        self.num_items = 0
+        self.max_batch_size = 0
+
+    def record(self, latency, batch_size=None):
+        """
+        Args:
+            latency (float): The latency (in s) of the call.
+            batch_size (Optional[int]): The batch size of the call's input (None if unknown).
+        """
+        self.latencies.record(latency)
+        if batch_size is not None:
+            self.num_batched_calls += 1
+            self.num_items += batch_size
+            if batch_size > self.max_batch_size:
+                self.max_batch_size = batch_size
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Calls, latency stats (in s), mean/max. batch size and the throughput (calls and batch items per
+                s of call time).
+        """
+        latencies = self.latencies
+        return dict(
+            calls=latencies.count,
+            total=latencies.total,
+            mean=latencies.total / latencies.count if latencies.count > 0 else 0.0,
+            min=latencies.min if latencies.count > 0 else 0.0,
+            max=latencies.max,
+            p50=latencies.percentile(50),
+            p95=latencies.percentile(95),
+            p99=latencies.percentile(99),
+            mean_batch_size=self.num_items / self.num_batched_calls if self.num_batched_calls > 0 else 0.0,
+            max_batch_size=self.max_batch_size,
+            calls_per_s=latencies.count / latencies.total if latencies.total > 0 else 0.0,
+            items_per_s=self.num_items / latencies.total if latencies.total > 0 else 0.0
+        )
+
+
+class BuildProfiler(object):
+    """
+    Collects the time spent in the different phases of a graph build (e.g. variable creation, graph_fn calls,
+    Space inference), per phase and per Component, plus the number of backend ops created by each Component.
+    Times of nested sections (e.g. graph_fns calling other Components' API-methods in define-by-run builds) are
+    included in the outer section's time.
+    """
+    def __init__(self):
+        # Phase -> total time (in s).
+        self.phase_times = defaultdict(float)
+        # Component (global scope) -> phase -> total time (in s).
+        self.component_times = defaultdict(lambda: defaultdict(float))
+        # Component (global scope) -> number of graph_fn calls and number of backend ops created.
+        self.graph_fn_calls = defaultdict(int)
+        self.component_ops = defaultdict(int)
+        # Overall stats of the build (total time, number of ops, etc.), set by the GraphBuilder.
+        self.build_stats = {}
+
+    def reset(self):
+        self.__init__()
+
+    @staticmethod
+    def start():
+        return time.perf_counter()
+
+    def record(self, phase, start, component=None, num_ops=None):
+        """
+        Records the time since `start` for the given phase (and Component).
+
+        Args:
+            phase (str): The build phase, e.g. "variables" or "graph_fns".
+            start (float): The `start()` value at the beginning of the timed section.
+            component (Optional[Component]): The Component the time was spent on.
+            num_ops (Optional[int]): The number of backend ops created in the timed section.
+        """
+        duration = time.perf_counter() - start
+        self.phase_times[phase] += duration
+        if component is not None:
+            self.component_times[component.global_scope][phase] += duration
+            if phase == "graph_fns":
+                self.graph_fn_calls[component.global_scope] += 1
+            if num_ops is not None:
+                self.component_ops[component.global_scope] += num_ops
+
+    def report(self, top=None):
+        """
+        Args:
+            top (Optional[int]): The number of most expensive Components to include. None for all.
+
+        Returns:
+            dict: Build stats, times per phase (in s) and - sorted by total time - per Component: times per phase,
+                number of graph_fn calls and backend ops created.
+        """
+        components = sorted(self.component_times.items(), key=lambda item: sum(item[1].values()), reverse=True)
+        if top is not None:
+            components = components[:top]
+        return dict(
+            build=dict(self.build_stats),
+            phases=dict(self.phase_times),
+            components=[
+                dict(
+                    component=scope, total=sum(times.values()), phases=dict(times),
+                    graph_fn_calls=self.graph_fn_calls[scope], num_ops=self.component_ops[scope]
+                ) for scope, times in components
+            ]
+        )
+
+    def print_report(self, top=20):
+        report = self.report(top=top)
+        print("Build stats: {}".format(report["build"]))
+        print("Time per phase:")
+        for phase, duration in sorted(report["phases"].items(), key=lambda item: item[1], reverse=True):
+            print("  {}: {:.4f} s".format(phase, duration))
+        print("Most expensive Components:")
+        for component in report["components"]:
+            print("  {} ({:.4f} s, {} graph_fn calls, {} ops): {}".format(
+                component["component"] or "[root]", component["total"], component["graph_fn_calls"],
+                component["num_ops"], {phase: round(t, 4) for phase, t in component["phases"].items()}
+            ))
@@ -18,6 +18,9 @@ from __future__ import division
 from __future__ import print_function
 
 import multiprocessing
+from multiprocessing.sharedctypes import RawArray
+
+import numpy as np
 
 from rlgraph import get_backend
 from rlgraph.spaces.space import Space
@@ -41,7 +44,7 @@ class SpecifiableServer(Specifiable):
     # Class instances get registered/deregistered here.
     INSTANCES = []
 
-    def __init__(self, specifiable_class, spec, output_spaces, shutdown_method=None):
+    def __init__(self, specifiable_class, spec, output_spaces, shutdown_method=None, use_shared_memory=True):
         """
         Args:
             specifiable_class (type): The class to use for constructing the Specifiable from spec. This class needs to be
@@ -53,6 +56,9 @@ class SpecifiableServer(Specifiable):
             shutdown_method (Optional[str]): An optional name of a shutdown method that will be called on the
                 Specifiable object before "server" shutdown to give the Specifiable a chance to clean up.
                 The Specifiable must implement this method.
+            use_shared_memory (bool): Whether the return values of methods, whose output Spaces are given by dict
+                (and have fixed shapes), should be written into preallocated shared memory instead of being pickled
+                and sent through the pipe. Only a small header is sent through the pipe then.
             #flatten_output_dicts (bool): Whether output dictionaries should be flattened to tuples and then
             #    returned.
         """
@@ -72,6 +78,11 @@ class SpecifiableServer(Specifiable):
         else:
             self.output_spaces = output_spaces
         self.shutdown_method = shutdown_method
+        self.use_shared_memory = use_shared_memory
+
+        # Method name -> list of shared memory buffers (one per return value) and the numpy views on these buffers.
+        self.shared_buffers = None
+        self.shared_views = None
 
         # The process in which the Specifiable will run.
         self.process = None
@@ -139,13 +150,8 @@ class SpecifiableServer(Specifiable):
                 def py_call(*call_args):
                     call_args = [arg.decode('UTF-8') if isinstance(arg, bytes) else arg for arg in call_args]
                     try:
-                        self.out_pipe.send(call_args)
-                        received_results = self.out_pipe.recv()
-
-                        # If an error occurred, it'll be passed back through the pipe.
-                        if isinstance(received_results, Exception):
-                            raise received_results
-                        elif received_results is not None:
+                        received_results = self.call_server(*call_args)
+                        if received_results is not None:
                             return received_results
 
                     except Exception as e:
@@ -169,12 +175,43 @@ class SpecifiableServer(Specifiable):
 
         return call
 
+    def call_server(self, method_name, *args):
+        """
+        Sends a method call to the (started) server process and waits for the results.
+
+        Args:
+            method_name (str): The method to call on the Specifiable.
+            args (any): The args to call the method with.
+
+        Returns:
+            any: The return values of the method call (copied out of shared memory, if written there).
+        """
+        self.out_pipe.send([method_name] + list(args))
+        received_results = self.out_pipe.recv()
+
+        # If an error occurred, it'll be passed back through the pipe.
+        if isinstance(received_results, Exception):
+            raise received_results
+        # Results have been written to shared memory: Copy them out (the buffers get overwritten by the next call).
+        elif isinstance(received_results, SharedMemoryResults):
+            return [np.array(view) for view in self.shared_views[method_name]]
+        return received_results
+
     def start_server(self):
         # Create the in- and out- pipes to communicate with the proxy-Specifiable.
         self.out_pipe, self.in_pipe = multiprocessing.Pipe()
+        # Allocate the shared memory for the return values (before the process gets started).
+        if self.use_shared_memory is True and isinstance(self.output_spaces, dict):
+            self.shared_buffers = self.allocate_shared_buffers(self.output_spaces)
+            self.shared_views = {
+                method_name: self.get_shared_views(buffers, self.output_spaces[method_name])
+                for method_name, buffers in self.shared_buffers.items()
+            }
         # Create and start the process passing it the spec to construct the desired Specifiable object..
         self.process = multiprocessing.Process(
-            target=self.run_server, args=(self.specifiable_class, self.spec, self.in_pipe, self.shutdown_method)
+            target=self.run_server, args=(
+                self.specifiable_class, self.spec, self.in_pipe, self.shutdown_method, self.shared_buffers
+            )
         )
         self.process.start()
 
@@ -193,13 +230,21 @@ class SpecifiableServer(Specifiable):
             pass
         self.process.join()
 
-    def run_server(self, class_, spec, in_pipe, shutdown_method=None):
+    def run_server(self, class_, spec, in_pipe, shutdown_method=None, shared_buffers=None):
         proxy_object = None
         try:
 
             # Construct the Specifiable object.
             proxy_object = class_.from_spec(spec)
 
+            # Numpy views on the shared memory to write return values into.
+            shared_views = {}
+            if shared_buffers is not None:
+                shared_views = {
+                    method_name: self.get_shared_views(buffers, self.output_spaces[method_name])
+                    for method_name, buffers in shared_buffers.items()
+                }
+
             # Send the ready signal (no errors).
             in_pipe.send(None)
 
@@ -220,8 +265,13 @@ class SpecifiableServer(Specifiable):
                 inputs = command[1:]
                 results = getattr(proxy_object, method_name)(*inputs)
 
+                # Write return values into shared memory and only send a header back to the caller.
+                views = shared_views.get(method_name)
+                if views is not None and self.write_shared_views(views, results):
+                    in_pipe.send(SharedMemoryResults())
                 # Send return values back to caller.
-                in_pipe.send(results)
+                else:
+                    in_pipe.send(results)
 
         # If something happens during the construction and proxy run phase, pass the exception back through our pipe.
         except Exception as e:
@@ -235,6 +285,69 @@ class SpecifiableServer(Specifiable):
             # Send the exception back so the main process knows what's going on.
             in_pipe.send(e)
 
+    @staticmethod
+    def allocate_shared_buffers(output_spaces):
+        """
+        Allocates one shared memory buffer per return value for all methods whose return values are all arrays of
+        fixed shape.
+
+        Args:
+            output_spaces (Dict[str,Union[Space,List[Space]]]): The output Space(s) per method name.
+
+        Returns:
+            Dict[str,List[RawArray]]: Method name -> list of shared memory buffers (one per return value).
+        """
+        shared_buffers = {}
+        for method_name, specs in output_spaces.items():
+            spaces = force_list(specs)
+            if len(spaces) == 0 or not all(isinstance(space, Space) and not isinstance(space, ContainerSpace) and
+                                           None not in space.shape for space in spaces):
+                continue
+            shared_buffers[method_name] = [
+                RawArray("b", max(int(np.prod(space.shape)), 1) * np.dtype(convert_dtype(space.dtype, "np")).itemsize)
+                for space in spaces
+            ]
+        return shared_buffers
+
+    @staticmethod
+    def get_shared_views(buffers, specs):
+        """
+        Returns:
+            List[np.ndarray]: Numpy views (with the Spaces' shapes and dtypes) on the given shared memory buffers.
+        """
+        return [
+            np.frombuffer(buffer, dtype=convert_dtype(space.dtype, "np"), count=int(np.prod(space.shape))).
+            reshape(space.shape) for buffer, space in zip(buffers, force_list(specs))
+        ]
+
+    @staticmethod
+    def write_shared_views(views, results):
+        """
+        Writes the return values of a method call into the given shared memory views.
+
+        Returns:
+            bool: Whether all return values could be written (False if they don't fit the output Spaces).
+        """
+        results = [results] if len(views) == 1 else results
+        if not isinstance(results, (tuple, list)) or len(results) != len(views):
+            return False
+        try:
+            for view, result in zip(views, results):
+                if np.shape(result) != view.shape:
+                    return False
+                np.copyto(view, result, casting="unsafe")
+        except (TypeError, ValueError):
+            return False
+        return True
+
+
+class SharedMemoryResults(object):
+    """
+    The header sent back by a SpecifiableServer instead of the return values of a call, if these have been
+    written into shared memory.
+    """
+    pass
+
 
 if get_backend() == "tf":
     class SpecifiableServerHook(tf.train.SessionRunHook):
@@ -368,12 +368,14 @@ def strip_source_code(method, remove_nested_functions=True):
     return src
 
 
-def force_torch_tensors(params, requires_grad=False):
+def force_torch_tensors(params, requires_grad=False, copy=True):
     """
     Converts input params to torch tensors
     Args:
         params (list): Input args.
         requires_grad (bool): If gradients need to be computed from these arguments.
+        copy (bool): If False, numpy arrays are wrapped via `torch.from_numpy` where possible (sharing their
+            memory, which then must not be modified by the caller while in use).
 
     Returns:
         list: List of Torch tensors.
@@ -386,20 +388,22 @@ def force_torch_tensors(params, requires_grad=False):
                 param = define_by_run_flatten(param)
                 ret = {}
                 for key, value in param.items():
-                    ret[key] = convert_param(value, requires_grad)
+                    ret[key] = convert_param(value, requires_grad, copy)
                 tensor_params.append(ret)
             else:
-                tensor_params.append(convert_param(param, requires_grad))
+                tensor_params.append(convert_param(param, requires_grad, copy))
         return tensor_params
 
 
-def convert_param(param, requires_grad):
+def convert_param(param, requires_grad, copy=True):
     if get_backend() == "pytorch":
         # Do nothing.
         if isinstance(param, torch.Tensor):
             return param
         if isinstance(param, list):
             param = np.asarray(param)
+            # Fresh array -> No need to copy again.
+            copy = False
         if isinstance(param, np.ndarray):
             param_type = param.dtype
         else:
@@ -409,6 +413,18 @@ def convert_param(param, requires_grad):
         # PyTorch cannot convert from a np.bool_, must be uint.
         if isinstance(param, np.ndarray) and param.dtype == np.bool_:
             param = param.astype(np.uint8)
+            # Fresh array -> No need to copy again.
+            copy = False
+
+        # Zero-copy: Share the numpy array's memory (only writeable arrays of the same dtype w/o grads).
+        if copy is False and requires_grad is False and isinstance(param, np.ndarray) and param.flags.writeable:
+            try:
+                tensor = torch.from_numpy(param)
+                if tensor.dtype == convert_type:
+                    return tensor
+            # E.g. negative strides.
+            except ValueError:
+                pass
 
         if convert_type == torch.float32 or convert_type == torch.float or convert_type == torch.float16:
             # Only floats can require grad.